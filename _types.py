@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class Recurso:
     matricula: str
     nome: str
@@ -11,7 +11,7 @@ class Recurso:
     habilidades: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class Tarefa:
     nota: int
     grupo: str
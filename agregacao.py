@@ -0,0 +1,206 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from carregamento import RecursosColunares, TarefasColunares
+from elegibilidade import IndiceElegibilidade
+from modelagem import ModeloAlocacao, valores_das_variaveis
+
+
+@dataclass
+class ClassesTarefas:
+    """
+    Agrupamento de tarefas idênticas para o modelo.
+
+    Duas tarefas são idênticas quando têm as mesmas habilidades, esforço e
+    prioridade: grupo e código não aparecem em nenhuma restrição ou objetivo.
+
+    - `representantes`: uma tarefa por classe (a primeira encontrada);
+    - `tamanho[c]`: quantidade de tarefas da classe `c`;
+    - `classe_tarefa[t]`: classe da tarefa `t`;
+    - membros da classe `c`: `membros[inicio[c]:inicio[c + 1]]`, na ordem original.
+    """
+
+    representantes: TarefasColunares
+    tamanho: np.ndarray
+    classe_tarefa: np.ndarray
+    membros: np.ndarray
+    inicio: np.ndarray
+
+    def __len__(self):
+        return len(self.tamanho)
+
+
+def agrupar_tarefas(tarefas: TarefasColunares) -> ClassesTarefas:
+    """
+    Agrupa as tarefas idênticas em classes.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+
+    Returns:
+        ClassesTarefas: As classes, na ordem da primeira ocorrência.
+    """
+    chaves = pd.DataFrame(
+        {"mascara": tarefas.mascara, "esforco": tarefas.esforco, "prioridade": tarefas.prioridade}
+    )
+    classe_tarefa = chaves.groupby(list(chaves.columns), sort=False).ngroup().to_numpy(dtype=np.int64)
+    num_classes = int(classe_tarefa.max()) + 1 if len(classe_tarefa) else 0
+
+    tamanho = np.bincount(classe_tarefa, minlength=num_classes)
+    membros = np.argsort(classe_tarefa, kind="stable")
+    inicio = np.zeros(num_classes + 1, dtype=np.int64)
+    np.cumsum(tamanho, out=inicio[1:])
+
+    representantes = tarefas.selecionar(membros[inicio[:-1]])
+    return ClassesTarefas(representantes, tamanho, classe_tarefa, membros, inicio)
+
+
+@dataclass
+class ModeloAgregado(ModeloAlocacao):
+    """
+    Modelo em que `tarefas` são os representantes das classes e `variaveis[p]`
+    é o número de tarefas da classe `par_tarefa[p]` atribuídas ao recurso
+    `par_recurso[p]`.
+
+    As expressões de esforço, prioridade e carga de `ModeloAlocacao` continuam
+    válidas, pois cada contagem é multiplicada pelo peso de uma tarefa da classe.
+    """
+
+    classes: Optional[ClassesTarefas] = None
+    tarefas_originais: Optional[TarefasColunares] = None
+    # Recurso preferido por tarefa original (ex.: distribuição anterior), usado na desagregação
+    preferencia: Optional[np.ndarray] = None
+
+    def tarefas_da_atribuicao(self) -> TarefasColunares:
+        return self.tarefas_originais
+
+    def total_tarefas(self) -> int:
+        return int(self.classes.tamanho.sum())
+
+    def esforco_total(self) -> int:
+        return int((self.tarefas.esforco * self.classes.tamanho).sum())
+
+    def valores_da_atribuicao(self, atribuicao) -> np.ndarray:
+        """Conta, para cada par (classe, recurso), as tarefas originais atribuídas."""
+        atribuicao = np.asarray(atribuicao)
+        atribuidas = np.flatnonzero(atribuicao >= 0)
+        pares = self.indice.localizar_pares(self.classes.classe_tarefa[atribuidas], atribuicao[atribuidas])
+        return np.bincount(pares[pares >= 0], minlength=len(self.variaveis)).astype(np.int64)
+
+    def contagens(self, solver: cp_model.CpSolver) -> np.ndarray:
+        return valores_das_variaveis(self.variaveis, solver)
+
+    def atribuicao(self, solver: cp_model.CpSolver) -> np.ndarray:
+        """
+        Desagrega as contagens do solver em uma atribuição por tarefa original.
+
+        Returns:
+            np.ndarray: Para cada tarefa original, o índice do recurso atribuído ou -1.
+        """
+        return desagregar(self.contagens(solver), self.classes, self.indice, self.preferencia)
+
+
+def desagregar(contagens, classes: ClassesTarefas, indice: IndiceElegibilidade, preferencia=None) -> np.ndarray:
+    """
+    Distribui as contagens (classe, recurso) entre os membros de cada classe.
+
+    Se houver `preferencia`, cada tarefa fica primeiro com o seu recurso preferido
+    enquanto a contagem daquele par permitir. As demais contagens consomem os
+    membros restantes na ordem original: os `k` primeiros vão para o primeiro
+    recurso com contagem `k`, os seguintes para o próximo, e assim por diante.
+
+    Args:
+        contagens (np.ndarray): Contagem de cada par elegível do índice das classes.
+        classes (ClassesTarefas): As classes de tarefas.
+        indice (IndiceElegibilidade): Índice de elegibilidade das classes.
+        preferencia (np.ndarray, optional): Recurso preferido por tarefa original ou -1. Defaults to None.
+
+    Returns:
+        np.ndarray: Para cada tarefa original, o índice do recurso atribuído ou -1.
+    """
+    contagens = np.array(contagens, dtype=np.int64)
+    atribuicao = np.full(len(classes.classe_tarefa), -1, dtype=np.int64)
+
+    if preferencia is not None:
+        preferidas = np.flatnonzero(np.asarray(preferencia) >= 0)
+        pares = indice.localizar_pares(classes.classe_tarefa[preferidas], preferencia[preferidas])
+        for t, p in zip(preferidas.tolist(), pares.tolist()):
+            if p >= 0 and contagens[p] > 0:
+                atribuicao[t] = indice.par_recurso[p]
+                contagens[p] -= 1
+
+        # Os membros já atribuídos saem da fila de cada classe
+        membros = classes.membros[atribuicao[classes.membros] < 0]
+        tamanho = np.bincount(classes.classe_tarefa[membros], minlength=len(classes))
+        inicio = np.zeros(len(classes) + 1, dtype=np.int64)
+        np.cumsum(tamanho, out=inicio[1:])
+        classes = ClassesTarefas(classes.representantes, tamanho, classes.classe_tarefa, membros, inicio)
+
+    # Pares estão ordenados por classe, logo `destino` também fica agrupado por classe
+    destino = np.repeat(indice.par_recurso, contagens)
+    atribuidas = np.bincount(indice.par_tarefa, weights=contagens, minlength=len(classes)).astype(np.int64)
+
+    classe = np.repeat(np.arange(len(classes)), atribuidas)
+    inicio_atribuidas = np.cumsum(atribuidas) - atribuidas
+    posicao = np.arange(len(destino)) - inicio_atribuidas[classe]
+    atribuicao[classes.membros[classes.inicio[classe] + posicao]] = destino
+    return atribuicao
+
+
+def aplicar_restricoes_agregadas(
+    modelo: cp_model.CpModel,
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    indice: Optional[IndiceElegibilidade] = None,
+) -> ModeloAgregado:
+    """
+    Versão agregada de `modelagem.aplicar_restricoes`: uma variável inteira por
+    (classe, recurso) elegível em vez de uma booleana por (tarefa, recurso).
+
+    Args:
+        modelo (cp_model.CpModel): O objeto do modelo.
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        indice (IndiceElegibilidade, optional): Índice das classes já calculado. Defaults to None.
+
+    Returns:
+        ModeloAgregado: O modelo com as restrições e o mapeamento das variáveis.
+    """
+    classes = agrupar_tarefas(tarefas)
+    representantes = classes.representantes
+    if indice is None:
+        indice = IndiceElegibilidade.de_dados(representantes, recursos)
+
+    # Limite de cada contagem: tamanho da classe e quantas cabem na disponibilidade
+    tamanho_par = classes.tamanho[indice.par_tarefa]
+    esforco_par = representantes.esforco[indice.par_tarefa]
+    disponibilidade_par = np.maximum(recursos.disponibilidade[indice.par_recurso], 0)
+    cabem = np.where(esforco_par > 0, disponibilidade_par // np.maximum(esforco_par, 1), tamanho_par)
+    limite = np.minimum(tamanho_par, cabem)
+
+    notas = representantes.nota[indice.par_tarefa]
+    matriculas = recursos.matricula[indice.par_recurso]
+    variaveis = [
+        modelo.NewIntVar(0, maximo, f"classe{nota}_proj{matricula}")
+        for maximo, nota, matricula in zip(limite.tolist(), notas.tolist(), matriculas)
+    ]
+    alocacao = ModeloAgregado(
+        modelo, representantes, recursos, indice, variaveis, classes=classes, tarefas_originais=tarefas
+    )
+
+    # Restrição: cada tarefa da classe atribuída a no máximo um recurso
+    inicio = indice.inicio_tarefa.tolist()
+    for c, tamanho in enumerate(classes.tamanho.tolist()):
+        if inicio[c + 1] > inicio[c]:
+            modelo.Add(cp_model.LinearExpr.Sum(variaveis[inicio[c]:inicio[c + 1]]) <= tamanho)
+
+    # Restrição: carga horária por projetista (sem pares, não há o que limitar)
+    disponibilidade = recursos.disponibilidade.tolist()
+    for r in indice.recursos_com_pares().tolist():
+        modelo.Add(alocacao.expressao_carga(r) <= disponibilidade[r])
+
+    return alocacao
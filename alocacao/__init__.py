@@ -0,0 +1,17 @@
+"""
+Alocação de tarefas a recursos pela linha de comando, com um só ponto de
+entrada para os dois objetivos.
+
+- `alocacao.cli`: argumentos, validação, estimativa e lote; só importa a biblioteca padrão;
+- `alocacao.entrada`: validação dos CSVs e estimativa do tamanho do modelo, sem pandas nem OR-Tools;
+- `alocacao.execucao`: leitura, construção, solução e exportação (importada sob demanda).
+
+Uso, a partir da raiz do projeto (ou `alocacao ...` depois de `pip install -e .`):
+
+    python -m alocacao --objetivo esforco_maximo
+    python -m alocacao --pesos 70,30 --tarefas ./data/tarefas.csv --recursos ./data/recursos.csv
+    python -m alocacao --estimar --objetivo esforco_maximo
+    python -m alocacao --lote ./data/lote.txt --tempo-limite 60
+
+As opções não informadas na linha de comando vêm das variáveis do .env.
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from alocacao.cli import main
+
+sys.exit(main())
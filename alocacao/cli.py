@@ -0,0 +1,209 @@
+"""
+Linha de comando da alocação.
+
+Só a biblioteca padrão é importada no início: `--help`, `--validar` e
+`--estimar` respondem sem carregar pandas, NumPy ou o OR-Tools, que entram
+apenas quando há um problema a resolver, uma vez para todos os pares do lote.
+"""
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import replace
+from typing import List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from alocacao.entrada import estimar_modelo, validar_entradas
+
+# Mesmos valores de modelagem.OBJETIVO_* e relaxacao.MOTOR_*, repetidos para não importar o OR-Tools
+OBJETIVOS = ("esforco_maximo", "prioridade_maxima")
+MOTORES = ("cpsat", "relaxacao")
+
+
+def pesos_do_texto(texto: str) -> dict:
+    """Pesos 'PRIORIDADE,ESFORCO' (ex.: '70,30') no formato de `modelagem.objetivo_prioridade_maxima`."""
+    try:
+        prioridade, esforco = (int(valor) for valor in texto.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"pesos inválidos: {texto!r} (use PRIORIDADE,ESFORCO, ex.: 70,30)")
+    if prioridade < 0 or esforco < 0:
+        raise argparse.ArgumentTypeError(f"pesos negativos: {texto!r}")
+    return {"prioridade": prioridade, "esforco": esforco}
+
+
+def ler_lote(caminho) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Pares de entrada de um arquivo de lote: uma linha 'tarefas;recursos[;saida]'
+    por alocação; linhas vazias e iniciadas por '#' são ignoradas.
+
+    Args:
+        caminho (str): O arquivo de lote.
+
+    Returns:
+        list: Tuplas (tarefas, recursos, saída ou None).
+    """
+    pares = []
+    with open(caminho, encoding="utf-8-sig") as arquivo:
+        for numero, linha in enumerate(arquivo, start=1):
+            linha = linha.strip()
+            if not linha or linha.startswith("#"):
+                continue
+            campos = [campo.strip() for campo in linha.split(";")]
+            if len(campos) not in (2, 3) or not all(campos[:2]):
+                raise ValueError(f"{caminho}, linha {numero}: use 'tarefas;recursos[;saida]'")
+            pares.append((campos[0], campos[1], campos[2] if len(campos) == 3 and campos[2] else None))
+    return pares
+
+
+def saida_do_lote(caminho_tarefas, objetivo: str) -> str:
+    """Distribuição de um par do lote sem saída informada: ao lado do CSV de tarefas."""
+    base = os.path.splitext(os.path.basename(caminho_tarefas))[0]
+    return os.path.join(os.path.dirname(caminho_tarefas), f"distribuicao_{base}_{objetivo}.csv")
+
+
+def verificar(caminho_tarefas, caminho_recursos, objetivo: str, estimar: bool) -> bool:
+    """Valida um par de entradas e, se pedido, mostra o tamanho estimado do modelo."""
+    resumos = validar_entradas(caminho_tarefas, caminho_recursos)
+    for nome, resumo in resumos.items():
+        situacao = "ok" if resumo.valido else f"{resumo.total_erros} erro(s)"
+        if resumo.total_avisos:
+            situacao += f", {resumo.total_avisos} aviso(s)"
+        print(f"  {nome}: {resumo.caminho} ({resumo.linhas} linhas, {situacao})")
+        for erro in resumo.erros:
+            print(f"    {erro}")
+        if resumo.total_erros > len(resumo.erros):
+            print(f"    ... e mais {resumo.total_erros - len(resumo.erros)}")
+        for aviso in resumo.avisos:
+            print(f"    aviso: {aviso}")
+        if resumo.total_avisos > len(resumo.avisos):
+            print(f"    ... e mais {resumo.total_avisos - len(resumo.avisos)} aviso(s)")
+    valido = all(resumo.valido for resumo in resumos.values())
+    if valido and estimar:
+        tarefas, recursos = resumos["tarefas"], resumos["recursos"]
+        estimativa = estimar_modelo(tarefas, recursos, objetivo)
+        print(
+            f"  modelo estimado ({objetivo}): {estimativa['pares']} pares, {estimativa['variaveis']} variáveis, "
+            f"{estimativa['restricoes']} restrições; {estimativa['tarefas_sem_recurso']} tarefas sem recurso elegível"
+        )
+        print(
+            f"  demanda {tarefas.total} / capacidade {recursos.total} "
+            f"({tarefas.total / max(1, recursos.total):.2f})"
+        )
+    return valido
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="alocacao",
+        description="Aloca tarefas a recursos. As opções não informadas vêm do .env.",
+    )
+    parser.add_argument("--objetivo", choices=OBJETIVOS, default=None, help="padrão: prioridade_maxima")
+    parser.add_argument(
+        "--pesos",
+        type=pesos_do_texto,
+        default=None,
+        metavar="P,E",
+        help="pesos de prioridade e esforço do objetivo de prioridade máxima (padrão: PESO_PRIORIDADE,PESO_ESFORCO)",
+    )
+
+    entradas = parser.add_argument_group("entradas")
+    entradas.add_argument("--tarefas", default=None, help="CSV de tarefas (padrão: CAMINHO_TAREFAS)")
+    entradas.add_argument("--recursos", default=None, help="CSV de recursos (padrão: CAMINHO_RECURSOS)")
+    entradas.add_argument("--saida", default=None, help="distribuição (padrão: CAMINHO_SAIDA_<OBJETIVO>)")
+    entradas.add_argument(
+        "--lote",
+        default=None,
+        metavar="ARQUIVO",
+        help="resolve vários pares num só processo: uma linha 'tarefas;recursos[;saida]' por par",
+    )
+
+    modos = parser.add_argument_group("sem resolver")
+    modos.add_argument("--validar", action="store_true", help="só confere os CSVs de entrada")
+    modos.add_argument("--estimar", action="store_true", help="confere os CSVs e estima o tamanho do modelo")
+
+    solucao = parser.add_argument_group("solução")
+    solucao.add_argument("--tempo-limite", type=float, default=None, help="segundos do solver (padrão: TEMPO_LIMITE)")
+    solucao.add_argument("--motor", choices=MOTORES, default=None, help="padrão: MOTOR_SOLUCAO")
+    solucao.add_argument("--formato", choices=("csv", "parquet"), default=None, help="padrão: FORMATO_SAIDA")
+    solucao.add_argument("--perfil", default=None, help="perfil do solver ou arquivo JSON (padrão: SOLVER_PERFIL)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    load_dotenv()
+
+    if args.pesos is not None and args.objetivo == "esforco_maximo":
+        parser.error("--pesos só se aplica ao objetivo prioridade_maxima")
+    objetivo = args.objetivo or "prioridade_maxima"
+
+    if args.lote:
+        if args.tarefas or args.recursos or args.saida:
+            parser.error("--lote não combina com --tarefas, --recursos ou --saida")
+        try:
+            pares = ler_lote(args.lote)
+        except (OSError, ValueError) as erro:
+            parser.error(str(erro))
+        pares = [(t, r, s or saida_do_lote(t, objetivo)) for t, r, s in pares]
+    else:
+        caminho_tarefas = args.tarefas or os.getenv("CAMINHO_TAREFAS")
+        caminho_recursos = args.recursos or os.getenv("CAMINHO_RECURSOS")
+        if not caminho_tarefas or not caminho_recursos:
+            parser.error("informe --tarefas e --recursos (ou CAMINHO_TAREFAS e CAMINHO_RECURSOS)")
+        pares = [(caminho_tarefas, caminho_recursos, args.saida)]
+
+    if args.validar or args.estimar:
+        validos = 0
+        for caminho_tarefas, caminho_recursos, _ in pares:
+            print(f"{caminho_tarefas} + {caminho_recursos}:")
+            validos += verificar(caminho_tarefas, caminho_recursos, objetivo, args.estimar)
+        print(f"{validos} de {len(pares)} par(es) válido(s).")
+        return 0 if validos == len(pares) else 1
+
+    # O perfil entra como SOLVER_PERFIL, para que as demais SOLVER_* continuem valendo por cima dele
+    if args.perfil:
+        os.environ["SOLVER_PERFIL"] = args.perfil
+    from alocacao import execucao
+
+    alteracoes = {"tempo_limite": args.tempo_limite, "motor": args.motor, "formato": args.formato}
+    opcoes = replace(
+        execucao.Opcoes.de_ambiente(objetivo, args.pesos),
+        **{campo: valor for campo, valor in alteracoes.items() if valor is not None},
+    )
+    if opcoes.pesos is not None:
+        print(f"Pesos Percentuais: {opcoes.pesos}")
+    if os.getenv("INSTRUMENTACAO", "0") == "1":
+        execucao.medicao.ativar(os.getenv("CAMINHO_TELEMETRIA", "./data/telemetria.jsonl"))
+
+    falhas = 0
+    for numero, (caminho_tarefas, caminho_recursos, caminho_saida) in enumerate(pares, start=1):
+        if len(pares) > 1:
+            print(f"[{numero}/{len(pares)}] {caminho_tarefas} + {caminho_recursos}")
+        # Entradas inválidas são recusadas antes da carga, sem interromper o lote
+        if not verificar(caminho_tarefas, caminho_recursos, objetivo, estimar=False):
+            falhas += 1
+            continue
+        inicio = time.perf_counter()
+        try:
+            execucao.executar(opcoes, caminho_tarefas, caminho_recursos, caminho_saida)
+        except Exception as erro:
+            if len(pares) == 1:
+                raise
+            print(f"Falha em {caminho_tarefas}: {type(erro).__name__}: {erro}")
+            falhas += 1
+        else:
+            if len(pares) > 1:
+                print(f"Par concluído em {time.perf_counter() - inicio:.2f}s.")
+
+    if execucao.medicao.ativa:
+        print(execucao.medicao.resumo())
+    if len(pares) > 1:
+        print(f"{len(pares) - falhas} de {len(pares)} par(es) resolvido(s).")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
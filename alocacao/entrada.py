@@ -0,0 +1,145 @@
+"""
+Validação dos CSVs de entrada e estimativa do tamanho do modelo, só com a
+biblioteca padrão: respondem sem carregar pandas, NumPy ou o OR-Tools.
+"""
+
+import csv
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional
+
+COLUNAS_TAREFAS = ("nota", "grupo", "codigo", "esforco", "prioridade", "habilidades")
+COLUNAS_RECURSOS = ("matricula", "nome", "nucleo", "disponibilidade", "habilidades")
+# Colunas inteiras e se aceitam valores negativos
+COLUNAS_INTEIRAS = {"nota": True, "esforco": False, "prioridade": True, "disponibilidade": False}
+# Erros (e avisos) listados por arquivo; os demais só entram na contagem
+MAXIMO_ERROS = 10
+
+
+@dataclass
+class ResumoArquivo:
+    """Linhas, erros, avisos e totais de um CSV de entrada. Só os erros o tornam inválido."""
+
+    caminho: str
+    linhas: int = 0
+    erros: List[str] = field(default_factory=list)
+    total_erros: int = 0
+    avisos: List[str] = field(default_factory=list)
+    total_avisos: int = 0
+    # Quantidade de linhas por conjunto de habilidades
+    assinaturas: Counter = field(default_factory=Counter)
+    # Soma do esforço (tarefas) ou da disponibilidade (recursos)
+    total: int = 0
+
+    def erro(self, mensagem: str):
+        self.total_erros += 1
+        if len(self.erros) < MAXIMO_ERROS:
+            self.erros.append(mensagem)
+
+    def aviso(self, mensagem: str):
+        self.total_avisos += 1
+        if len(self.avisos) < MAXIMO_ERROS:
+            self.avisos.append(mensagem)
+
+    @property
+    def valido(self) -> bool:
+        return self.total_erros == 0
+
+
+def _habilidades(texto: Optional[str]) -> FrozenSet[str]:
+    # Mesma regra de `carregamento.separar_habilidades`
+    return frozenset(h.strip() for h in (texto or "").split(",") if h.strip())
+
+
+def ler_arquivo(caminho, colunas, coluna_total: str) -> ResumoArquivo:
+    """
+    Confere cabeçalho, tipos e duplicidades de um CSV (UTF-8, separador ';').
+    Chaves repetidas são só avisos: a carga as aceita, como sempre aceitou.
+
+    Args:
+        caminho (str): O arquivo.
+        colunas (tuple): Colunas obrigatórias.
+        coluna_total (str): Coluna somada em `total`.
+
+    Returns:
+        ResumoArquivo: O resumo, com os erros e avisos encontrados.
+    """
+    resumo = ResumoArquivo(str(caminho))
+    if not os.path.isfile(caminho):
+        resumo.erro("arquivo não encontrado")
+        return resumo
+    chave = colunas[0]
+    vistos = set()
+    with open(caminho, encoding="utf-8-sig", newline="") as arquivo:
+        leitor = csv.DictReader(arquivo, delimiter=";")
+        faltando = [c for c in colunas if c not in (leitor.fieldnames or ())]
+        if faltando:
+            resumo.erro(f"colunas ausentes: {', '.join(faltando)}")
+            return resumo
+        for numero, linha in enumerate(leitor, start=2):
+            resumo.linhas += 1
+            for coluna, aceita_negativo in COLUNAS_INTEIRAS.items():
+                if coluna not in colunas:
+                    continue
+                try:
+                    valor = int(linha[coluna])
+                except (TypeError, ValueError):
+                    resumo.erro(f"linha {numero}: {coluna} não é inteiro ({linha[coluna]!r})")
+                    continue
+                if valor < 0 and not aceita_negativo:
+                    resumo.erro(f"linha {numero}: {coluna} negativo ({valor})")
+                elif coluna == coluna_total:
+                    resumo.total += valor
+            if linha[chave] in vistos:
+                resumo.aviso(f"linha {numero}: {chave} repetida ({linha[chave]})")
+            vistos.add(linha[chave])
+            resumo.assinaturas[_habilidades(linha["habilidades"])] += 1
+    return resumo
+
+
+def validar_entradas(caminho_tarefas, caminho_recursos) -> Dict[str, ResumoArquivo]:
+    """Valida o par de arquivos de uma alocação."""
+    return {
+        "tarefas": ler_arquivo(caminho_tarefas, COLUNAS_TAREFAS, "esforco"),
+        "recursos": ler_arquivo(caminho_recursos, COLUNAS_RECURSOS, "disponibilidade"),
+    }
+
+
+def estimar_modelo(tarefas: ResumoArquivo, recursos: ResumoArquivo, objetivo: str) -> Dict[str, int]:
+    """
+    Tamanho do modelo padrão (ver `modelagem.aplicar_restricoes`) a partir das
+    contagens por conjunto de habilidades: um par por tarefa e recurso que
+    cobre as habilidades dela.
+
+    Args:
+        tarefas (ResumoArquivo): Resumo do CSV de tarefas.
+        recursos (ResumoArquivo): Resumo do CSV de recursos.
+        objetivo (str): Objetivo de `modelagem.construir_modelo`.
+
+    Returns:
+        dict: Pares, variáveis e restrições estimados, e as tarefas sem recurso elegível.
+    """
+    pares = tarefas_com_pares = 0
+    recursos_com_pares = set()
+    for exigidas, quantidade in tarefas.assinaturas.items():
+        cobertos = [h for h in recursos.assinaturas if exigidas <= h]
+        elegiveis = sum(recursos.assinaturas[h] for h in cobertos)
+        pares += quantidade * elegiveis
+        if elegiveis:
+            tarefas_com_pares += quantidade
+            recursos_com_pares.update(cobertos)
+    com_pares = sum(recursos.assinaturas[h] for h in recursos_com_pares)
+
+    if objetivo == "esforco_maximo":
+        # Carga por recurso, carga máxima e mínima
+        auxiliares, restricoes_objetivo = recursos.linhas + 2, recursos.linhas + 2
+    else:
+        # Score de prioridade e esforço total
+        auxiliares, restricoes_objetivo = 2, 2
+    return {
+        "pares": pares,
+        "variaveis": pares + auxiliares,
+        "restricoes": tarefas_com_pares + com_pares + restricoes_objetivo,
+        "tarefas_sem_recurso": tarefas.linhas - tarefas_com_pares,
+    }
@@ -0,0 +1,534 @@
+"""
+Execução de uma alocação: a leitura, a construção e a solução que
+`exemplo_esforco_maximo.py` e `exemplo_prioridade_maxima.py` repetiam, com o
+objetivo e os pesos como parâmetros. Importa pandas e o OR-Tools; a CLI só
+carrega este módulo quando vai de fato resolver.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from ortools.sat.python import cp_model
+
+import agregacao
+import modelagem
+from cache_modelo import CacheModelos, cache_de_ambiente, chave_modelo
+from carregamento import RecursosColunares, TarefasColunares, ler_csv
+from configuracao_solver import ConfiguracaoSolver, configuracao_de_ambiente, criar_solver, exportar_parametros
+from decomposicao import resolver_decomposto
+from exportacao import caminhos_plano, exportar_plano
+from heuristica import resolver_heuristica
+from horizonte import resolver_horizonte
+from instrumentacao import Instrumentacao
+from lexicografico import ETAPA_BALANCEAMENTO, ETAPA_ESFORCO, ETAPAS_PADRAO, resolver_lexicografico
+from parada_antecipada import ExportacaoContinua, VigiaEstagnacao
+from partida_quente import aplicar_dicas, aplicar_partida_quente, fixar_atribuicao
+from reducao import reduzir
+from relaxacao import MOTOR_CPSAT, MOTOR_RELAXACAO, gap_limite, limite_relaxacao, resolver_relaxacao
+from simetria import aplicar_quebra_simetria
+
+# Etapas do modo lexicográfico de cada objetivo
+ETAPAS_LEXICOGRAFICAS = {
+    modelagem.OBJETIVO_ESFORCO_MAXIMO: (ETAPA_ESFORCO, ETAPA_BALANCEAMENTO),
+    modelagem.OBJETIVO_PRIORIDADE_MAXIMA: ETAPAS_PADRAO,
+}
+
+# Medição das fases e do solver, ativada por INSTRUMENTACAO=1
+medicao = Instrumentacao(ativa=False)
+
+
+@dataclass
+class Opcoes:
+    """Objetivo e opções de uma execução, as mesmas variáveis de ambiente dos scripts de exemplo."""
+
+    objetivo: str = modelagem.OBJETIVO_PRIORIDADE_MAXIMA
+    pesos: Optional[Dict[str, int]] = None
+    tempo_limite: float = 30.0
+    agregado: bool = False
+    enxuto: bool = False
+    quebra_simetria: bool = False
+    decomposicao: str = ""
+    processos: Optional[int] = None
+    distribuicao_anterior: str = ""
+    fixar_anterior: bool = False
+    heuristica: bool = False
+    tempo_heuristica: float = 1.0
+    lexicografico: bool = False
+    tolerancia_lexicografica: float = 0.0
+    configuracao: Optional[ConfiguracaoSolver] = None
+    estagnacao: Optional[float] = None
+    exportacao_continua: bool = False
+    horizonte_faixa: int = 0
+    cache: Optional[CacheModelos] = None
+    motor: str = MOTOR_CPSAT
+    limite_relaxacao: bool = False
+    reducao: bool = False
+    formato: Optional[str] = None
+
+    @classmethod
+    def de_ambiente(cls, objetivo=modelagem.OBJETIVO_PRIORIDADE_MAXIMA, pesos=None) -> "Opcoes":
+        """
+        Lê as opções das variáveis de ambiente.
+
+        Args:
+            objetivo (str, optional): Objetivo de `modelagem.construir_modelo`. Defaults to OBJETIVO_PRIORIDADE_MAXIMA.
+            pesos (dict, optional): Pesos do objetivo de prioridade máxima. Defaults to PESO_PRIORIDADE e PESO_ESFORCO.
+
+        Returns:
+            Opcoes: As opções.
+        """
+        if objetivo == modelagem.OBJETIVO_PRIORIDADE_MAXIMA and pesos is None:
+            pesos = {
+                "prioridade": int(os.getenv("PESO_PRIORIDADE", 60)),
+                "esforco": int(os.getenv("PESO_ESFORCO", 40)),
+            }
+        return cls(
+            objetivo=objetivo,
+            pesos=pesos if objetivo == modelagem.OBJETIVO_PRIORIDADE_MAXIMA else None,
+            tempo_limite=float(os.getenv("TEMPO_LIMITE", 30.0)),
+            agregado=os.getenv("MODELO_AGREGADO", "0") == "1",
+            enxuto=os.getenv("MODELO_ENXUTO", "0") == "1",
+            quebra_simetria=os.getenv("QUEBRA_SIMETRIA", "0") == "1",
+            decomposicao=os.getenv("DECOMPOSICAO", ""),
+            processos=int(os.getenv("PROCESSOS", 0)) or None,
+            distribuicao_anterior=os.getenv("DISTRIBUICAO_ANTERIOR", ""),
+            fixar_anterior=os.getenv("FIXAR_ANTERIOR", "0") == "1",
+            heuristica=os.getenv("HEURISTICA", "0") == "1",
+            tempo_heuristica=float(os.getenv("TEMPO_HEURISTICA", 1.0)),
+            lexicografico=os.getenv("LEXICOGRAFICO", "0") == "1",
+            tolerancia_lexicografica=float(os.getenv("TOLERANCIA_LEXICOGRAFICA", 0.0)),
+            configuracao=configuracao_de_ambiente(),
+            estagnacao=float(os.getenv("ESTAGNACAO", 0)) or None,
+            exportacao_continua=os.getenv("EXPORTACAO_CONTINUA", "0") == "1",
+            horizonte_faixa=int(os.getenv("HORIZONTE_FAIXA", 0)),
+            cache=cache_de_ambiente(),
+            motor=os.getenv("MOTOR_SOLUCAO") or MOTOR_CPSAT,
+            limite_relaxacao=os.getenv("LIMITE_RELAXACAO", "0") == "1",
+            reducao=os.getenv("REDUCAO", "0") == "1",
+            formato=os.getenv("FORMATO_SAIDA") or None,
+        )
+
+
+def caminho_saida_padrao(objetivo: str, formato: Optional[str] = None) -> str:
+    """Distribuição de um objetivo: CAMINHO_SAIDA_<OBJETIVO> ou ./data/distribuicao_tarefas_<objetivo>.csv."""
+    caminho = os.getenv(f"CAMINHO_SAIDA_{objetivo.upper()}") or f"./data/distribuicao_tarefas_{objetivo}.csv"
+    return caminhos_plano(caminho, formato)["distribuicao"]
+
+
+@medicao.medir()
+def obter_recursos(caminho):
+    """
+    Lê os dados dos recursos de um arquivo CSV.
+
+    Args:
+        caminho (str): O caminho para o arquivo CSV de recursos.
+
+    Returns:
+        tuple: Uma tupla contendo os recursos em formato colunar e o DataFrame original.
+    """
+    df = ler_csv(caminho)
+    recursos = RecursosColunares.de_dataframe(df)
+    return recursos, df
+
+
+@medicao.medir()
+def obter_tarefas(caminho):
+    """
+    Lê os dados das tarefas de um arquivo CSV.
+
+    Args:
+        caminho (str): O caminho para o arquivo CSV de tarefas.
+
+    Returns:
+        tuple: Uma tupla contendo as tarefas em formato colunar e o DataFrame original.
+    """
+    df = ler_csv(caminho)
+    tarefas = TarefasColunares.de_dataframe(df)
+    return tarefas, df
+
+
+@medicao.medir()
+def aplicar_restricoes(modelo, tarefas, recursos, agregado=False, simetria=False, enxuto=False, indice=None):
+    """
+    Aplica as restrições do problema ao modelo CP-SAT.
+
+    Args:
+        modelo (cp_model.CpModel): O objeto do modelo.
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        agregado (bool, optional): Agrupa tarefas idênticas em classes com variáveis inteiras. Defaults to False.
+        simetria (bool, optional): Ordena a carga de recursos intercambiáveis. Defaults to False.
+        enxuto (bool, optional): Variáveis sem nome, endereçadas por índice, para instâncias grandes. Defaults to False.
+        indice (IndiceElegibilidade, optional): Pares elegíveis já calculados (por exemplo, reduzidos). Defaults to None.
+
+    Returns:
+        tuple: Uma tupla contendo o modelo com as restrições e o ModeloAlocacao com as variáveis de decisão.
+    """
+    if agregado:
+        alocacao = agregacao.aplicar_restricoes_agregadas(modelo, tarefas, recursos)
+    else:
+        alocacao = modelagem.aplicar_restricoes(modelo, tarefas, recursos, indice, enxuto=enxuto)
+    if simetria:
+        aplicar_quebra_simetria(alocacao)
+    return modelo, alocacao
+
+
+@medicao.medir()
+def aplicar_reducao(tarefas, recursos, opcoes: Opcoes):
+    reducao = reduzir(tarefas, recursos, opcoes.objetivo, opcoes.pesos)
+    print(reducao.resumo())
+    return reducao
+
+
+@medicao.medir()
+def obter_modelo_em_cache(cache, chave):
+    alocacao = cache.carregar(chave)
+    if alocacao is not None:
+        print(f"Modelo carregado do cache ({chave[:16]}).")
+    return alocacao
+
+
+@medicao.medir()
+def aplicar_objetivos(alocacao, opcoes: Opcoes):
+    """
+    Define a função objetivo do modelo.
+
+    - esforço máximo: maximiza o esforço atribuído e, em segundo plano,
+      balanceia a carga entre os recursos;
+    - prioridade máxima: maximiza a combinação ponderada do score de
+      prioridade e do esforço das tarefas atribuídas.
+
+    Args:
+        alocacao (ModeloAlocacao): O mapeamento das variáveis de decisão.
+        opcoes (Opcoes): O objetivo e os pesos.
+
+    Returns:
+        cp_model.CpModel: O modelo com a função objetivo definida.
+    """
+    if opcoes.objetivo == modelagem.OBJETIVO_ESFORCO_MAXIMO:
+        modelagem.objetivo_esforco_maximo(alocacao)
+    else:
+        modelagem.objetivo_prioridade_maxima(alocacao, opcoes.pesos)
+    return alocacao.modelo
+
+
+@medicao.medir()
+def solucionar_modelo(modelo, tempo_limite=30.0, callback=None, configuracao=None, estagnacao=None):
+    """
+    Resolve o modelo CP-SAT usando o solver.
+
+    Args:
+        modelo (cp_model.CpModel): O modelo a ser resolvido.
+        tempo_limite (float, optional): O tempo máximo em segundos para o solver. Defaults to 30.0.
+        callback (cp_model.CpSolverSolutionCallback, optional): Chamado a cada solução encontrada. Defaults to None.
+        configuracao (ConfiguracaoSolver, optional): Workers, semente, estratégia e gap. Defaults to None.
+        estagnacao (float, optional): Encerra a busca após este tempo sem melhora do objetivo. Defaults to None.
+
+    Returns:
+        tuple: Uma tupla contendo o status da solução e o objeto solver.
+    """
+    solver = criar_solver(tempo_limite, configuracao)
+    with VigiaEstagnacao(solver, callback, estagnacao) as vigia, medicao.amostrar_limite(solver, callback):
+        status = solver.Solve(modelo, callback)
+    if vigia.interrompeu:
+        print(f"Busca interrompida após {estagnacao:.1f}s sem melhora do objetivo.")
+    return status, solver
+
+
+@medicao.medir()
+def solucionar_heuristica(tarefas, recursos, opcoes: Opcoes):
+    """
+    Resolve o problema com a heurística gulosa e busca local, sem o solver.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        opcoes (Opcoes): O objetivo, os pesos e o tempo da heurística.
+
+    Returns:
+        ResultadoHeuristica: A atribuição encontrada e o valor do objetivo.
+    """
+    reserva = resolver_heuristica(tarefas, recursos, opcoes.objetivo, opcoes.pesos, opcoes.tempo_heuristica)
+    print(reserva.resumo())
+    return reserva
+
+
+@medicao.medir()
+def solucionar_relaxacao(tarefas, recursos, opcoes: Opcoes):
+    """
+    Plano da relaxação linear arredondada e completada pela busca local, sem o CP-SAT.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        opcoes (Opcoes): O objetivo, os pesos e o tempo limite da busca local.
+
+    Returns:
+        ResultadoRelaxacao: O plano, o valor do objetivo e o limite da relaxação.
+    """
+    resultado = resolver_relaxacao(tarefas, recursos, opcoes.objetivo, opcoes.pesos, opcoes.tempo_limite)
+    print(resultado.resumo())
+    return resultado
+
+
+@medicao.medir()
+def calcular_limite_relaxacao(tarefas, recursos, opcoes: Opcoes):
+    """
+    Limite superior do objetivo pela relaxação linear, para o gap verdadeiro da solução do CP-SAT.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        opcoes (Opcoes): O objetivo e os pesos.
+
+    Returns:
+        int: O limite.
+    """
+    limite = limite_relaxacao(tarefas, recursos, opcoes.objetivo, opcoes.pesos).limite
+    print(f"Limite da relaxação linear: {limite}")
+    return limite
+
+
+@medicao.medir()
+def exportar_resultado(status, solver, tarefas, recursos, alocacao, caminho_saida, reserva=None, limite=None):
+    """
+    Exporta o resultado da otimização se uma solução for encontrada.
+
+    Args:
+        status: O status da solução retornado pelo solver.
+        solver: O objeto solver após a execução.
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        alocacao (ModeloAlocacao): O mapeamento das variáveis de decisão.
+        caminho_saida (str): O arquivo da distribuição.
+        reserva (ResultadoHeuristica, optional): Exportada quando o solver não encontra solução. Defaults to None.
+        limite (int, optional): Limite da relaxação linear, para o gap verdadeiro. Defaults to None.
+    """
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        print(f"Status da solução: {solver.StatusName(status)} ({status})")
+        print(f"Valor do objetivo alcançado: {solver.ObjectiveValue()}")
+        print(f"Melhor limite: {solver.BestObjectiveBound()} (gap {modelagem.gap_relativo(solver):.4%})")
+        if limite is not None:
+            # O melhor dos dois limites superiores dá o gap verdadeiro da solução
+            gap = gap_limite(solver.ObjectiveValue(), min(limite, solver.BestObjectiveBound()))
+            print(f"Limite da relaxação: {limite} (gap verdadeiro {gap:.4%})")
+        print(f"Tempo de solução: {solver.WallTime():.2f}s")
+        if status == cp_model.OPTIMAL:
+            print("Solução ótima encontrada.")
+        if status == cp_model.FEASIBLE:
+            print("Solução viável encontrada, mas não ótima.")
+
+        exportar_plano(alocacao.atribuicao(solver), tarefas, recursos, caminho_saida)
+
+        print(f"Distribuição exportada para '{caminho_saida}'.")
+    else:
+        print(f"Não foi possível encontrar uma solução viável: {status}")
+        if reserva is not None:
+            exportar_plano(reserva.atribuicao, tarefas, recursos, caminho_saida)
+            print(f"Distribuição da heurística exportada para '{caminho_saida}'.")
+
+
+def executar(opcoes: Opcoes, caminho_tarefas, caminho_recursos, caminho_saida=None):
+    """
+    Resolve uma alocação e exporta o plano e os parâmetros usados.
+
+    Args:
+        opcoes (Opcoes): O objetivo e as opções da execução.
+        caminho_tarefas (str): O CSV de tarefas.
+        caminho_recursos (str): O CSV de recursos.
+        caminho_saida (str, optional): O arquivo da distribuição. Defaults to `caminho_saida_padrao`.
+    """
+    caminho_saida = caminhos_plano(caminho_saida or caminho_saida_padrao(opcoes.objetivo), opcoes.formato)[
+        "distribuicao"
+    ]
+    os.makedirs(os.path.dirname(caminho_saida) or ".", exist_ok=True)
+    configuracao, tempo_limite = opcoes.configuracao, opcoes.tempo_limite
+    # A ordem de carga imposta pela quebra de simetria contradiz a distribuição anterior
+    simetria = opcoes.quebra_simetria and not opcoes.distribuicao_anterior
+    # A dominância da redução usa o valor ponderado, que não vale nas etapas
+    # lexicográficas, e removeria ou fixaria pares da distribuição anterior
+    reduzir_modelo = opcoes.reducao and not (
+        opcoes.agregado or opcoes.lexicografico or opcoes.distribuicao_anterior
+    )
+
+    # Modelo já construído para as mesmas entradas e opções: dispensa a leitura e a construção
+    alocacao = chave = None
+    if opcoes.cache is not None and not (
+        opcoes.decomposicao or opcoes.horizonte_faixa or opcoes.motor == MOTOR_RELAXACAO
+    ):
+        chave = chave_modelo(
+            (caminho_tarefas, caminho_recursos),
+            objetivo=opcoes.objetivo,
+            pesos=opcoes.pesos,
+            agregado=opcoes.agregado,
+            enxuto=opcoes.enxuto,
+            simetria=simetria,
+            lexicografico=opcoes.lexicografico,
+            reducao=reduzir_modelo,
+        )
+        alocacao = obter_modelo_em_cache(opcoes.cache, chave)
+
+    if alocacao is not None:
+        tarefas_priorizadas, recursos = alocacao.tarefas_da_atribuicao(), alocacao.recursos
+    else:
+        tarefas, df_tarefas = obter_tarefas(caminho_tarefas)
+        recursos, df_recursos = obter_recursos(caminho_recursos)
+
+        # Ordenar notas por prioridade (menor número = maior prioridade)
+        tarefas_priorizadas = tarefas.ordenar_por_prioridade()
+        # Daqui em diante só as colunas ordenadas são usadas
+        del tarefas, df_tarefas, df_recursos
+
+    if opcoes.motor == MOTOR_RELAXACAO:
+        # Plano da relaxação linear em vez do CP-SAT, para tempos limite muito curtos
+        resultado = solucionar_relaxacao(tarefas_priorizadas, recursos, opcoes)
+        exportar_plano(resultado.atribuicao, tarefas_priorizadas, recursos, caminho_saida)
+        exportar_parametros(
+            caminho_saida, configuracao, tempo_limite, modo="relaxacao", limite_relaxacao=resultado.limite
+        )
+        print(f"Distribuição exportada para '{caminho_saida}'.")
+        return
+
+    if opcoes.decomposicao:
+        # Subproblemas independentes resolvidos em paralelo
+        resultado = resolver_decomposto(
+            tarefas_priorizadas,
+            recursos,
+            opcoes.objetivo,
+            opcoes.pesos,
+            tempo_limite,
+            opcoes.decomposicao,
+            opcoes.processos,
+            configuracao=configuracao,
+            agregado=opcoes.agregado,
+            simetria=opcoes.quebra_simetria,
+            enxuto=opcoes.enxuto,
+        )
+        print(resultado.resumo())
+        atribuicao = resultado.atribuicao
+        if resultado.status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            atribuicao = solucionar_heuristica(tarefas_priorizadas, recursos, opcoes).atribuicao
+        exportar_plano(atribuicao, tarefas_priorizadas, recursos, caminho_saida)
+        exportar_parametros(caminho_saida, configuracao, tempo_limite, modo="decomposto")
+        print(f"Distribuição exportada para '{caminho_saida}'.")
+        return
+
+    if opcoes.horizonte_faixa:
+        # Faixas de prioridade resolvidas em sequência, cada uma com a capacidade restante
+        resultado = resolver_horizonte(
+            tarefas_priorizadas,
+            recursos,
+            opcoes.objetivo,
+            opcoes.pesos,
+            tempo_limite,
+            opcoes.horizonte_faixa,
+            configuracao,
+            opcoes.tempo_heuristica if opcoes.heuristica else 0.0,
+            agregado=opcoes.agregado,
+            enxuto=opcoes.enxuto,
+        )
+        print(resultado.resumo())
+        exportar_plano(resultado.atribuicao, tarefas_priorizadas, recursos, caminho_saida)
+        exportar_parametros(
+            caminho_saida, configuracao, tempo_limite, modo="horizonte", tamanho_faixa=opcoes.horizonte_faixa
+        )
+        print(f"Distribuição exportada para '{caminho_saida}'.")
+        return
+
+    reducao = None
+    if alocacao is None:
+        # Pares impossíveis removidos e atribuições forçadas fixadas antes da construção
+        if reduzir_modelo:
+            reducao = aplicar_reducao(tarefas_priorizadas, recursos, opcoes)
+            if reducao.solucao is not None:
+                exportar_plano(reducao.solucao, tarefas_priorizadas, recursos, caminho_saida)
+                exportar_parametros(
+                    caminho_saida, configuracao, tempo_limite, modo="reducao", reducao=reducao.relatorio()
+                )
+                print(f"Distribuição exportada para '{caminho_saida}'.")
+                return
+
+        inicio = time.perf_counter()
+        modelo_final, alocacao = aplicar_restricoes(
+            cp_model.CpModel(),
+            tarefas_priorizadas,
+            recursos,
+            opcoes.agregado,
+            simetria,
+            opcoes.enxuto,
+            reducao.indice if reducao is not None else None,
+        )
+        if reducao is not None:
+            fixar_atribuicao(alocacao, reducao.fixadas)
+        if not opcoes.lexicografico:
+            modelo_final = aplicar_objetivos(alocacao, opcoes)
+        print(f"Tempo de construção do modelo: {time.perf_counter() - inicio:.3f}s")
+        if chave is not None:
+            # Gravado antes das dicas e da partida quente, que dependem de outras entradas
+            opcoes.cache.salvar(chave, alocacao)
+    else:
+        modelo_final = alocacao.modelo
+    medicao.registrar_modelo(alocacao)
+
+    reserva = None
+    if opcoes.distribuicao_anterior:
+        partida = aplicar_partida_quente(alocacao, opcoes.distribuicao_anterior, opcoes.fixar_anterior)
+        print(partida.resumo())
+    elif opcoes.heuristica:
+        # Solução da heurística como ponto de partida do solver
+        reserva = solucionar_heuristica(tarefas_priorizadas, recursos, opcoes)
+        aplicar_dicas(alocacao, reserva.atribuicao)
+
+    if opcoes.lexicografico:
+        # Objetivos otimizados um de cada vez, em ordem de importância
+        inicial = None
+        if opcoes.distribuicao_anterior:
+            inicial = partida.anterior
+        elif reserva is not None:
+            inicial = reserva.atribuicao
+        resultado = resolver_lexicografico(
+            alocacao,
+            tempo_limite,
+            ETAPAS_LEXICOGRAFICAS[opcoes.objetivo],
+            opcoes.tolerancia_lexicografica,
+            atribuicao_inicial=inicial,
+            callback=medicao.telemetria(),
+            configuracao=configuracao,
+            estagnacao=opcoes.estagnacao,
+        )
+        print(resultado.resumo())
+        atribuicao = resultado.atribuicao
+        if atribuicao is None:
+            if reserva is None:
+                reserva = solucionar_heuristica(tarefas_priorizadas, recursos, opcoes)
+            atribuicao = reserva.atribuicao
+        exportar_plano(atribuicao, tarefas_priorizadas, recursos, caminho_saida)
+        exportar_parametros(caminho_saida, configuracao, tempo_limite, modo="lexicografico")
+        print(f"Distribuição exportada para '{caminho_saida}'.")
+        return
+
+    limite = calcular_limite_relaxacao(tarefas_priorizadas, recursos, opcoes) if opcoes.limite_relaxacao else None
+
+    # Cada solução melhor já é gravada no arquivo de saída durante a busca
+    continua = ExportacaoContinua(alocacao, caminho_saida) if opcoes.exportacao_continua else None
+    registro = medicao.telemetria(continua)
+    status, solver = solucionar_modelo(modelo_final, tempo_limite, registro, configuracao, opcoes.estagnacao)
+    medicao.registrar_solver(solver, status)
+    print(registro.resumo())
+
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE) and reserva is None:
+        reserva = solucionar_heuristica(tarefas_priorizadas, recursos, opcoes)
+
+    exportar_resultado(status, solver, tarefas_priorizadas, recursos, alocacao, caminho_saida, reserva, limite)
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) or reserva is not None:
+        exportar_parametros(
+            caminho_saida,
+            configuracao,
+            tempo_limite,
+            solver,
+            status=solver.StatusName(status),
+            limite_relaxacao=limite,
+            reducao=reducao.relatorio() if reducao is not None else None,
+        )
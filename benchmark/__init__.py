@@ -0,0 +1,18 @@
+"""
+Benchmark de escalabilidade da alocação.
+
+- `benchmark.gerador`: gera tarefas e recursos sintéticos no mesmo formato dos CSVs de entrada;
+- `benchmark.executor`: mede o tempo de cada fase (carga, elegibilidade, construção,
+  solução e exportação) para os dois objetivos e grava os resultados em JSON;
+- `benchmark.horizonte`: compara o horizonte rolante por faixas de prioridade com o
+  modelo monolítico, com o mesmo tempo total;
+- `benchmark.memoria`: compara o pico de memória dos modelos padrão e enxuto.
+
+Uso, a partir da raiz do projeto:
+
+    python -m benchmark.gerador 10000 --destino ./data/sintetico
+    python -m benchmark.executor --tamanhos 1000 10000 --tempo-limite 10
+    python -m benchmark.executor --comparar antes.json depois.json
+    python -m benchmark.horizonte --tamanhos 2000 5000 --faixa 500 --tempo-limite 30
+    python -m benchmark.memoria --tamanhos 10000 50000
+"""
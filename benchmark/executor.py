@@ -0,0 +1,327 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+import ortools
+from ortools.sat.python import cp_model
+
+import agregacao
+import modelagem
+from benchmark.gerador import gerar_instancia, salvar_instancia
+from carregamento import carregar_dados
+from configuracao_solver import ConfiguracaoSolver, adicionar_argumentos, criar_solver, de_argumentos
+from elegibilidade import IndiceElegibilidade
+from exportacao import exportar_distribuicao
+from heuristica import resolver_heuristica
+from instrumentacao import memoria_pico_mb
+from partida_quente import aplicar_dicas
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+
+FASES = ("carregamento", "elegibilidade", "construcao", "heuristica", "solucao", "exportacao")
+OBJETIVOS = (modelagem.OBJETIVO_ESFORCO_MAXIMO, modelagem.OBJETIVO_PRIORIDADE_MAXIMA)
+TAMANHOS_PADRAO = (1000, 5000, 10000)
+
+# Uma fase só é considerada regressão se piorar mais que a tolerância relativa
+# e mais que o mínimo absoluto (evita ruído em fases de milissegundos)
+TOLERANCIA_REGRESSAO = 0.2
+MINIMO_REGRESSAO = 0.05
+
+
+@contextmanager
+def _cronometrar(fases: Dict[str, dict], nome: str):
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    yield
+    fases[nome] = {
+        "tempo": round(time.perf_counter() - inicio, 4),
+        "cpu": round(time.process_time() - inicio_cpu, 4),
+    }
+    # Pico do processo até o fim da fase (só cresce; None fora de sistemas Unix)
+    memoria = memoria_pico_mb()
+    fases[nome]["memoria_pico_mb"] = None if memoria is None else round(memoria, 1)
+
+
+def _commit_atual() -> Optional[str]:
+    try:
+        saida = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return saida.stdout.strip()
+
+
+def metadados() -> dict:
+    """Versão do código e do ambiente em que o benchmark rodou."""
+    return {
+        "commit": _commit_atual(),
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "ortools": ortools.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def medir_execucao(
+    caminho_tarefas,
+    caminho_recursos,
+    objetivo: str,
+    tempo_limite=10.0,
+    tempo_heuristica=0.0,
+    agregado=False,
+    pesos: Optional[dict] = None,
+    configuracao: Optional[ConfiguracaoSolver] = None,
+    enxuto=False,
+) -> dict:
+    """
+    Mede uma execução completa, fase a fase, como nos scripts de exemplo.
+
+    Args:
+        caminho_tarefas (str): CSV de tarefas.
+        caminho_recursos (str): CSV de recursos.
+        objetivo (str): OBJETIVO_ESFORCO_MAXIMO ou OBJETIVO_PRIORIDADE_MAXIMA.
+        tempo_limite (float, optional): Tempo do solver, em segundos. Defaults to 10.0.
+        tempo_heuristica (float, optional): Tempo da heurística usada como dica (0 desativa). Defaults to 0.0.
+        agregado (bool, optional): Usa o modelo agregado por classes. Defaults to False.
+        pesos (dict, optional): Pesos do objetivo de prioridade. Defaults to PESOS_PADRAO.
+        configuracao (ConfiguracaoSolver, optional): Parâmetros do solver. Defaults to None.
+        enxuto (bool, optional): Usa o modelo enxuto em memória. Defaults to False.
+
+    Returns:
+        dict: Tempo de parede e de CPU de cada fase, tamanho do modelo e resultado do solver.
+    """
+    fases = {}
+    with _cronometrar(fases, "carregamento"):
+        tarefas, recursos = carregar_dados(caminho_tarefas, caminho_recursos)
+        tarefas = tarefas.ordenar_por_prioridade()
+
+    with _cronometrar(fases, "elegibilidade"):
+        indice = IndiceElegibilidade.de_dados(tarefas, recursos)
+
+    modelo = cp_model.CpModel()
+    with _cronometrar(fases, "construcao"):
+        if agregado:
+            alocacao = agregacao.aplicar_restricoes_agregadas(modelo, tarefas, recursos)
+        else:
+            alocacao = modelagem.aplicar_restricoes(modelo, tarefas, recursos, indice, enxuto)
+        if objetivo == modelagem.OBJETIVO_ESFORCO_MAXIMO:
+            modelagem.objetivo_esforco_maximo(alocacao)
+        else:
+            modelagem.objetivo_prioridade_maxima(alocacao, pesos)
+
+    reserva = None
+    if tempo_heuristica:
+        with _cronometrar(fases, "heuristica"):
+            reserva = resolver_heuristica(tarefas, recursos, objetivo, pesos, tempo_heuristica)
+            aplicar_dicas(alocacao, reserva.atribuicao)
+
+    solver = criar_solver(tempo_limite, configuracao)
+    with _cronometrar(fases, "solucao"):
+        status = solver.Solve(modelo)
+
+    encontrou = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    with _cronometrar(fases, "exportacao"):
+        if encontrou or reserva is not None:
+            atribuicao = alocacao.atribuicao(solver) if encontrou else reserva.atribuicao
+            with tempfile.TemporaryDirectory() as diretorio:
+                exportar_distribuicao(atribuicao, tarefas, recursos, os.path.join(diretorio, "distribuicao.csv"))
+
+    proto = modelo.Proto()
+    return {
+        "objetivo": objetivo,
+        "tarefas": len(tarefas),
+        "recursos": len(recursos),
+        "pares_elegiveis": len(indice),
+        "variaveis": len(proto.variables),
+        "restricoes": len(proto.constraints),
+        "status": solver.StatusName(status),
+        "valor_objetivo": solver.ObjectiveValue() if encontrou else None,
+        "limite": solver.BestObjectiveBound() if encontrou else None,
+        "gap": modelagem.gap_relativo(solver) if encontrou else None,
+        "objetivo_heuristica": reserva.objetivo if reserva is not None else None,
+        "fases": fases,
+        "tempo_total": round(sum(f["tempo"] for f in fases.values()), 4),
+    }
+
+
+def executar_benchmark(
+    tamanhos=TAMANHOS_PADRAO,
+    objetivos=OBJETIVOS,
+    tempo_limite=10.0,
+    tempo_heuristica=0.0,
+    semente=0,
+    agregado=False,
+    diretorio_instancias: Optional[str] = None,
+    num_recursos: Optional[int] = None,
+    configuracao: Optional[ConfiguracaoSolver] = None,
+    enxuto=False,
+) -> dict:
+    """
+    Gera uma instância sintética para cada tamanho e mede os dois objetivos em cada uma.
+
+    Args:
+        tamanhos (Sequence[int], optional): Quantidades de tarefas. Defaults to TAMANHOS_PADRAO.
+        objetivos (Sequence[str], optional): Objetivos medidos. Defaults to OBJETIVOS.
+        tempo_limite (float, optional): Tempo do solver em cada execução. Defaults to 10.0.
+        tempo_heuristica (float, optional): Tempo da heurística usada como dica (0 desativa). Defaults to 0.0.
+        semente (int, optional): Semente do gerador. Defaults to 0.
+        agregado (bool, optional): Usa o modelo agregado por classes. Defaults to False.
+        diretorio_instancias (str, optional): Onde manter os CSVs gerados. Defaults to um diretório temporário.
+        num_recursos (int, optional): Quantidade fixa de recursos. Defaults to a proporção da amostra,
+            com a qual os pares elegíveis crescem com o quadrado do tamanho.
+        configuracao (ConfiguracaoSolver, optional): Parâmetros do solver. Defaults to None.
+        enxuto (bool, optional): Usa o modelo enxuto em memória. Defaults to False.
+
+    Returns:
+        dict: Metadados, parâmetros e uma execução por tamanho e objetivo.
+    """
+    parametros = {
+        "tamanhos": list(tamanhos),
+        "objetivos": list(objetivos),
+        "tempo_limite": tempo_limite,
+        "tempo_heuristica": tempo_heuristica,
+        "semente": semente,
+        "agregado": agregado,
+        "enxuto": enxuto,
+        "recursos": num_recursos,
+        "solver": asdict(configuracao or ConfiguracaoSolver()),
+    }
+    execucoes = []
+    with tempfile.TemporaryDirectory() as temporario:
+        for tamanho in tamanhos:
+            destino = os.path.join(diretorio_instancias or temporario, f"instancia_{tamanho}")
+            caminhos = salvar_instancia(*gerar_instancia(tamanho, num_recursos, semente), destino)
+            for objetivo in objetivos:
+                execucao = medir_execucao(
+                    *caminhos, objetivo, tempo_limite, tempo_heuristica, agregado, configuracao=configuracao, enxuto=enxuto
+                )
+                print(_linha_execucao(execucao))
+                execucoes.append(execucao)
+    return {"metadados": metadados(), "parametros": parametros, "execucoes": execucoes}
+
+
+def _linha_execucao(execucao: dict) -> str:
+    fases = " ".join(f"{nome}={dados['tempo']:.3f}s" for nome, dados in execucao["fases"].items())
+    return (
+        f"{execucao['objetivo']:<18} {execucao['tarefas']:>7} tarefas {execucao['pares_elegiveis']:>9} pares "
+        f"{execucao['status']:<9} {fases}"
+    )
+
+
+def salvar_resultados(resultados: dict, caminho: Optional[str] = None) -> str:
+    """
+    Grava os resultados em JSON. Sem caminho, usa `benchmark/resultados/<data>_<commit>.json`.
+
+    Returns:
+        str: O caminho do arquivo gravado.
+    """
+    if caminho is None:
+        meta = resultados["metadados"]
+        data = meta["data"].replace(":", "").replace("-", "")
+        caminho = os.path.join(DIRETORIO_RESULTADOS, f"{data}_{meta['commit'] or 'sem_commit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+    return caminho
+
+
+def carregar_resultados(caminho) -> dict:
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def comparar_resultados(
+    anterior: dict, atual: dict, tolerancia=TOLERANCIA_REGRESSAO, minimo=MINIMO_REGRESSAO
+) -> List[dict]:
+    """
+    Compara as fases de execuções equivalentes (mesmo objetivo e tamanho) de dois benchmarks.
+
+    Args:
+        anterior (dict): Resultados de referência.
+        atual (dict): Resultados novos.
+        tolerancia (float, optional): Piora relativa aceita. Defaults to TOLERANCIA_REGRESSAO.
+        minimo (float, optional): Piora absoluta mínima, em segundos, para acusar regressão.
+            Defaults to MINIMO_REGRESSAO.
+
+    Returns:
+        List[dict]: Uma linha por fase comparada, com a variação e a marca `regressao`.
+    """
+    referencia = {(e["objetivo"], e["tarefas"]): e for e in anterior["execucoes"]}
+    linhas = []
+    for execucao in atual["execucoes"]:
+        base = referencia.get((execucao["objetivo"], execucao["tarefas"]))
+        if base is None:
+            continue
+        for fase in FASES:
+            if fase not in execucao["fases"] or fase not in base["fases"]:
+                continue
+            antes, depois = base["fases"][fase]["tempo"], execucao["fases"][fase]["tempo"]
+            linhas.append(
+                {
+                    "objetivo": execucao["objetivo"],
+                    "tarefas": execucao["tarefas"],
+                    "fase": fase,
+                    "anterior": antes,
+                    "atual": depois,
+                    "variacao": (depois - antes) / antes if antes else None,
+                    "regressao": depois - antes > max(minimo, antes * tolerancia),
+                }
+            )
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o tempo de cada fase da alocação em instâncias sintéticas.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO))
+    parser.add_argument("--objetivos", nargs="+", choices=OBJETIVOS, default=list(OBJETIVOS))
+    parser.add_argument("--tempo-limite", type=float, default=10.0)
+    parser.add_argument("--tempo-heuristica", type=float, default=0.0, help="heurística como dica (0 desativa)")
+    parser.add_argument("--recursos", type=int, default=None, help="recursos fixos (padrão: proporção da amostra)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--agregado", action="store_true", help="usa o modelo agregado por classes")
+    parser.add_argument("--enxuto", action="store_true", help="usa o modelo enxuto em memória")
+    parser.add_argument("--instancias", default=None, help="diretório para manter os CSVs gerados")
+    parser.add_argument("--saida", default=None, help="arquivo JSON (padrão: benchmark/resultados/)")
+    adicionar_argumentos(parser)
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTERIOR", "ATUAL"), help="compara dois JSONs e sai")
+    args = parser.parse_args()
+
+    if args.comparar:
+        linhas = comparar_resultados(*(carregar_resultados(c) for c in args.comparar))
+        for linha in linhas:
+            variacao = "-" if linha["variacao"] is None else f"{linha['variacao']:+.1%}"
+            marca = "  REGRESSÃO" if linha["regressao"] else ""
+            print(
+                f"{linha['objetivo']:<18} {linha['tarefas']:>7} {linha['fase']:<13} "
+                f"{linha['anterior']:>9.3f}s -> {linha['atual']:>9.3f}s ({variacao}){marca}"
+            )
+        regressoes = sum(linha["regressao"] for linha in linhas)
+        print(f"{regressoes} regressões em {len(linhas)} fases comparadas")
+        raise SystemExit(1 if regressoes else 0)
+
+    resultados = executar_benchmark(
+        args.tamanhos,
+        args.objetivos,
+        args.tempo_limite,
+        args.tempo_heuristica,
+        args.semente,
+        args.agregado,
+        args.instancias,
+        args.recursos,
+        de_argumentos(args),
+        args.enxuto,
+    )
+    print(f"Resultados gravados em '{salvar_resultados(resultados, args.saida)}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import math
+import os
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Perfis baseados na amostra de produção (data/prd_rot_*.csv). As habilidades
+# raras (EXP nas tarefas) não aparecem na amostra, mas existem nos recursos e
+# tornam a elegibilidade menos uniforme nas instâncias maiores.
+GRUPOS_CODIGOS = {
+    ("SUBSREDE", "SUBT"): 0.41,
+    ("EXTREDBT", "INRU"): 0.24,
+    ("EXTREDBT", "INUR"): 0.08,
+    ("EXTREDBT", "CORU"): 0.06,
+    ("REMODESL", "BTBT"): 0.05,
+    ("REMODESL", "DEPO"): 0.05,
+    ("ALTECARG", "DERE"): 0.05,
+    ("ALTECARG", "COUR"): 0.03,
+    ("EXTREDMT", "REPT"): 0.02,
+    ("EXTREDMT", "EXMT"): 0.01,
+}
+HABILIDADES_TAREFAS = {"VAR": 0.68, "VAR,COM": 0.26, "VAR,EXP": 0.04, "VAR,EXP,COM": 0.02}
+HABILIDADES_RECURSOS = {"VAR,COM": 0.53, "VAR,EXP,COM": 0.33, "VAR": 0.14}
+DISPONIBILIDADES = {1800: 0.85, 1200: 0.10, 900: 0.05}
+
+# Esforço: média ~250 e desvio ~140, entre 2 e 480, como na amostra
+ESFORCO_MEDIA = 250
+ESFORCO_DESVIO = 140
+ESFORCO_MINIMO = 2
+ESFORCO_MAXIMO = 480
+
+# A amostra tem 400 tarefas para 30 recursos (demanda ~1,85x a capacidade)
+TAREFAS_POR_RECURSO = 400 / 30
+RECURSOS_POR_NUCLEO = 30
+
+
+def _sortear(rng: np.random.Generator, distribuicao: Dict, quantidade: int) -> np.ndarray:
+    valores = list(distribuicao)
+    probabilidades = np.array(list(distribuicao.values()), dtype=float)
+    escolhas = rng.choice(len(valores), size=quantidade, p=probabilidades / probabilidades.sum())
+    return np.array(valores, dtype=object)[escolhas]
+
+
+def gerar_tarefas(num_tarefas: int, semente=0, faixas_prioridade: Optional[int] = None) -> pd.DataFrame:
+    """
+    Gera tarefas no formato do CSV de tarefas.
+
+    Args:
+        num_tarefas (int): Quantidade de tarefas.
+        semente (int, optional): Semente do gerador aleatório. Defaults to 0.
+        faixas_prioridade (int, optional): Quantidade de prioridades distintas. Sem
+            valor, cada tarefa recebe uma prioridade única (0 a n-1), como na amostra.
+
+    Returns:
+        pd.DataFrame: Colunas nota, grupo, codigo, esforco, prioridade, habilidades.
+    """
+    rng = np.random.default_rng(semente)
+    grupos_codigos = _sortear(rng, GRUPOS_CODIGOS, num_tarefas)
+    esforco = rng.normal(ESFORCO_MEDIA, ESFORCO_DESVIO, num_tarefas).round()
+    if faixas_prioridade is None:
+        prioridade = rng.permutation(num_tarefas)
+    else:
+        prioridade = rng.integers(0, faixas_prioridade, num_tarefas)
+
+    return pd.DataFrame(
+        {
+            "nota": 9100000000 + rng.choice(10**8, size=num_tarefas, replace=False),
+            "grupo": [g for g, _ in grupos_codigos],
+            "codigo": [c for _, c in grupos_codigos],
+            "esforco": np.clip(esforco, ESFORCO_MINIMO, ESFORCO_MAXIMO).astype(np.int64),
+            "prioridade": prioridade.astype(np.int64),
+            "habilidades": _sortear(rng, HABILIDADES_TAREFAS, num_tarefas),
+        }
+    )
+
+
+def gerar_recursos(num_recursos: int, semente=0, num_nucleos: Optional[int] = None) -> pd.DataFrame:
+    """
+    Gera recursos no formato do CSV de recursos.
+
+    Args:
+        num_recursos (int): Quantidade de recursos.
+        semente (int, optional): Semente do gerador aleatório. Defaults to 0.
+        num_nucleos (int, optional): Quantidade de núcleos. Defaults to um núcleo a cada 30 recursos.
+
+    Returns:
+        pd.DataFrame: Colunas matricula, nome, nucleo, disponibilidade, habilidades.
+    """
+    rng = np.random.default_rng(semente + 1)
+    if num_nucleos is None:
+        num_nucleos = max(1, math.ceil(num_recursos / RECURSOS_POR_NUCLEO))
+    matriculas = rng.choice(10**6, size=num_recursos, replace=False)
+
+    return pd.DataFrame(
+        {
+            "matricula": [f"U{m:06d}" for m in matriculas],
+            "nome": [f"PROJETISTA {i + 1:05d}" for i in range(num_recursos)],
+            "nucleo": [f"PLANO_{n + 1}" for n in rng.integers(0, num_nucleos, num_recursos)],
+            "disponibilidade": _sortear(rng, DISPONIBILIDADES, num_recursos).astype(np.int64),
+            "habilidades": _sortear(rng, HABILIDADES_RECURSOS, num_recursos),
+        }
+    )
+
+
+def gerar_instancia(num_tarefas: int, num_recursos: Optional[int] = None, semente=0, faixas_prioridade=None):
+    """
+    Gera tarefas e recursos com a mesma proporção da amostra de produção.
+
+    Returns:
+        tuple: (tarefas, recursos) como DataFrames.
+    """
+    if num_recursos is None:
+        num_recursos = max(1, round(num_tarefas / TAREFAS_POR_RECURSO))
+    return gerar_tarefas(num_tarefas, semente, faixas_prioridade), gerar_recursos(num_recursos, semente)
+
+
+def salvar_instancia(tarefas: pd.DataFrame, recursos: pd.DataFrame, destino) -> tuple:
+    """
+    Grava a instância como `tarefas.csv` e `recursos.csv` (UTF-8, separador ';').
+
+    Returns:
+        tuple: Os caminhos (tarefas, recursos).
+    """
+    os.makedirs(destino, exist_ok=True)
+    caminho_tarefas = os.path.join(destino, "tarefas.csv")
+    caminho_recursos = os.path.join(destino, "recursos.csv")
+    tarefas.to_csv(caminho_tarefas, index=False, encoding="utf-8", sep=";")
+    recursos.to_csv(caminho_recursos, index=False, encoding="utf-8", sep=";")
+    return caminho_tarefas, caminho_recursos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera uma instância sintética de tarefas e recursos.")
+    parser.add_argument("tarefas", type=int, help="quantidade de tarefas")
+    parser.add_argument("--recursos", type=int, default=None, help="quantidade de recursos (padrão: proporção da amostra)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--faixas-prioridade", type=int, default=None, help="prioridades distintas (padrão: todas únicas)")
+    parser.add_argument("--destino", default="./data/sintetico")
+    args = parser.parse_args()
+
+    tarefas, recursos = gerar_instancia(args.tarefas, args.recursos, args.semente, args.faixas_prioridade)
+    caminhos = salvar_instancia(tarefas, recursos, args.destino)
+    print(f"{len(tarefas)} tarefas e {len(recursos)} recursos gravados em {caminhos}")
+
+
+if __name__ == "__main__":
+    main()
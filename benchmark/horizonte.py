@@ -0,0 +1,148 @@
+import argparse
+import os
+import time
+from typing import Optional
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+import modelagem
+from benchmark.executor import DIRETORIO_RESULTADOS, metadados, salvar_resultados
+from benchmark.gerador import gerar_instancia
+from carregamento import RecursosColunares, TarefasColunares
+from configuracao_solver import ConfiguracaoSolver, adicionar_argumentos, criar_solver, de_argumentos
+from heuristica import resolver_heuristica, valor_objetivo
+from horizonte import TAMANHO_FAIXA_PADRAO, resolver_horizonte
+from partida_quente import aplicar_dicas
+
+
+def _indicadores(atribuicao, tarefas, recursos, objetivo, pesos, max_prioridade) -> dict:
+    atribuidas = atribuicao >= 0
+    carga = np.bincount(atribuicao[atribuidas], weights=tarefas.esforco[atribuidas], minlength=len(recursos))
+    return {
+        "objetivo": valor_objetivo(atribuicao, tarefas, recursos, objetivo, pesos, max_prioridade),
+        "tarefas_atribuidas": int(atribuidas.sum()),
+        "esforco_atribuido": int(tarefas.esforco[atribuidas].sum()),
+        "score_prioridade": int((max_prioridade + 1 - tarefas.prioridade[atribuidas]).sum()),
+        "diferenca_carga": int(carga.max() - carga.min()) if len(carga) else 0,
+    }
+
+
+def resolver_monolitico(tarefas, recursos, objetivo, pesos, tempo_limite, configuracao=None, tempo_heuristica=0.0):
+    """Um único modelo com todas as tarefas, como nos scripts de exemplo."""
+    max_prioridade = modelagem.maior_prioridade(tarefas)
+    alocacao = modelagem.construir_modelo(tarefas, recursos, objetivo, pesos, max_prioridade=max_prioridade)
+    semente = None
+    if tempo_heuristica:
+        semente = resolver_heuristica(tarefas, recursos, objetivo, pesos, tempo_heuristica, max_prioridade)
+        aplicar_dicas(alocacao, semente.atribuicao)
+    solver = criar_solver(tempo_limite, configuracao)
+    status = solver.Solve(alocacao.modelo)
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return alocacao.atribuicao(solver), solver.StatusName(status)
+    if semente is not None:
+        return semente.atribuicao, "HEURISTICA"
+    return np.full(len(tarefas), -1, dtype=np.int64), solver.StatusName(status)
+
+
+def comparar_horizonte(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    objetivo=modelagem.OBJETIVO_PRIORIDADE_MAXIMA,
+    pesos=None,
+    tempo_limite=30.0,
+    tamanho_faixa=TAMANHO_FAIXA_PADRAO,
+    configuracao: Optional[ConfiguracaoSolver] = None,
+    tempo_heuristica=0.0,
+) -> dict:
+    """
+    Resolve a mesma instância com o modelo monolítico e com o horizonte rolante,
+    com o mesmo tempo total, e avalia as duas atribuições com o objetivo completo.
+
+    Returns:
+        dict: Indicadores e tempo de cada modo e a razão entre os objetivos.
+    """
+    max_prioridade = modelagem.maior_prioridade(tarefas)
+    modos = {}
+
+    inicio = time.perf_counter()
+    atribuicao, status = resolver_monolitico(
+        tarefas, recursos, objetivo, pesos, tempo_limite, configuracao, tempo_heuristica
+    )
+    modos["monolitico"] = {
+        "status": status,
+        "tempo": round(time.perf_counter() - inicio, 3),
+        **_indicadores(atribuicao, tarefas, recursos, objetivo, pesos, max_prioridade),
+    }
+
+    inicio = time.perf_counter()
+    resultado = resolver_horizonte(
+        tarefas, recursos, objetivo, pesos, tempo_limite, tamanho_faixa, configuracao, tempo_heuristica
+    )
+    modos["horizonte"] = {
+        "status": cp_model.CpSolverStatus(resultado.status).name,
+        "tempo": round(time.perf_counter() - inicio, 3),
+        "faixas": len(resultado.faixas),
+        **_indicadores(resultado.atribuicao, tarefas, recursos, objetivo, pesos, max_prioridade),
+    }
+
+    base = modos["monolitico"]["objetivo"]
+    return {
+        "objetivo": objetivo,
+        "tarefas": len(tarefas),
+        "recursos": len(recursos),
+        "tamanho_faixa": tamanho_faixa,
+        "modos": modos,
+        "razao_objetivo": modos["horizonte"]["objetivo"] / base if base else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o horizonte rolante com o modelo monolítico.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[2000, 5000])
+    parser.add_argument("--recursos", type=int, default=None, help="recursos fixos (padrão: proporção da amostra)")
+    parser.add_argument("--objetivos", nargs="+", default=[modelagem.OBJETIVO_PRIORIDADE_MAXIMA],
+                        choices=(modelagem.OBJETIVO_ESFORCO_MAXIMO, modelagem.OBJETIVO_PRIORIDADE_MAXIMA))
+    parser.add_argument("--faixa", type=int, default=TAMANHO_FAIXA_PADRAO, help="tarefas por faixa")
+    parser.add_argument("--tempo-limite", type=float, default=30.0)
+    parser.add_argument("--tempo-heuristica", type=float, default=0.5)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", default=None, help="arquivo JSON (padrão: benchmark/resultados/)")
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    configuracao = de_argumentos(args)
+
+    comparacoes = []
+    for tamanho in args.tamanhos:
+        df_tarefas, df_recursos = gerar_instancia(tamanho, args.recursos, args.semente)
+        tarefas = TarefasColunares.de_dataframe(df_tarefas).ordenar_por_prioridade()
+        recursos = RecursosColunares.de_dataframe(df_recursos)
+        for objetivo in args.objetivos:
+            comparacao = comparar_horizonte(
+                tarefas, recursos, objetivo, None, args.tempo_limite, args.faixa, configuracao, args.tempo_heuristica
+            )
+            comparacoes.append(comparacao)
+            print(f"{objetivo} | {tamanho} tarefas, {len(recursos)} recursos, faixas de {args.faixa}:")
+            for modo, dados in comparacao["modos"].items():
+                print(
+                    f"  {modo:<11} {dados['status']:<10} objetivo {dados['objetivo']:>14} | "
+                    f"{dados['tarefas_atribuidas']:>6} tarefas | score {dados['score_prioridade']:>10} | "
+                    f"esforço {dados['esforco_atribuido']:>9} | {dados['tempo']:.2f}s"
+                )
+            if comparacao["razao_objetivo"] is not None:
+                print(f"  horizonte / monolítico: {comparacao['razao_objetivo']:.4f}")
+
+    resultados = {
+        "metadados": metadados(),
+        "parametros": {**vars(args)},
+        "comparacoes": comparacoes,
+    }
+    caminho = args.saida
+    if caminho is None:
+        data = resultados["metadados"]["data"].replace(":", "").replace("-", "")
+        caminho = os.path.join(DIRETORIO_RESULTADOS, f"horizonte_{data}_{resultados['metadados']['commit'] or 'sem_commit'}.json")
+    print(f"Comparação gravada em '{salvar_resultados(resultados, caminho)}'.")
+
+
+if __name__ == "__main__":
+    main()
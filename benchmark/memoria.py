@@ -0,0 +1,113 @@
+"""
+Pico de memória residente do modelo padrão e do modelo enxuto
+(`modelagem.aplicar_restricoes(..., enxuto=True)`).
+
+Cada medição roda em um processo novo, porque o pico (ru_maxrss) só cresce
+durante a vida do processo. A base é o pico do processo logo após importar
+os módulos, antes de carregar os dados.
+
+Medições de referência (1 CPU, OR-Tools 9.15, instância sintética com 30
+recursos, objetivo de prioridade, 1 s de solver; base de ~95 MB após os imports):
+
+    tarefas  pares      modo    pico após construção  pico total  construção  total
+    10000    278.404    padrão        265 MB            406 MB       4,2 s     6,1 s
+                        enxuto        172 MB            331 MB       0,3 s     2,1 s
+    50000    1.392.792  padrão        911 MB           1460 MB      21,9 s    26,1 s
+                        enxuto        448 MB           1073 MB       1,4 s     5,0 s
+
+O restante do pico é da cópia do modelo feita pelo próprio CP-SAT na solução.
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+
+import modelagem
+from benchmark.executor import DIRETORIO_RESULTADOS, OBJETIVOS, medir_execucao, metadados, salvar_resultados
+from benchmark.gerador import gerar_instancia, salvar_instancia
+from configuracao_solver import ConfiguracaoSolver, adicionar_argumentos, de_argumentos
+from instrumentacao import memoria_pico_mb
+
+MODOS = {"padrao": False, "enxuto": True}
+
+
+def _medir_no_processo(caminhos, objetivo, enxuto, tempo_limite, configuracao) -> dict:
+    base = memoria_pico_mb()
+    execucao = medir_execucao(*caminhos, objetivo, tempo_limite, configuracao=configuracao, enxuto=enxuto)
+    pico = memoria_pico_mb()
+    execucao.update(memoria_base_mb=round(base, 1), memoria_pico_mb=round(pico, 1), acrescimo_mb=round(pico - base, 1))
+    return execucao
+
+
+def medir_memoria(
+    caminho_tarefas,
+    caminho_recursos,
+    objetivo=modelagem.OBJETIVO_PRIORIDADE_MAXIMA,
+    tempo_limite=1.0,
+    configuracao: ConfiguracaoSolver = None,
+) -> dict:
+    """
+    Mede o pico de memória de uma execução completa em cada modo, cada uma em um processo próprio.
+
+    Args:
+        caminho_tarefas (str): CSV de tarefas.
+        caminho_recursos (str): CSV de recursos.
+        objetivo (str, optional): Objetivo do modelo. Defaults to OBJETIVO_PRIORIDADE_MAXIMA.
+        tempo_limite (float, optional): Tempo do solver, em segundos. Defaults to 1.0.
+        configuracao (ConfiguracaoSolver, optional): Parâmetros do solver. Defaults to None.
+
+    Returns:
+        dict: A execução de `benchmark.executor.medir_execucao` de cada modo, com os picos de memória.
+    """
+    if memoria_pico_mb() is None:
+        raise RuntimeError("Medição de memória disponível apenas em sistemas Unix")
+    contexto = multiprocessing.get_context("spawn")
+    resultados = {}
+    for modo, enxuto in MODOS.items():
+        with contexto.Pool(1) as processo:
+            resultados[modo] = processo.apply(
+                _medir_no_processo, ((caminho_tarefas, caminho_recursos), objetivo, enxuto, tempo_limite, configuracao)
+            )
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o pico de memória dos modelos padrão e enxuto.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--recursos", type=int, default=30, help="recursos fixos")
+    parser.add_argument("--objetivos", nargs="+", choices=OBJETIVOS, default=[modelagem.OBJETIVO_PRIORIDADE_MAXIMA])
+    parser.add_argument("--tempo-limite", type=float, default=1.0)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", default=None, help="arquivo JSON (padrão: benchmark/resultados/)")
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    configuracao = de_argumentos(args)
+
+    medicoes = []
+    with tempfile.TemporaryDirectory() as temporario:
+        for tamanho in args.tamanhos:
+            destino = os.path.join(temporario, f"instancia_{tamanho}")
+            caminhos = salvar_instancia(*gerar_instancia(tamanho, args.recursos, args.semente), destino)
+            for objetivo in args.objetivos:
+                modos = medir_memoria(*caminhos, objetivo, args.tempo_limite, configuracao)
+                medicoes.append({"objetivo": objetivo, "tarefas": tamanho, "modos": modos})
+                print(f"{objetivo} | {tamanho} tarefas, {modos['padrao']['pares_elegiveis']} pares:")
+                for modo, dados in modos.items():
+                    print(
+                        f"  {modo:<7} pico {dados['memoria_pico_mb']:>8.1f} MB (+{dados['acrescimo_mb']:.1f} MB) | "
+                        f"após a construção {dados['fases']['construcao']['memoria_pico_mb']:>8.1f} MB | "
+                        f"construção {dados['fases']['construcao']['tempo']:.2f}s | total {dados['tempo_total']:.2f}s | "
+                        f"{dados['status']}"
+                    )
+
+    resultados = {"metadados": metadados(), "parametros": {**vars(args)}, "medicoes": medicoes}
+    caminho = args.saida
+    if caminho is None:
+        data = resultados["metadados"]["data"].replace(":", "").replace("-", "")
+        caminho = os.path.join(DIRETORIO_RESULTADOS, f"memoria_{data}_{resultados['metadados']['commit'] or 'sem_commit'}.json")
+    print(f"Medições gravadas em '{salvar_resultados(resultados, caminho)}'.")
+
+
+if __name__ == "__main__":
+    main()
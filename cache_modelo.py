@@ -0,0 +1,376 @@
+import argparse
+import dataclasses
+import datetime
+import hashlib
+import itertools
+import json
+import os
+import pickle
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import ortools
+import ortools.sat.cp_model_pb2 as cp_model_pb2
+from dotenv import load_dotenv
+from ortools.sat.python import cp_model
+
+from modelagem import ModeloAlocacao, VariaveisIndexadas, adicionar_booleanas
+
+# Mudanças na construção do modelo ou no formato do arquivo devem incrementar
+# a versão, para que modelos antigos deixem de ser encontrados
+VERSAO_CACHE = 2
+EXTENSAO = ".modelo"
+DIRETORIO_PADRAO = "./data/cache_modelos"
+LIMITE_PADRAO_MB = 2048.0
+TAMANHO_LEITURA = 1 << 20
+# Restrições que são só uma lista de literais (as "no máximo um recurso" por
+# tarefa, a maior parte do modelo); ficam em colunas, com as lineares e o
+# objetivo, fora do proto
+RESTRICOES_DE_LITERAIS = ("at_most_one", "exactly_one", "bool_or", "bool_and")
+
+
+def chave_modelo(caminhos: Sequence, **opcoes) -> str:
+    """
+    Chave do modelo: hash do conteúdo dos arquivos de entrada, das opções de
+    construção, da versão do cache e da versão do OR-Tools.
+
+    Args:
+        caminhos (Sequence[str]): Os CSVs de entrada (tarefas, recursos).
+        **opcoes: Opções que mudam o modelo (objetivo, pesos, agregado, simetria...).
+
+    Returns:
+        str: O hash SHA-256 em hexadecimal.
+    """
+    resumo = hashlib.sha256()
+    resumo.update(json.dumps([VERSAO_CACHE, ortools.__version__, opcoes], sort_keys=True, default=str).encode())
+    for caminho in caminhos:
+        with open(caminho, "rb") as arquivo:
+            for bloco in iter(lambda: arquivo.read(TAMANHO_LEITURA), b""):
+                resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def _dominios_em_sequencia(proto: cp_model_pb2.CpModelProto) -> List[tuple]:
+    """Domínios das variáveis como (domínio, quantidade) de variáveis consecutivas."""
+    dominios = (tuple(variavel.domain) for variavel in proto.variables)
+    return [(dominio, sum(1 for _ in grupo)) for dominio, grupo in itertools.groupby(dominios)]
+
+
+def _copiar_mensagem(origem, destino):
+    # Copia campo a campo de uma mensagem protobuf para o proto do CpModel
+    for campo, valor in origem.ListFields():
+        if campo.message_type is None:
+            if campo.is_repeated:
+                getattr(destino, campo.name).extend(list(valor))
+            else:
+                setattr(destino, campo.name, valor)
+        elif campo.is_repeated:
+            lista = getattr(destino, campo.name)
+            for item in valor:
+                _copiar_mensagem(item, lista.add())
+        else:
+            _copiar_mensagem(valor, getattr(destino, campo.name))
+
+
+def _separar_colunas(proto: cp_model_pb2.CpModelProto) -> dict:
+    """
+    Tira do proto as restrições lineares e as de RESTRICOES_DE_LITERAIS (sem
+    condição nem nome), além dos termos do objetivo, e os devolve em colunas:
+    o tipo de cada restrição, na ordem do modelo (None para as que ficam no
+    proto); os literais ou variáveis de todas elas concatenados, com os limites
+    de cada uma; só das lineares, os coeficientes concatenados e o domínio; e
+    as variáveis e coeficientes do objetivo.
+    """
+    tipos: List[Optional[str]] = []
+    limites = [0]
+    termos: List[int] = []
+    coeficientes: List[int] = []
+    dominios: List[tuple] = []
+    outras = cp_model_pb2.CpModelProto()
+    for restricao in proto.constraints:
+        tipo = restricao.WhichOneof("constraint")
+        if restricao.enforcement_literal or restricao.name:
+            tipo = None
+        if tipo == "linear":
+            termos.extend(restricao.linear.vars)
+            coeficientes.extend(restricao.linear.coeffs)
+            dominios.append(tuple(restricao.linear.domain))
+        elif tipo in RESTRICOES_DE_LITERAIS:
+            termos.extend(getattr(restricao, tipo).literals)
+        else:
+            tipo = None
+            outras.constraints.append(restricao)
+        tipos.append(tipo)
+        limites.append(len(termos))
+    proto.ClearField("constraints")
+    proto.constraints.extend(outras.constraints)
+
+    objetivo_termos = np.asarray(proto.objective.vars, dtype=np.int32)
+    objetivo_coeficientes = np.asarray(proto.objective.coeffs, dtype=np.int64)
+    if proto.HasField("objective"):
+        proto.objective.ClearField("vars")
+        proto.objective.ClearField("coeffs")
+    return {
+        "tipos": tipos,
+        "limites": np.asarray(limites, dtype=np.int64),
+        "termos": np.asarray(termos, dtype=np.int32),
+        "coeficientes": np.asarray(coeficientes, dtype=np.int64),
+        "dominios": dominios,
+        "objetivo_termos": objetivo_termos,
+        "objetivo_coeficientes": objetivo_coeficientes,
+    }
+
+
+def _restaurar_colunas(colunas: dict, proto: cp_model_pb2.CpModelProto, destino):
+    # Uma chamada por campo, a partir de listas Python: ler os campos repetidos
+    # do proto elemento a elemento custaria quase tanto quanto a construção
+    termos = colunas["termos"].tolist()
+    coeficientes = colunas["coeficientes"].tolist()
+    inicio_coeficientes = 0
+    limites = colunas["limites"].tolist()
+    dominios = iter(colunas["dominios"])
+    outras = iter(proto.constraints)
+    restricoes = destino.constraints
+    for tipo, inicio, fim in zip(colunas["tipos"], limites, limites[1:]):
+        if tipo is None:
+            _copiar_mensagem(next(outras), restricoes.add())
+        elif tipo == "linear":
+            linear = restricoes.add().linear
+            linear.vars.extend(termos[inicio:fim])
+            linear.coeffs.extend(coeficientes[inicio_coeficientes : inicio_coeficientes + fim - inicio])
+            inicio_coeficientes += fim - inicio
+            linear.domain.extend(next(dominios))
+        else:
+            getattr(restricoes.add(), tipo).literals.extend(termos[inicio:fim])
+    proto.ClearField("constraints")
+
+    _copiar_mensagem(proto, destino)
+    if len(colunas["objetivo_termos"]):
+        destino.objective.vars.extend(colunas["objetivo_termos"].tolist())
+        destino.objective.coeffs.extend(colunas["objetivo_coeficientes"].tolist())
+
+
+def _indice_da_variavel(variavel) -> Optional[int]:
+    return variavel.Index() if isinstance(variavel, cp_model.IntVar) else None
+
+
+def serializar_alocacao(alocacao: ModeloAlocacao, temporario: str) -> dict:
+    """
+    Representação do modelo construído que pode ser gravada com pickle.
+
+    O proto é gravado em binário, sem as variáveis, que ficam como sequências
+    de domínio (recriadas em bloco na leitura), e sem as restrições lineares
+    e de literais nem os termos do objetivo, que ficam em colunas (ver
+    `_separar_colunas`); os nomes das variáveis não são
+    mantidos, pois o índice de elegibilidade já liga cada variável ao seu par
+    (nota, matricula). Os demais campos do ModeloAlocacao vão como estão.
+
+    Args:
+        alocacao (ModeloAlocacao): O modelo, antes de receber dicas.
+        temporario (str): Arquivo temporário usado na exportação do proto.
+    """
+    try:
+        alocacao.modelo.ExportToFile(temporario)
+        proto = cp_model_pb2.CpModelProto()
+        with open(temporario, "rb") as arquivo:
+            proto.ParseFromString(arquivo.read())
+    finally:
+        if os.path.exists(temporario):
+            os.unlink(temporario)
+    dominios = _dominios_em_sequencia(proto)
+    proto.ClearField("variables")
+    proto.ClearField("solution_hint")
+    colunas = _separar_colunas(proto)
+
+    variaveis = alocacao.variaveis
+    if isinstance(variaveis, VariaveisIndexadas):
+        indices_variaveis = (variaveis.inicio, len(variaveis))
+    else:
+        indices = [v.Index() for v in variaveis]
+        consecutivas = not indices or indices == list(range(indices[0], indices[0] + len(indices)))
+        # Variáveis consecutivas (o caso usual) voltam como VariaveisIndexadas
+        indices_variaveis = (indices[0] if indices else 0, len(indices)) if consecutivas else indices
+
+    campos = {
+        campo.name: getattr(alocacao, campo.name)
+        for campo in dataclasses.fields(alocacao)
+        if campo.name not in ("modelo", "variaveis", "componentes", "cargas")
+    }
+    return {
+        "versao": VERSAO_CACHE,
+        "classe": type(alocacao),
+        "proto": proto.SerializeToString(),
+        "dominios": dominios,
+        "colunas": colunas,
+        "variaveis": indices_variaveis,
+        "componentes": {nome: _indice_da_variavel(v) for nome, v in alocacao.componentes.items()},
+        "cargas": [v.Index() for v in alocacao.cargas],
+        "campos": campos,
+    }
+
+
+def restaurar_alocacao(dados: dict) -> ModeloAlocacao:
+    """Reconstrói o ModeloAlocacao gravado por `serializar_alocacao`."""
+    modelo = cp_model.CpModel()
+    destino = modelo.Proto()
+    for dominio, quantidade in dados["dominios"]:
+        if dominio == (0, 1) and quantidade > 1:
+            adicionar_booleanas(modelo, quantidade)
+        else:
+            for _ in range(quantidade):
+                destino.variables.add().domain.extend(dominio)
+    proto = cp_model_pb2.CpModelProto()
+    proto.ParseFromString(dados["proto"])
+    _restaurar_colunas(dados["colunas"], proto, destino)
+
+    if isinstance(dados["variaveis"], tuple):
+        variaveis = VariaveisIndexadas(modelo, *dados["variaveis"])
+    else:
+        variaveis = [modelo.GetIntVarFromProtoIndex(i) for i in dados["variaveis"]]
+    componentes = {
+        nome: modelo.GetIntVarFromProtoIndex(indice)
+        for nome, indice in dados["componentes"].items()
+        if indice is not None
+    }
+    cargas = [modelo.GetIntVarFromProtoIndex(i) for i in dados["cargas"]]
+    return dados["classe"](
+        modelo=modelo, variaveis=variaveis, componentes=componentes, cargas=cargas, **dados["campos"]
+    )
+
+
+@dataclasses.dataclass
+class CacheModelos:
+    """
+    Modelos já construídos, gravados em `diretorio` com a chave de `chave_modelo`.
+
+    O espaço ocupado é limitado a `limite_mb`: ao gravar, os modelos usados há
+    mais tempo são removidos primeiro (cada leitura atualiza a data do arquivo).
+    """
+
+    diretorio: str = DIRETORIO_PADRAO
+    limite_mb: float = LIMITE_PADRAO_MB
+
+    def caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave + EXTENSAO)
+
+    def carregar(self, chave: str) -> Optional[ModeloAlocacao]:
+        """O modelo da chave, ou None se não estiver no cache (ou for de outra versão)."""
+        caminho = self.caminho(chave)
+        try:
+            with open(caminho, "rb") as arquivo:
+                dados = pickle.load(arquivo)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            os.unlink(caminho)
+            return None
+        if dados.get("versao") != VERSAO_CACHE:
+            os.unlink(caminho)
+            return None
+        os.utime(caminho)
+        return restaurar_alocacao(dados)
+
+    def salvar(self, chave: str, alocacao: ModeloAlocacao) -> str:
+        """
+        Grava o modelo (de forma atômica) e remove os mais antigos além do limite.
+
+        Returns:
+            str: O caminho do arquivo gravado.
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self.caminho(chave)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        dados = serializar_alocacao(alocacao, temporario)
+        try:
+            with open(temporario, "wb") as arquivo:
+                pickle.dump(dados, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.unlink(temporario)
+            raise
+        self.despejar(manter=chave)
+        return caminho
+
+    def listar(self) -> List[Dict]:
+        """Modelos gravados, do usado mais recentemente ao mais antigo."""
+        if not os.path.isdir(self.diretorio):
+            return []
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            if nome.endswith(EXTENSAO):
+                estado = os.stat(os.path.join(self.diretorio, nome))
+                entradas.append(
+                    {"chave": nome[: -len(EXTENSAO)], "tamanho_mb": estado.st_size / 1024**2, "uso": estado.st_mtime}
+                )
+        return sorted(entradas, key=lambda entrada: entrada["uso"], reverse=True)
+
+    def despejar(self, manter: Optional[str] = None) -> int:
+        """
+        Remove os modelos usados há mais tempo até o total caber no limite.
+
+        Args:
+            manter (str, optional): Chave que não deve ser removida (a recém-gravada).
+
+        Returns:
+            int: Número de modelos removidos.
+        """
+        entradas = self.listar()
+        total = sum(entrada["tamanho_mb"] for entrada in entradas)
+        removidos = 0
+        for entrada in reversed(entradas):
+            if total <= self.limite_mb:
+                break
+            if entrada["chave"] == manter:
+                continue
+            os.unlink(self.caminho(entrada["chave"]))
+            total -= entrada["tamanho_mb"]
+            removidos += 1
+        return removidos
+
+    def invalidar(self, chave: Optional[str] = None) -> int:
+        """
+        Remove o modelo da chave (aceita um prefixo), ou todos se `chave` for None.
+
+        Returns:
+            int: Número de modelos removidos.
+        """
+        removidos = 0
+        for entrada in self.listar():
+            if chave is None or entrada["chave"].startswith(chave):
+                os.unlink(self.caminho(entrada["chave"]))
+                removidos += 1
+        return removidos
+
+
+def cache_de_ambiente() -> Optional[CacheModelos]:
+    """Cache configurado por CACHE_MODELO (diretório; vazio desativa) e CACHE_MODELO_LIMITE_MB."""
+    diretorio = os.getenv("CACHE_MODELO", "")
+    if not diretorio:
+        return None
+    return CacheModelos(diretorio, float(os.getenv("CACHE_MODELO_LIMITE_MB") or LIMITE_PADRAO_MB))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lista ou invalida os modelos em cache.")
+    parser.add_argument("--diretorio", default=os.getenv("CACHE_MODELO") or DIRETORIO_PADRAO)
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument("--invalidar", metavar="CHAVE", help="remove o modelo da chave (ou prefixo)")
+    grupo.add_argument("--limpar", action="store_true", help="remove todos os modelos")
+    args = parser.parse_args()
+
+    cache = CacheModelos(args.diretorio)
+    if args.invalidar or args.limpar:
+        removidos = cache.invalidar(None if args.limpar else args.invalidar)
+        print(f"{removidos} modelos removidos de '{args.diretorio}'.")
+        return
+    entradas = cache.listar()
+    for entrada in entradas:
+        uso = datetime.datetime.fromtimestamp(entrada["uso"]).isoformat(timespec="seconds")
+        print(f"{entrada['chave'][:16]}  {entrada['tamanho_mb']:>9.1f} MB  usado em {uso}")
+    print(f"{len(entradas)} modelos, {sum(e['tamanho_mb'] for e in entradas):.1f} MB em '{args.diretorio}'.")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    main()
@@ -0,0 +1,288 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from _types import Recurso, Tarefa
+
+# Máscaras de habilidades são guardadas em int64; o bit de sinal fica livre.
+MAXIMO_HABILIDADES = 63
+# Marca, com o bit de sinal, a habilidade fora de um vocabulário fechado:
+# nenhum recurso a tem, então a tarefa fica sem recurso elegível
+BIT_DESCONHECIDA = -(1 << MAXIMO_HABILIDADES)
+
+
+class Vocabulario:
+    """
+    Associa cada habilidade a uma posição de bit, de forma que um conjunto de
+    habilidades possa ser representado por um único inteiro (máscara).
+
+    Tarefas e recursos precisam compartilhar o mesmo vocabulário para que as
+    máscaras sejam comparáveis. Um vocabulário fechado (ver `fechar`) não
+    registra habilidades novas.
+    """
+
+    def __init__(self):
+        self.posicoes: Dict[str, int] = {}
+        self.fechado = False
+
+    def __len__(self):
+        return len(self.posicoes)
+
+    def bit(self, habilidade: str) -> int:
+        """Retorna a posição de bit da habilidade, registrando-a se for nova."""
+        posicao = self.posicoes.get(habilidade)
+        if posicao is None:
+            posicao = len(self.posicoes)
+            if posicao >= MAXIMO_HABILIDADES:
+                raise ValueError(
+                    f"Número máximo de habilidades distintas excedido ({MAXIMO_HABILIDADES})."
+                )
+            self.posicoes[habilidade] = posicao
+        return posicao
+
+    def fechar(self) -> "Vocabulario":
+        """
+        Impede o registro de habilidades novas: nas máscaras lidas depois, uma
+        habilidade desconhecida vira BIT_DESCONHECIDA, que nenhum recurso cobre.
+        """
+        self.fechado = True
+        return self
+
+    def mascara(self, habilidades: Iterable[str]) -> int:
+        """Converte uma lista de habilidades em máscara de bits."""
+        mascara = 0
+        for habilidade in habilidades:
+            if self.fechado and habilidade not in self.posicoes:
+                mascara |= BIT_DESCONHECIDA
+            else:
+                mascara |= 1 << self.bit(habilidade)
+        return mascara
+
+    def mascaras(self, textos) -> np.ndarray:
+        """
+        Converte uma coluna de habilidades no formato "VAR,EXP,COM" em máscaras.
+
+        Apenas as combinações distintas são decodificadas; as demais linhas
+        reaproveitam o resultado via `pd.factorize`.
+
+        Args:
+            textos: Série ou array com o texto de habilidades de cada linha.
+
+        Returns:
+            np.ndarray: Máscara (int64) de cada linha.
+        """
+        codigos, distintos = pd.factorize(pd.Series(textos, dtype=object), use_na_sentinel=False)
+        mascaras_distintas = np.fromiter(
+            (self.mascara(separar_habilidades(texto)) for texto in distintos),
+            dtype=np.int64,
+            count=len(distintos),
+        )
+        return mascaras_distintas[codigos]
+
+
+# Vocabulário compartilhado pelo processo, usado quando nenhum outro é informado.
+VOCABULARIO_PADRAO = Vocabulario()
+
+
+def _vocabulario(vocabulario: Optional[Vocabulario]) -> Vocabulario:
+    return VOCABULARIO_PADRAO if vocabulario is None else vocabulario
+
+
+def separar_habilidades(texto) -> List[str]:
+    """Separa o texto "VAR,EXP,COM" em lista, tolerando células vazias."""
+    if not isinstance(texto, str):
+        return []
+    return [habilidade.strip() for habilidade in texto.split(",") if habilidade.strip()]
+
+
+@dataclass
+class TarefasColunares:
+    """
+    Tarefas em formato colunar: um array NumPy por atributo.
+
+    A posição `i` de cada array descreve a mesma tarefa. Objetos `Tarefa` são
+    construídos sob demanda via `tarefa(i)`, iteração ou `como_lista()`.
+    """
+
+    nota: np.ndarray
+    grupo: np.ndarray
+    codigo: np.ndarray
+    esforco: np.ndarray
+    prioridade: np.ndarray
+    habilidades: np.ndarray
+    mascara: np.ndarray
+    vocabulario: Vocabulario = field(default=VOCABULARIO_PADRAO, repr=False)
+
+    def __len__(self):
+        return len(self.nota)
+
+    def __iter__(self) -> Iterator[Tarefa]:
+        return (self.tarefa(i) for i in range(len(self)))
+
+    def tarefa(self, i) -> Tarefa:
+        return Tarefa(
+            int(self.nota[i]),
+            self.grupo[i],
+            self.codigo[i],
+            int(self.esforco[i]),
+            int(self.prioridade[i]),
+            separar_habilidades(self.habilidades[i]),
+        )
+
+    def como_lista(self) -> List[Tarefa]:
+        return list(self)
+
+    def selecionar(self, indices) -> "TarefasColunares":
+        """Retorna um novo conjunto com as tarefas nas posições (ou máscara booleana) informadas."""
+        return TarefasColunares(
+            self.nota[indices],
+            self.grupo[indices],
+            self.codigo[indices],
+            self.esforco[indices],
+            self.prioridade[indices],
+            self.habilidades[indices],
+            self.mascara[indices],
+            self.vocabulario,
+        )
+
+    def concatenar(self, outras: "TarefasColunares") -> "TarefasColunares":
+        """Retorna um novo conjunto com estas tarefas seguidas de `outras`."""
+        if outras.vocabulario is not self.vocabulario:
+            raise ValueError("As tarefas devem compartilhar o mesmo vocabulário de habilidades.")
+        return TarefasColunares(
+            np.concatenate((self.nota, outras.nota)),
+            np.concatenate((self.grupo, outras.grupo)),
+            np.concatenate((self.codigo, outras.codigo)),
+            np.concatenate((self.esforco, outras.esforco)),
+            np.concatenate((self.prioridade, outras.prioridade)),
+            np.concatenate((self.habilidades, outras.habilidades)),
+            np.concatenate((self.mascara, outras.mascara)),
+            self.vocabulario,
+        )
+
+    def ordenar_por_prioridade(self) -> "TarefasColunares":
+        # Ordenação estável: empates mantêm a ordem do arquivo.
+        return self.selecionar(np.argsort(self.prioridade, kind="stable"))
+
+    @classmethod
+    def de_dataframe(cls, df: pd.DataFrame, vocabulario: Optional[Vocabulario] = None):
+        vocabulario = _vocabulario(vocabulario)
+        habilidades = df["habilidades"].to_numpy(dtype=object)
+        return cls(
+            df["nota"].to_numpy(dtype=np.int64),
+            df["grupo"].to_numpy(dtype=object),
+            df["codigo"].to_numpy(dtype=object),
+            df["esforco"].to_numpy(dtype=np.int64),
+            df["prioridade"].to_numpy(dtype=np.int64),
+            habilidades,
+            vocabulario.mascaras(habilidades),
+            vocabulario,
+        )
+
+
+@dataclass
+class RecursosColunares:
+    """
+    Recursos em formato colunar, análogo a `TarefasColunares`.
+    """
+
+    matricula: np.ndarray
+    nome: np.ndarray
+    nucleo: np.ndarray
+    disponibilidade: np.ndarray
+    habilidades: np.ndarray
+    mascara: np.ndarray
+    vocabulario: Vocabulario = field(default=VOCABULARIO_PADRAO, repr=False)
+
+    def __len__(self):
+        return len(self.matricula)
+
+    def __iter__(self) -> Iterator[Recurso]:
+        return (self.recurso(i) for i in range(len(self)))
+
+    def recurso(self, i) -> Recurso:
+        return Recurso(
+            self.matricula[i],
+            self.nome[i],
+            self.nucleo[i],
+            int(self.disponibilidade[i]),
+            separar_habilidades(self.habilidades[i]),
+        )
+
+    def como_lista(self) -> List[Recurso]:
+        return list(self)
+
+    def selecionar(self, indices) -> "RecursosColunares":
+        """Retorna um novo conjunto com os recursos nas posições (ou máscara booleana) informadas."""
+        return RecursosColunares(
+            self.matricula[indices],
+            self.nome[indices],
+            self.nucleo[indices],
+            self.disponibilidade[indices],
+            self.habilidades[indices],
+            self.mascara[indices],
+            self.vocabulario,
+        )
+
+    @classmethod
+    def de_dataframe(cls, df: pd.DataFrame, vocabulario: Optional[Vocabulario] = None):
+        vocabulario = _vocabulario(vocabulario)
+        habilidades = df["habilidades"].to_numpy(dtype=object)
+        return cls(
+            df["matricula"].to_numpy(dtype=object),
+            df["nome"].to_numpy(dtype=object),
+            df["nucleo"].to_numpy(dtype=object),
+            df["disponibilidade"].to_numpy(dtype=np.int64),
+            habilidades,
+            vocabulario.mascaras(habilidades),
+            vocabulario,
+        )
+
+
+def ler_csv(caminho) -> pd.DataFrame:
+    """Lê um arquivo CSV de entrada no formato usado pelo projeto (UTF-8, separador ';')."""
+    return pd.read_csv(caminho, encoding="utf-8", sep=";")
+
+
+def carregar_tarefas(caminho, vocabulario: Optional[Vocabulario] = None) -> TarefasColunares:
+    """
+    Lê o CSV de tarefas diretamente para o formato colunar.
+
+    Args:
+        caminho (str): O caminho para o arquivo CSV de tarefas.
+        vocabulario (Vocabulario, optional): Vocabulário de habilidades. Defaults to VOCABULARIO_PADRAO.
+
+    Returns:
+        TarefasColunares: As tarefas do arquivo.
+    """
+    return TarefasColunares.de_dataframe(ler_csv(caminho), vocabulario)
+
+
+def carregar_recursos(caminho, vocabulario: Optional[Vocabulario] = None) -> RecursosColunares:
+    """
+    Lê o CSV de recursos diretamente para o formato colunar.
+
+    Args:
+        caminho (str): O caminho para o arquivo CSV de recursos.
+        vocabulario (Vocabulario, optional): Vocabulário de habilidades. Defaults to VOCABULARIO_PADRAO.
+
+    Returns:
+        RecursosColunares: Os recursos do arquivo.
+    """
+    return RecursosColunares.de_dataframe(ler_csv(caminho), vocabulario)
+
+
+def carregar_dados(caminho_tarefas, caminho_recursos, vocabulario: Optional[Vocabulario] = None):
+    """
+    Lê tarefas e recursos compartilhando o mesmo vocabulário de habilidades.
+
+    Returns:
+        tuple: Uma tupla (TarefasColunares, RecursosColunares).
+    """
+    vocabulario = _vocabulario(vocabulario)
+    return (
+        carregar_tarefas(caminho_tarefas, vocabulario),
+        carregar_recursos(caminho_recursos, vocabulario),
+    )
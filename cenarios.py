@@ -0,0 +1,225 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from ortools.sat.python import cp_model
+
+from carregamento import RecursosColunares, TarefasColunares, carregar_dados
+from configuracao_solver import ConfiguracaoSolver, configuracao_de_ambiente, criar_solver, dividir_trabalhadores
+from elegibilidade import IndiceElegibilidade
+from heuristica import resolver_heuristica
+from modelagem import OBJETIVO_PRIORIDADE_MAXIMA, construir_modelo, gap_relativo, maior_prioridade
+from partida_quente import aplicar_dicas
+
+CAMINHO_CENARIOS = "./data/cenarios_pesos.csv"
+
+
+@dataclass(frozen=True)
+class Cenario:
+    peso_prioridade: int
+    peso_esforco: int
+    tempo_limite: float
+
+
+def grade_cenarios(pesos_prioridade: Iterable[int], tempos_limite: Iterable[float]) -> List[Cenario]:
+    """
+    Combinações de pesos e tempos limite. O peso do esforço é o complemento do
+    da prioridade (soma 100): pesos proporcionais, como 40/20 e 80/40, têm o
+    mesmo ótimo, então cada proporção entra uma única vez.
+
+    Args:
+        pesos_prioridade (Iterable[int]): Pesos da prioridade, de 0 a 100; repetidos são ignorados.
+        tempos_limite (Iterable[float]): Tempos limite do solver.
+
+    Returns:
+        List[Cenario]: Os cenários, na ordem dos pesos e dos tempos informados.
+    """
+    pesos = list(dict.fromkeys(int(p) for p in pesos_prioridade))
+    fora = [p for p in pesos if not 0 <= p <= 100]
+    if fora:
+        raise ValueError(f"Pesos de prioridade fora de 0 a 100: {fora}")
+    return [
+        Cenario(p, 100 - p, float(t))
+        for p, t in itertools.product(pesos, dict.fromkeys(float(t) for t in tempos_limite))
+    ]
+
+
+# Dados compartilhados por cada processo do pool, enviados uma única vez
+_DADOS = {}
+
+
+def _inicializar_processo(tarefas, recursos, indice, max_prioridade, tempo_heuristica, configuracao, opcoes):
+    _DADOS.update(
+        tarefas=tarefas,
+        recursos=recursos,
+        indice=indice,
+        max_prioridade=max_prioridade,
+        tempo_heuristica=tempo_heuristica,
+        configuracao=configuracao,
+        opcoes=opcoes,
+    )
+
+
+def _resolver_cenario(cenario: Cenario) -> dict:
+    return resolver_cenario(cenario, **_DADOS)
+
+
+def resolver_cenario(
+    cenario: Cenario, tarefas, recursos, indice, max_prioridade, tempo_heuristica, configuracao, opcoes
+) -> dict:
+    """
+    Monta e resolve o modelo de um cenário.
+
+    Returns:
+        dict: A linha do cenário na tabela de `executar_cenarios`.
+    """
+    pesos = {"prioridade": cenario.peso_prioridade, "esforco": cenario.peso_esforco}
+    alocacao = construir_modelo(
+        tarefas,
+        recursos,
+        OBJETIVO_PRIORIDADE_MAXIMA,
+        pesos,
+        indice=indice,
+        max_prioridade=max_prioridade,
+        **opcoes,
+    )
+    semente = None
+    if tempo_heuristica:
+        semente = resolver_heuristica(
+            tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, pesos, tempo_heuristica, max_prioridade
+        )
+        aplicar_dicas(alocacao, semente.atribuicao)
+    solver = criar_solver(cenario.tempo_limite, configuracao)
+    status = solver.Solve(alocacao.modelo)
+
+    linha = asdict(cenario)
+    linha.update(status=solver.StatusName(status), tempo=solver.WallTime())
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        atribuicao = alocacao.atribuicao(solver)
+        linha.update(
+            objetivo=solver.ObjectiveValue(), limite=solver.BestObjectiveBound(), gap=gap_relativo(solver)
+        )
+    elif semente is not None:
+        # Sem solução do solver no tempo do cenário, o ponto é o da heurística
+        atribuicao = semente.atribuicao
+        linha.update(status="HEURISTICA", objetivo=semente.objetivo)
+    else:
+        return linha
+
+    atribuidas = atribuicao >= 0
+    carga = np.bincount(atribuicao[atribuidas], weights=tarefas.esforco[atribuidas], minlength=len(recursos))
+    linha.update(
+        score_prioridade=int((max_prioridade + 1 - tarefas.prioridade[atribuidas]).sum()),
+        esforco_atribuido=int(tarefas.esforco[atribuidas].sum()),
+        tarefas_atribuidas=int(atribuidas.sum()),
+        diferenca_carga=int(carga.max() - carga.min()) if len(carga) else 0,
+    )
+    return linha
+
+
+def marcar_pareto(tabela: pd.DataFrame, colunas=("score_prioridade", "esforco_atribuido")) -> pd.Series:
+    """
+    Marca os cenários não dominados: nenhum outro cenário é pelo menos tão bom
+    em todas as `colunas` (maximizadas) e melhor em alguma.
+    """
+    valores = tabela[list(colunas)].to_numpy(dtype=float)
+    validos = ~np.isnan(valores).any(axis=1)
+    pareto = np.zeros(len(tabela), dtype=bool)
+    for i in np.flatnonzero(validos):
+        outros = valores[validos]
+        domina = (outros >= valores[i]).all(axis=1) & (outros > valores[i]).any(axis=1)
+        pareto[i] = not domina.any()
+    return pd.Series(pareto, index=tabela.index, name="pareto")
+
+
+def executar_cenarios(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    cenarios: List[Cenario],
+    processos: Optional[int] = None,
+    tempo_heuristica=0.5,
+    configuracao: Optional[ConfiguracaoSolver] = None,
+    **opcoes,
+) -> pd.DataFrame:
+    """
+    Resolve o objetivo de prioridade máxima para cada cenário de pesos e tempo.
+
+    Os dados e o índice de elegibilidade são preparados uma vez e enviados uma
+    única vez a cada processo do pool; cada cenário apenas monta o seu modelo
+    e o resolve.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        cenarios (List[Cenario]): Os cenários, ver `grade_cenarios`.
+        processos (int, optional): Tamanho do pool de processos. Defaults to os.cpu_count().
+        tempo_heuristica (float, optional): Tempo da heurística usada como dica em cada
+            cenário (0 desativa). Defaults to 0.5.
+        configuracao (ConfiguracaoSolver, optional): Parâmetros do solver de cada cenário; em
+            paralelo, os núcleos são divididos entre os processos (ver `dividir_trabalhadores`).
+        **opcoes: Repassadas a `modelagem.construir_modelo` (agregado, simetria).
+
+    Returns:
+        pd.DataFrame: Uma linha por cenário, com os componentes do objetivo e a coluna `pareto`.
+    """
+    # No modelo agregado o índice é o das classes, montado por `construir_modelo`
+    indice = None if opcoes.get("agregado") else IndiceElegibilidade.de_dados(tarefas, recursos)
+    processos = min(len(cenarios), processos or os.cpu_count() or 1)
+    if processos > 1:
+        configuracao = dividir_trabalhadores(configuracao, processos)
+    dados = (tarefas, recursos, indice, maior_prioridade(tarefas), tempo_heuristica, configuracao, opcoes)
+
+    if processos > 1:
+        with ProcessPoolExecutor(processos, initializer=_inicializar_processo, initargs=dados) as executor:
+            linhas = list(executor.map(_resolver_cenario, cenarios))
+    else:
+        _inicializar_processo(*dados)
+        linhas = [_resolver_cenario(c) for c in cenarios]
+
+    tabela = pd.DataFrame(linhas)
+    for coluna in ("score_prioridade", "esforco_atribuido"):
+        if coluna not in tabela:
+            tabela[coluna] = np.nan
+    tabela["pareto"] = marcar_pareto(tabela)
+    return tabela
+
+
+def _lista_env(nome, padrao, tipo):
+    return [tipo(v) for v in os.getenv(nome, padrao).split(",") if v.strip()]
+
+
+def main():
+    caminho_recursos = os.getenv("CAMINHO_RECURSOS")
+    caminho_tarefas = os.getenv("CAMINHO_TAREFAS")
+    cenarios = grade_cenarios(
+        _lista_env("CENARIOS_PESO_PRIORIDADE", "100,80,60,40,20", int),
+        _lista_env("CENARIOS_TEMPO_LIMITE", os.getenv("TEMPO_LIMITE", "30"), float),
+    )
+    processos = int(os.getenv("PROCESSOS", 0)) or None
+    agregado = os.getenv("MODELO_AGREGADO", "0") == "1"
+
+    inicio = time.perf_counter()
+    tarefas, recursos = carregar_dados(caminho_tarefas, caminho_recursos)
+    tarefas = tarefas.ordenar_por_prioridade()
+    print(f"Dados carregados em {time.perf_counter() - inicio:.3f}s; {len(cenarios)} cenários")
+
+    tempo_heuristica = float(os.getenv("TEMPO_HEURISTICA", 0.5))
+    tabela = executar_cenarios(
+        tarefas, recursos, cenarios, processos, tempo_heuristica, configuracao_de_ambiente(), agregado=agregado
+    )
+    print(tabela.to_string(index=False))
+    print(f"Tempo total: {time.perf_counter() - inicio:.2f}s")
+
+    tabela.to_csv(CAMINHO_CENARIOS, sep=";", index=False, encoding="utf-8")
+    print(f"Cenários exportados para '{CAMINHO_CENARIOS}'.")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    main()
@@ -0,0 +1,222 @@
+import argparse
+import json
+import os
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Optional
+
+from ortools.sat.python import cp_model
+
+# No modo determinístico o limite é de tempo determinístico (reprodutível); o
+# tempo de parede vira só uma trava de segurança, com esta folga
+FOLGA_DETERMINISTICA = 4.0
+
+ESTRATEGIAS = (
+    "AUTOMATIC_SEARCH",
+    "FIXED_SEARCH",
+    "PORTFOLIO_SEARCH",
+    "LP_SEARCH",
+    "PSEUDO_COST_SEARCH",
+    "PORTFOLIO_WITH_QUICK_RESTART_SEARCH",
+)
+
+
+@dataclass(frozen=True)
+class ConfiguracaoSolver:
+    """
+    Parâmetros do CP-SAT além do tempo limite.
+
+    Attributes:
+        trabalhadores: Número de workers (num_workers); 0 deixa o CP-SAT usar todos os núcleos.
+        semente: Semente aleatória (random_seed); None mantém a do CP-SAT.
+        estrategia: Estratégia de busca (search_branching), ver ESTRATEGIAS; vazio = automática.
+        gap_relativo: Para quando o gap relativo ficar abaixo deste valor (relative_gap_limit).
+        gap_absoluto: Para quando o gap absoluto ficar abaixo deste valor (absolute_gap_limit).
+        deterministico: Busca paralela intercalada e limite de tempo determinístico, para
+            que a mesma entrada produza o mesmo plano.
+        registrar_progresso: Imprime o log de busca do CP-SAT (log_search_progress).
+        parametros_extras: Outros parâmetros no formato texto do SatParameters.
+    """
+
+    trabalhadores: int = 0
+    semente: Optional[int] = None
+    estrategia: str = ""
+    gap_relativo: float = 0.0
+    gap_absoluto: float = 0.0
+    deterministico: bool = False
+    registrar_progresso: bool = False
+    parametros_extras: str = ""
+
+    def texto_parametros(self) -> str:
+        """Os parâmetros no formato texto do SatParameters (sem o tempo limite)."""
+        linhas = []
+        if self.trabalhadores:
+            linhas.append(f"num_workers: {self.trabalhadores}")
+        if self.semente is not None:
+            linhas.append(f"random_seed: {self.semente}")
+        if self.estrategia:
+            if self.estrategia not in ESTRATEGIAS:
+                raise ValueError(f"Estratégia de busca desconhecida: {self.estrategia}")
+            linhas.append(f"search_branching: {self.estrategia}")
+        if self.gap_relativo:
+            linhas.append(f"relative_gap_limit: {self.gap_relativo}")
+        if self.gap_absoluto:
+            linhas.append(f"absolute_gap_limit: {self.gap_absoluto}")
+        if self.deterministico:
+            linhas.append("interleave_search: true")
+        if self.registrar_progresso:
+            linhas.append("log_search_progress: true")
+        if self.parametros_extras:
+            linhas.append(self.parametros_extras)
+        return "\n".join(linhas)
+
+    def aplicar(self, solver: cp_model.CpSolver, tempo_limite: float):
+        """Aplica os parâmetros e o tempo limite ao solver."""
+        parametros = solver.parameters
+        parametros.merge_text_format(self.texto_parametros())
+        if self.deterministico:
+            parametros.max_deterministic_time = tempo_limite
+            parametros.max_time_in_seconds = tempo_limite * FOLGA_DETERMINISTICA
+        else:
+            parametros.max_time_in_seconds = tempo_limite
+
+
+# Perfis para os tamanhos de problema usuais. Os de tamanho assumem um
+# servidor dedicado; em máquinas compartilhadas, use "compartilhado".
+PERFIS = {
+    "padrao": ConfiguracaoSolver(),
+    # Mesmo plano para a mesma entrada, independente da carga da máquina
+    "deterministico": ConfiguracaoSolver(trabalhadores=8, semente=0, deterministico=True),
+    # Uso de CPU previsível: poucos workers
+    "compartilhado": ConfiguracaoSolver(trabalhadores=2),
+    # Até alguns milhares de tarefas (como a amostra de produção): busca pelo ótimo
+    "pequeno": ConfiguracaoSolver(trabalhadores=8),
+    # Dezenas de milhares de tarefas: o último 0,5% de gap raramente compensa o tempo
+    "medio": ConfiguracaoSolver(trabalhadores=8, gap_relativo=0.005),
+    # Centenas de milhares de pares elegíveis: a relaxação linear custa mais do que ajuda
+    "grande": ConfiguracaoSolver(trabalhadores=16, gap_relativo=0.01, parametros_extras="linearization_level: 0"),
+}
+
+
+def carregar_perfil(perfil: str) -> ConfiguracaoSolver:
+    """
+    Obtém um perfil pelo nome (ver PERFIS) ou de um arquivo JSON.
+
+    O arquivo tem os campos de ConfiguracaoSolver e, opcionalmente, "perfil"
+    com o nome do perfil de base, cujos valores ele sobrescreve.
+    """
+    if perfil in PERFIS:
+        return PERFIS[perfil]
+    if not os.path.exists(perfil):
+        raise ValueError(f"Perfil de solver desconhecido: {perfil} (perfis: {', '.join(PERFIS)})")
+    with open(perfil, encoding="utf-8") as arquivo:
+        valores = json.load(arquivo)
+    base = carregar_perfil(valores.pop("perfil", "padrao"))
+    campos = {f.name for f in fields(ConfiguracaoSolver)}
+    desconhecidos = set(valores) - campos
+    if desconhecidos:
+        raise ValueError(f"Campos desconhecidos no perfil {perfil}: {sorted(desconhecidos)}")
+    return replace(base, **valores)
+
+
+def dividir_trabalhadores(configuracao: Optional[ConfiguracaoSolver], processos: int) -> ConfiguracaoSolver:
+    """
+    Configuração de cada um de `processos` solvers rodando ao mesmo tempo: os
+    núcleos da máquina são divididos entre eles, em vez de cada CP-SAT usar
+    todos (trabalhadores = 0) e a máquina ficar com processos x núcleos threads.
+    Um número de trabalhadores já configurado vale como teto.
+    """
+    configuracao = configuracao or ConfiguracaoSolver()
+    cota = max(1, (os.cpu_count() or 1) // max(1, processos))
+    if configuracao.trabalhadores:
+        cota = min(cota, configuracao.trabalhadores)
+    return replace(configuracao, trabalhadores=cota)
+
+
+def configuracao_de_ambiente(perfil: Optional[str] = None) -> ConfiguracaoSolver:
+    """
+    Lê o perfil (`perfil` ou SOLVER_PERFIL, nome ou arquivo JSON) e aplica por
+    cima as variáveis SOLVER_TRABALHADORES, SOLVER_SEMENTE, SOLVER_ESTRATEGIA,
+    SOLVER_GAP_RELATIVO e SOLVER_PARAMETROS que estiverem preenchidas.
+    """
+    configuracao = carregar_perfil(perfil or os.getenv("SOLVER_PERFIL") or "padrao")
+    alteracoes = {}
+    if os.getenv("SOLVER_TRABALHADORES"):
+        alteracoes["trabalhadores"] = int(os.getenv("SOLVER_TRABALHADORES"))
+    if os.getenv("SOLVER_SEMENTE"):
+        alteracoes["semente"] = int(os.getenv("SOLVER_SEMENTE"))
+    if os.getenv("SOLVER_ESTRATEGIA"):
+        alteracoes["estrategia"] = os.getenv("SOLVER_ESTRATEGIA")
+    if os.getenv("SOLVER_GAP_RELATIVO"):
+        alteracoes["gap_relativo"] = float(os.getenv("SOLVER_GAP_RELATIVO"))
+    if os.getenv("SOLVER_PARAMETROS"):
+        alteracoes["parametros_extras"] = os.getenv("SOLVER_PARAMETROS")
+    return replace(configuracao, **alteracoes)
+
+
+def adicionar_argumentos(parser: argparse.ArgumentParser):
+    """Opções de linha de comando equivalentes às variáveis SOLVER_*."""
+    grupo = parser.add_argument_group("solver")
+    grupo.add_argument("--perfil", default=None, help=f"perfil ({', '.join(PERFIS)}) ou arquivo JSON")
+    grupo.add_argument("--trabalhadores", type=int, default=None, help="workers do CP-SAT (0 = todos os núcleos)")
+    grupo.add_argument("--semente-solver", type=int, default=None, help="semente aleatória do CP-SAT")
+    grupo.add_argument("--estrategia", choices=ESTRATEGIAS, default=None)
+    grupo.add_argument("--gap-relativo", type=float, default=None, help="para ao atingir este gap (0.01 = 1%%)")
+    grupo.add_argument("--deterministico", action="store_true", default=None)
+
+
+def de_argumentos(args: argparse.Namespace, base: Optional[ConfiguracaoSolver] = None) -> ConfiguracaoSolver:
+    """Configuração a partir das opções de `adicionar_argumentos`, sobre `base` (ou o ambiente)."""
+    configuracao = carregar_perfil(args.perfil) if args.perfil else (base or configuracao_de_ambiente())
+    alteracoes = {
+        campo: getattr(args, opcao)
+        for campo, opcao in (
+            ("trabalhadores", "trabalhadores"),
+            ("semente", "semente_solver"),
+            ("estrategia", "estrategia"),
+            ("gap_relativo", "gap_relativo"),
+            ("deterministico", "deterministico"),
+        )
+        if getattr(args, opcao, None) is not None
+    }
+    return replace(configuracao, **alteracoes)
+
+
+def criar_solver(tempo_limite: float, configuracao: Optional[ConfiguracaoSolver] = None) -> cp_model.CpSolver:
+    """Um CpSolver com o tempo limite e a configuração (ou a padrão)."""
+    solver = cp_model.CpSolver()
+    (configuracao or PERFIS["padrao"]).aplicar(solver, tempo_limite)
+    return solver
+
+
+def caminho_parametros(caminho_distribuicao) -> str:
+    return os.path.splitext(caminho_distribuicao)[0] + ".parametros.json"
+
+
+def exportar_parametros(
+    caminho_distribuicao,
+    configuracao: ConfiguracaoSolver,
+    tempo_limite: float,
+    solver: Optional[cp_model.CpSolver] = None,
+    **extras,
+) -> str:
+    """
+    Grava, ao lado da distribuição exportada, os parâmetros usados para obtê-la.
+
+    Args:
+        caminho_distribuicao (str): O CSV da distribuição; o arquivo gravado troca a
+            extensão por `.parametros.json`.
+        configuracao (ConfiguracaoSolver): A configuração usada.
+        tempo_limite (float): O tempo limite usado.
+        solver (cp_model.CpSolver, optional): O solver, para registrar os parâmetros efetivos.
+        **extras: Outros valores a registrar (objetivo, pesos, modo...).
+
+    Returns:
+        str: O caminho do arquivo gravado.
+    """
+    registro = {"tempo_limite": tempo_limite, "configuracao": asdict(configuracao), **extras}
+    if solver is not None:
+        registro["parametros_sat"] = str(solver.parameters)
+    caminho = caminho_parametros(caminho_distribuicao)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(registro, arquivo, ensure_ascii=False, indent=2, default=str)
+    return caminho
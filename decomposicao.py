@@ -0,0 +1,249 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from carregamento import RecursosColunares, TarefasColunares
+from configuracao_solver import ConfiguracaoSolver, criar_solver, dividir_trabalhadores
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA, construir_modelo, maior_prioridade
+
+DECOMPOSICAO_COMPONENTES = "componentes"
+DECOMPOSICAO_NUCLEO = "nucleo"
+
+
+@dataclass
+class Subproblema:
+    """Tarefas e recursos (índices globais) de um subproblema independente."""
+
+    tarefas: np.ndarray
+    recursos: np.ndarray
+
+
+@dataclass
+class ResultadoSubproblema:
+    num_tarefas: int
+    num_recursos: int
+    status: int
+    objetivo: Optional[float]
+    tempo: float
+    atribuicao: np.ndarray
+
+
+@dataclass
+class ResultadoDecomposto:
+    """
+    Resultado combinado dos subproblemas.
+
+    `atribuicao` usa os índices globais de tarefas e recursos, no mesmo
+    formato de `ModeloAlocacao.atribuicao`.
+    """
+
+    atribuicao: np.ndarray
+    status: int
+    subproblemas: List[ResultadoSubproblema] = field(default_factory=list)
+    tempo: float = 0.0
+
+    def resumo(self) -> str:
+        linhas = [
+            f"Subproblemas: {len(self.subproblemas)} | Status: {cp_model.CpSolverStatus(self.status).name}"
+            f" | Tempo total: {self.tempo:.2f}s"
+        ]
+        for i, resultado in enumerate(self.subproblemas):
+            linhas.append(
+                f"  [{i}] {resultado.num_tarefas} tarefas x {resultado.num_recursos} recursos: "
+                f"{cp_model.CpSolverStatus(resultado.status).name}, objetivo {resultado.objetivo}, "
+                f"{resultado.tempo:.2f}s"
+            )
+        return "\n".join(linhas)
+
+
+def _raiz(pais, i):
+    while pais[i] != i:
+        pais[i] = pais[pais[i]]
+        i = pais[i]
+    return i
+
+
+def rotular_componentes(tarefas: TarefasColunares, recursos: RecursosColunares):
+    """
+    Encontra as componentes conexas do grafo de elegibilidade tarefa-recurso.
+
+    A união é feita por assinatura de habilidades (e não por par), já que todas
+    as tarefas com a mesma máscara ligam exatamente o mesmo conjunto de recursos.
+
+    Returns:
+        tuple: (rótulo de cada tarefa, rótulo de cada recurso). Tarefas sem
+        nenhum recurso elegível recebem -1.
+    """
+    pais = list(range(len(recursos)))
+    primeiro_elegivel = {}
+    for assinatura in np.unique(tarefas.mascara).tolist():
+        elegiveis = np.flatnonzero((assinatura & ~recursos.mascara) == 0).tolist()
+        primeiro_elegivel[assinatura] = elegiveis[0] if elegiveis else -1
+        for r in elegiveis[1:]:
+            a, b = _raiz(pais, elegiveis[0]), _raiz(pais, r)
+            if a != b:
+                pais[b] = a
+
+    raizes = np.array([_raiz(pais, r) for r in range(len(recursos))], dtype=np.int64)
+    _, rotulo_recurso = np.unique(raizes, return_inverse=True)
+
+    rotulo_tarefa = np.full(len(tarefas), -1, dtype=np.int64)
+    representante = np.array([primeiro_elegivel[m] for m in tarefas.mascara.tolist()], dtype=np.int64)
+    com_elegivel = representante >= 0
+    rotulo_tarefa[com_elegivel] = rotulo_recurso[representante[com_elegivel]]
+    return rotulo_tarefa, rotulo_recurso.astype(np.int64)
+
+
+def _dividir_por_nucleo(tarefas: TarefasColunares, recursos: RecursosColunares, rotulo_tarefa, rotulo_recurso):
+    """
+    Refina as componentes por núcleo. Como tarefas não têm núcleo, cada tarefa
+    vai para o núcleo elegível com maior capacidade ainda livre (em ordem de
+    prioridade). Essa divisão é heurística: pode perder o ótimo global.
+    """
+    nucleos, nucleo_recurso = np.unique(recursos.nucleo.astype(str), return_inverse=True)
+    rotulo_recurso = rotulo_recurso * len(nucleos) + nucleo_recurso
+
+    # Capacidade ainda livre de cada (componente, núcleo)
+    livre = np.bincount(rotulo_recurso, weights=recursos.disponibilidade)
+    nucleos_da_assinatura: Dict[int, List[int]] = {}
+    for assinatura in np.unique(tarefas.mascara).tolist():
+        elegiveis = np.flatnonzero((assinatura & ~recursos.mascara) == 0)
+        nucleos_da_assinatura[assinatura] = np.unique(rotulo_recurso[elegiveis]).tolist()
+
+    novo_rotulo = np.full(len(tarefas), -1, dtype=np.int64)
+    for t in np.argsort(tarefas.prioridade, kind="stable").tolist():
+        if rotulo_tarefa[t] < 0:
+            continue
+        candidatos = nucleos_da_assinatura[int(tarefas.mascara[t])]
+        escolhido = max(candidatos, key=lambda c: livre[c])
+        livre[escolhido] -= tarefas.esforco[t]
+        novo_rotulo[t] = escolhido
+    return novo_rotulo, rotulo_recurso
+
+
+def decompor(tarefas: TarefasColunares, recursos: RecursosColunares, modo=DECOMPOSICAO_COMPONENTES) -> List[Subproblema]:
+    """
+    Divide o problema em subproblemas sem tarefas ou recursos em comum.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        modo (str, optional): DECOMPOSICAO_COMPONENTES (exato) ou DECOMPOSICAO_NUCLEO
+            (componentes refinadas por núcleo). Defaults to DECOMPOSICAO_COMPONENTES.
+
+    Returns:
+        List[Subproblema]: Os subproblemas, do maior para o menor número de tarefas.
+    """
+    rotulo_tarefa, rotulo_recurso = rotular_componentes(tarefas, recursos)
+    if modo == DECOMPOSICAO_NUCLEO:
+        rotulo_tarefa, rotulo_recurso = _dividir_por_nucleo(tarefas, recursos, rotulo_tarefa, rotulo_recurso)
+    elif modo != DECOMPOSICAO_COMPONENTES:
+        raise ValueError(f"Modo de decomposição desconhecido: {modo}")
+
+    subproblemas = []
+    for rotulo in np.unique(rotulo_recurso).tolist():
+        indices_tarefas = np.flatnonzero(rotulo_tarefa == rotulo)
+        if len(indices_tarefas):
+            subproblemas.append(Subproblema(indices_tarefas, np.flatnonzero(rotulo_recurso == rotulo)))
+    subproblemas.sort(key=lambda s: len(s.tarefas), reverse=True)
+    return subproblemas
+
+
+def resolver_subproblema(tarefas, recursos, objetivo, pesos, tempo_limite, configuracao, opcoes) -> ResultadoSubproblema:
+    """Monta e resolve um subproblema (tarefas e recursos já selecionados)."""
+    alocacao = construir_modelo(tarefas, recursos, objetivo, pesos, **opcoes)
+    solver = criar_solver(tempo_limite, configuracao)
+    status = solver.Solve(alocacao.modelo)
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        atribuicao = alocacao.atribuicao(solver)
+        objetivo_alcancado = solver.ObjectiveValue()
+    else:
+        atribuicao = np.full(len(tarefas), -1, dtype=np.int64)
+        objetivo_alcancado = None
+    return ResultadoSubproblema(
+        len(tarefas), len(recursos), status, objetivo_alcancado, solver.WallTime(), atribuicao
+    )
+
+
+def resolver_decomposto(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    objetivo=OBJETIVO_ESFORCO_MAXIMO,
+    pesos=None,
+    tempo_limite=30.0,
+    modo=DECOMPOSICAO_COMPONENTES,
+    processos=None,
+    configuracao: Optional[ConfiguracaoSolver] = None,
+    **opcoes,
+) -> ResultadoDecomposto:
+    """
+    Resolve cada subproblema independente em paralelo e junta as atribuições.
+
+    O objetivo de prioridade se decompõe de forma exata. No objetivo de esforço
+    máximo o termo de esforço também; já o balanceamento de carga passa a ser
+    feito dentro de cada subproblema.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        objetivo (str, optional): Objetivo de `modelagem.construir_modelo`.
+        pesos (dict, optional): Pesos do objetivo de prioridade máxima.
+        tempo_limite (float, optional): Tempo máximo de cada subproblema. Defaults to 30.0.
+        modo (str, optional): Modo de `decompor`. Defaults to DECOMPOSICAO_COMPONENTES.
+        processos (int, optional): Tamanho do pool de processos. Defaults to os.cpu_count().
+        configuracao (ConfiguracaoSolver, optional): Parâmetros do solver de cada subproblema; em
+            paralelo, os núcleos são divididos entre os processos (ver `dividir_trabalhadores`).
+        **opcoes: Repassadas a `modelagem.construir_modelo` (agregado, simetria, enxuto).
+
+    Returns:
+        ResultadoDecomposto: A atribuição global e o resultado de cada subproblema.
+    """
+    inicio = time.perf_counter()
+    subproblemas = decompor(tarefas, recursos, modo)
+    if objetivo == OBJETIVO_PRIORIDADE_MAXIMA:
+        # O score de cada subproblema precisa usar a mesma escala do problema completo
+        opcoes.setdefault("max_prioridade", maior_prioridade(tarefas))
+    processos = min(len(subproblemas), processos or os.cpu_count() or 1)
+    if processos > 1:
+        configuracao = dividir_trabalhadores(configuracao, processos)
+    argumentos = [
+        (tarefas.selecionar(s.tarefas), recursos.selecionar(s.recursos), objetivo, pesos, tempo_limite, configuracao, opcoes)
+        for s in subproblemas
+    ]
+
+    if processos > 1:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            resultados = list(executor.map(resolver_subproblema, *zip(*argumentos)))
+    else:
+        resultados = [resolver_subproblema(*args) for args in argumentos]
+
+    atribuicao, status = combinar_subproblemas(len(tarefas), subproblemas, resultados)
+    return ResultadoDecomposto(atribuicao, status, resultados, time.perf_counter() - inicio)
+
+
+def combinar_subproblemas(num_tarefas: int, subproblemas: List[Subproblema], resultados: List[ResultadoSubproblema]):
+    """
+    Junta as atribuições dos subproblemas em uma atribuição global.
+
+    Returns:
+        tuple: (atribuição por tarefa, status global).
+    """
+    atribuicao = np.full(num_tarefas, -1, dtype=np.int64)
+    for subproblema, resultado in zip(subproblemas, resultados):
+        locais = resultado.atribuicao >= 0
+        atribuicao[subproblema.tarefas[locais]] = subproblema.recursos[resultado.atribuicao[locais]]
+
+    # Deixar tarefas sem recurso é sempre viável; o status só é ótimo se todos forem
+    status_sub = [r.status for r in resultados]
+    if all(s == cp_model.OPTIMAL for s in status_sub):
+        status = cp_model.OPTIMAL
+    elif any(s in (cp_model.OPTIMAL, cp_model.FEASIBLE) for s in status_sub):
+        status = cp_model.FEASIBLE
+    else:
+        status = cp_model.UNKNOWN
+    return atribuicao, status
@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from carregamento import RecursosColunares, TarefasColunares
+
+
+@dataclass
+class IndiceElegibilidade:
+    """
+    Pares (tarefa, recurso) elegíveis, em que o recurso possui todas as
+    habilidades exigidas pela tarefa.
+
+    Os pares são numerados de 0 a `len(indice) - 1` e ficam ordenados por
+    tarefa (e, dentro da tarefa, por recurso). As listas de adjacência são
+    guardadas no formato CSR:
+
+    - pares da tarefa `t`: `range(inicio_tarefa[t], inicio_tarefa[t + 1])`;
+    - pares do recurso `r`: `ordem_recurso[inicio_recurso[r]:inicio_recurso[r + 1]]`.
+    """
+
+    par_tarefa: np.ndarray
+    par_recurso: np.ndarray
+    inicio_tarefa: np.ndarray
+    ordem_recurso: np.ndarray
+    inicio_recurso: np.ndarray
+
+    def __len__(self):
+        return len(self.par_tarefa)
+
+    @property
+    def num_tarefas(self):
+        return len(self.inicio_tarefa) - 1
+
+    @property
+    def num_recursos(self):
+        return len(self.inicio_recurso) - 1
+
+    def pares_da_tarefa(self, t) -> range:
+        return range(self.inicio_tarefa[t], self.inicio_tarefa[t + 1])
+
+    def pares_do_recurso(self, r) -> np.ndarray:
+        return self.ordem_recurso[self.inicio_recurso[r]:self.inicio_recurso[r + 1]]
+
+    def recursos_da_tarefa(self, t) -> np.ndarray:
+        return self.par_recurso[self.inicio_tarefa[t]:self.inicio_tarefa[t + 1]]
+
+    def tarefas_do_recurso(self, r) -> np.ndarray:
+        return self.par_tarefa[self.pares_do_recurso(r)]
+
+    def num_elegiveis_por_tarefa(self) -> np.ndarray:
+        return np.diff(self.inicio_tarefa)
+
+    def recursos_com_pares(self) -> np.ndarray:
+        """Recursos com ao menos um par elegível."""
+        return np.flatnonzero(np.diff(self.inicio_recurso) > 0)
+
+    def filtrar(self, manter) -> "IndiceElegibilidade":
+        """
+        Índice apenas com os pares marcados em `manter`, com as mesmas tarefas
+        e recursos (que podem ficar sem pares); os pares são renumerados.
+        """
+        manter = np.asarray(manter, dtype=bool)
+        par_tarefa = self.par_tarefa[manter]
+        par_recurso = self.par_recurso[manter]
+        num_tarefas, num_recursos = self.num_tarefas, self.num_recursos
+
+        inicio_tarefa = np.zeros(num_tarefas + 1, dtype=np.int64)
+        np.cumsum(np.bincount(par_tarefa, minlength=num_tarefas), out=inicio_tarefa[1:])
+        ordem_recurso = np.argsort(par_recurso, kind="stable")
+        inicio_recurso = np.zeros(num_recursos + 1, dtype=np.int64)
+        np.cumsum(np.bincount(par_recurso, minlength=num_recursos), out=inicio_recurso[1:])
+        return IndiceElegibilidade(par_tarefa, par_recurso, inicio_tarefa, ordem_recurso, inicio_recurso)
+
+    def localizar_pares(self, tarefas, recursos) -> np.ndarray:
+        """
+        Retorna o número do par (tarefa, recurso) para cada posição, ou -1 quando
+        o par não é elegível.
+        """
+        tarefas = np.asarray(tarefas, dtype=np.int64)
+        recursos = np.asarray(recursos, dtype=np.int64)
+        # Os pares estão ordenados por (tarefa, recurso), logo a chave combinada também
+        chaves = self.par_tarefa * self.num_recursos + self.par_recurso
+        procuradas = tarefas * self.num_recursos + recursos
+        posicoes = np.searchsorted(chaves, procuradas)
+        encontrados = posicoes < len(chaves)
+        encontrados[encontrados] = chaves[posicoes[encontrados]] == procuradas[encontrados]
+        return np.where(encontrados, posicoes, -1)
+
+    @classmethod
+    def construir(cls, mascaras_tarefas, mascaras_recursos):
+        """
+        Cruza as máscaras de habilidades de tarefas e recursos.
+
+        As tarefas são agrupadas por assinatura (máscara distinta); a checagem de
+        subconjunto `(tarefa & ~recurso) == 0` é feita uma única vez por
+        assinatura e recurso, e a lista de recursos da assinatura é replicada
+        para as tarefas do grupo, sem passar por uma matriz tarefas x recursos:
+        a memória fica proporcional ao número de pares.
+
+        Args:
+            mascaras_tarefas (np.ndarray): Máscara de habilidades de cada tarefa.
+            mascaras_recursos (np.ndarray): Máscara de habilidades de cada recurso.
+
+        Returns:
+            IndiceElegibilidade: O índice de pares elegíveis.
+        """
+        mascaras_tarefas = np.asarray(mascaras_tarefas, dtype=np.int64)
+        mascaras_recursos = np.asarray(mascaras_recursos, dtype=np.int64)
+        num_tarefas = len(mascaras_tarefas)
+        num_recursos = len(mascaras_recursos)
+
+        assinaturas, assinatura_tarefa = np.unique(mascaras_tarefas, return_inverse=True)
+        assinatura_tarefa = assinatura_tarefa.reshape(-1)
+        # Matriz (assinaturas x recursos): True quando o recurso cobre a assinatura
+        cobre = (assinaturas[:, None] & ~mascaras_recursos[None, :]) == 0
+        # Recursos de cada assinatura, concatenados em ordem (CSR por assinatura)
+        assinatura_cobre, recursos_cobre = np.nonzero(cobre)
+        inicio_assinatura = np.zeros(len(assinaturas) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assinatura_cobre, minlength=len(assinaturas)), out=inicio_assinatura[1:])
+
+        # Cada tarefa recebe a lista de recursos da sua assinatura
+        elegiveis = np.diff(inicio_assinatura)[assinatura_tarefa]
+        par_tarefa = np.repeat(np.arange(num_tarefas, dtype=np.int64), elegiveis)
+        posicao = np.arange(len(par_tarefa), dtype=np.int64)
+        posicao -= np.repeat(np.cumsum(elegiveis) - elegiveis, elegiveis)
+        posicao += np.repeat(inicio_assinatura[assinatura_tarefa], elegiveis)
+        par_recurso = recursos_cobre.astype(np.int64)[posicao]
+        del posicao
+
+        inicio_tarefa = np.zeros(num_tarefas + 1, dtype=np.int64)
+        np.cumsum(np.bincount(par_tarefa, minlength=num_tarefas), out=inicio_tarefa[1:])
+
+        ordem_recurso = np.argsort(par_recurso, kind="stable")
+        inicio_recurso = np.zeros(num_recursos + 1, dtype=np.int64)
+        np.cumsum(np.bincount(par_recurso, minlength=num_recursos), out=inicio_recurso[1:])
+
+        return cls(par_tarefa, par_recurso, inicio_tarefa, ordem_recurso, inicio_recurso)
+
+    @classmethod
+    def de_dados(cls, tarefas: TarefasColunares, recursos: RecursosColunares):
+        """Constrói o índice a partir dos dados colunares (mesmo vocabulário)."""
+        if tarefas.vocabulario is not recursos.vocabulario:
+            raise ValueError("Tarefas e recursos devem compartilhar o mesmo vocabulário de habilidades.")
+        return cls.construir(tarefas.mascara, recursos.mascara)
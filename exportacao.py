@@ -0,0 +1,232 @@
+import os
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from carregamento import RecursosColunares, TarefasColunares
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # opcional, só para a saída em Parquet
+    pa = pq = None
+
+FORMATO_CSV = "csv"
+FORMATO_PARQUET = "parquet"
+EXTENSOES = {FORMATO_CSV: ".csv", FORMATO_PARQUET: ".parquet"}
+
+# Linhas por lote na gravação em fluxo (uma row group por lote no Parquet)
+TAMANHO_LOTE = 100_000
+
+
+def distribuicao_dataframe(atribuicao, tarefas: TarefasColunares, recursos: RecursosColunares) -> pd.DataFrame:
+    """
+    Monta a tabela de distribuição a partir da atribuição por tarefa.
+
+    Args:
+        atribuicao (np.ndarray): Para cada tarefa, o índice do recurso atribuído ou -1.
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+
+    Returns:
+        pd.DataFrame: Uma linha por tarefa atribuída (nota, matricula, nome, esforco, prioridade).
+    """
+    atribuicao = np.asarray(atribuicao)
+    return _distribuicao_das_tarefas(atribuicao, np.flatnonzero(atribuicao >= 0), tarefas, recursos)
+
+
+def _distribuicao_das_tarefas(atribuicao, atribuidas, tarefas, recursos) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "nota": tarefas.nota[atribuidas],
+            "matricula": recursos.matricula[atribuicao[atribuidas]],
+            "nome": recursos.nome[atribuicao[atribuidas]],
+            "esforco": tarefas.esforco[atribuidas],
+            "prioridade": tarefas.prioridade[atribuidas],
+        }
+    )
+
+
+def resumo_recursos(atribuicao, tarefas: TarefasColunares, recursos: RecursosColunares) -> pd.DataFrame:
+    """
+    Carga de cada recurso na atribuição.
+
+    Returns:
+        pd.DataFrame: Uma linha por recurso (matricula, nome, nucleo, disponibilidade,
+            tarefas, carga, ocupacao), inclusive os que ficaram sem tarefas.
+    """
+    atribuicao = np.asarray(atribuicao)
+    atribuidas = atribuicao >= 0
+    carga = np.bincount(atribuicao[atribuidas], weights=tarefas.esforco[atribuidas], minlength=len(recursos))
+    quantidade = np.bincount(atribuicao[atribuidas], minlength=len(recursos))
+    disponibilidade = recursos.disponibilidade.astype(np.int64)
+    return pd.DataFrame(
+        {
+            "matricula": recursos.matricula,
+            "nome": recursos.nome,
+            "nucleo": recursos.nucleo,
+            "disponibilidade": disponibilidade,
+            "tarefas": quantidade.astype(np.int64),
+            "carga": carga.astype(np.int64),
+            "ocupacao": np.divide(carga, disponibilidade, out=np.zeros(len(recursos)), where=disponibilidade > 0).round(4),
+        }
+    )
+
+
+def tarefas_nao_atribuidas(atribuicao, tarefas: TarefasColunares) -> pd.DataFrame:
+    """
+    Tarefas que ficaram sem recurso, em ordem de prioridade.
+
+    Returns:
+        pd.DataFrame: Colunas nota, grupo, codigo, esforco, prioridade, habilidades.
+    """
+    pendentes = np.flatnonzero(np.asarray(atribuicao) < 0)
+    pendentes = pendentes[np.argsort(tarefas.prioridade[pendentes], kind="stable")]
+    return pd.DataFrame(
+        {
+            "nota": tarefas.nota[pendentes],
+            "grupo": tarefas.grupo[pendentes],
+            "codigo": tarefas.codigo[pendentes],
+            "esforco": tarefas.esforco[pendentes],
+            "prioridade": tarefas.prioridade[pendentes],
+            "habilidades": tarefas.habilidades[pendentes],
+        }
+    )
+
+
+def formato_do_caminho(caminho, formato: Optional[str] = None) -> str:
+    """O formato informado ou, sem ele, o da extensão do arquivo (CSV se não for Parquet)."""
+    if formato:
+        if formato not in EXTENSOES:
+            raise ValueError(f"Formato de saída desconhecido: {formato} (formatos: {', '.join(EXTENSOES)})")
+        return formato
+    return FORMATO_PARQUET if str(caminho).endswith(EXTENSOES[FORMATO_PARQUET]) else FORMATO_CSV
+
+
+def gravar_tabela(lotes: Iterable[pd.DataFrame], caminho, formato: Optional[str] = None) -> int:
+    """
+    Grava os lotes, um de cada vez, em um arquivo temporário no mesmo diretório
+    e o renomeia sobre `caminho`: quem lê o arquivo nunca vê uma gravação pela
+    metade, e a tabela inteira nunca precisa estar em memória.
+
+    O CSV é UTF-8 com separador ';'. O Parquet exige o pacote pyarrow.
+
+    Args:
+        lotes (Iterable[pd.DataFrame]): Partes da tabela, todas com as mesmas colunas.
+        caminho (str): O arquivo de destino.
+        formato (str, optional): FORMATO_CSV ou FORMATO_PARQUET. Defaults to o da extensão.
+
+    Returns:
+        int: Número de linhas gravadas.
+    """
+    formato = formato_do_caminho(caminho, formato)
+    if formato == FORMATO_PARQUET and pq is None:
+        raise ImportError("A saída em Parquet requer o pacote pyarrow (pip install pyarrow)")
+
+    # Criado como um arquivo comum, para manter as permissões padrão
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    linhas = 0
+    escritor = None
+    try:
+        for numero, lote in enumerate(lotes):
+            if formato == FORMATO_CSV:
+                lote.to_csv(temporario, mode="a" if numero else "w", header=not numero, index=False, encoding="utf-8", sep=";")
+            else:
+                tabela = pa.Table.from_pandas(lote, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(temporario, tabela.schema)
+                escritor.write_table(tabela)
+            linhas += len(lote)
+        if escritor is not None:
+            escritor.close()
+            escritor = None
+        if not os.path.exists(temporario):
+            raise ValueError("Nenhum lote para gravar")
+        os.replace(temporario, caminho)
+    except BaseException:
+        if escritor is not None:
+            escritor.close()
+        if os.path.exists(temporario):
+            os.unlink(temporario)
+        raise
+    return linhas
+
+
+def gravar_csv_atomico(df: pd.DataFrame, caminho):
+    """
+    Grava o CSV (UTF-8, separador ';') em um arquivo temporário no mesmo
+    diretório e o renomeia sobre `caminho`: quem lê o arquivo nunca vê uma
+    gravação pela metade.
+    """
+    gravar_tabela([df], caminho, FORMATO_CSV)
+
+
+def lotes_distribuicao(
+    atribuicao, tarefas: TarefasColunares, recursos: RecursosColunares, tamanho_lote: int = TAMANHO_LOTE
+) -> Iterator[pd.DataFrame]:
+    """A tabela de distribuição em lotes de até `tamanho_lote` tarefas atribuídas."""
+    atribuicao = np.asarray(atribuicao)
+    atribuidas = np.flatnonzero(atribuicao >= 0)
+    # Sempre ao menos um lote, para que o arquivo tenha o cabeçalho
+    for inicio in range(0, max(len(atribuidas), 1), tamanho_lote):
+        yield _distribuicao_das_tarefas(atribuicao, atribuidas[inicio : inicio + tamanho_lote], tarefas, recursos)
+
+
+def exportar_distribuicao(atribuicao, tarefas: TarefasColunares, recursos: RecursosColunares, caminho, formato=None):
+    """
+    Grava a distribuição de forma atômica, em CSV (UTF-8, separador ';') ou
+    Parquet, conforme `formato` ou a extensão do arquivo.
+
+    Returns:
+        pd.DataFrame: A tabela gravada.
+    """
+    df = distribuicao_dataframe(atribuicao, tarefas, recursos)
+    gravar_tabela([df], caminho, formato)
+    return df
+
+
+def caminhos_plano(caminho, formato: Optional[str] = None) -> Dict[str, str]:
+    """
+    Arquivos gravados por `exportar_plano`: a distribuição em `caminho` (com a
+    extensão do formato) e, ao lado dela, `<base>.recursos` e `<base>.nao_atribuidas`.
+    """
+    formato = formato_do_caminho(caminho, formato)
+    base = os.path.splitext(caminho)[0]
+    extensao = EXTENSOES[formato]
+    return {
+        "distribuicao": base + extensao,
+        "recursos": f"{base}.recursos{extensao}",
+        "nao_atribuidas": f"{base}.nao_atribuidas{extensao}",
+    }
+
+
+def exportar_plano(
+    atribuicao,
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    caminho,
+    formato: Optional[str] = None,
+    tamanho_lote: int = TAMANHO_LOTE,
+) -> Dict[str, str]:
+    """
+    Grava o plano completo: a distribuição (em lotes, sem montar a tabela
+    inteira), o resumo de carga por recurso e as tarefas não atribuídas.
+
+    Args:
+        atribuicao (np.ndarray): Para cada tarefa, o índice do recurso atribuído ou -1.
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        caminho (str): O arquivo da distribuição; os demais são gravados ao lado (ver `caminhos_plano`).
+        formato (str, optional): FORMATO_CSV ou FORMATO_PARQUET. Defaults to o da extensão.
+        tamanho_lote (int, optional): Linhas por lote da distribuição. Defaults to TAMANHO_LOTE.
+
+    Returns:
+        dict: O caminho de cada arquivo gravado.
+    """
+    formato = formato_do_caminho(caminho, formato)
+    caminhos = caminhos_plano(caminho, formato)
+    gravar_tabela(lotes_distribuicao(atribuicao, tarefas, recursos, tamanho_lote), caminhos["distribuicao"], formato)
+    gravar_tabela([resumo_recursos(atribuicao, tarefas, recursos)], caminhos["recursos"], formato)
+    gravar_tabela([tarefas_nao_atribuidas(atribuicao, tarefas)], caminhos["nao_atribuidas"], formato)
+    return caminhos
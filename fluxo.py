@@ -0,0 +1,433 @@
+"""
+Fluxos Prefect da alocação: carga → índice de elegibilidade → construção →
+solução → exportação, cada etapa como uma tarefa Prefect.
+
+A carga e o índice têm o resultado guardado pelo Prefect com a chave do
+conteúdo dos CSVs (`cache_modelo.chave_modelo`): enquanto os arquivos não
+mudam, as execuções seguintes não os leem de novo. Subproblemas independentes
+(`DECOMPOSICAO`) e cenários de pesos são submetidos como tarefas concorrentes.
+
+Sem PREFECT_API_URL, o Prefect sobe um servidor temporário local a cada
+execução; a duração de cada etapa fica no log da execução e no resultado do
+fluxo. Para o agendamento diário (`--agendar`), rode antes `prefect server start`
+e aponte PREFECT_API_URL para ele.
+
+Uso:
+    python fluxo.py                       # alocação com as opções do .env
+    python fluxo.py --cenarios            # grade de cenários de pesos
+    python fluxo.py --agendar "0 6 * * *" # alocação todos os dias às 6h
+"""
+
+import argparse
+import os
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from ortools.sat.python import cp_model
+from prefect import flow, get_run_logger, task
+from prefect.cache_policies import NO_CACHE
+
+from alocacao.execucao import caminho_saida_padrao
+from cache_modelo import cache_de_ambiente, chave_modelo
+from carregamento import RecursosColunares, TarefasColunares, carregar_dados
+from cenarios import CAMINHO_CENARIOS, Cenario, grade_cenarios, marcar_pareto, resolver_cenario
+from configuracao_solver import (
+    ConfiguracaoSolver,
+    configuracao_de_ambiente,
+    criar_solver,
+    dividir_trabalhadores,
+    exportar_parametros,
+)
+from decomposicao import combinar_subproblemas, decompor, resolver_subproblema
+from elegibilidade import IndiceElegibilidade
+from exportacao import caminhos_plano, exportar_plano, gravar_csv_atomico
+from heuristica import resolver_heuristica, valor_objetivo
+from instrumentacao import Instrumentacao
+from modelagem import (
+    OBJETIVO_ESFORCO_MAXIMO,
+    OBJETIVO_PRIORIDADE_MAXIMA,
+    ModeloAlocacao,
+    construir_modelo,
+    gap_relativo,
+    maior_prioridade,
+)
+from partida_quente import aplicar_dicas, fixar_atribuicao
+from reducao import Reducao, reduzir
+
+# Por quanto tempo a carga e o índice guardados continuam válidos
+VALIDADE_CACHE = timedelta(days=7)
+OBJETIVOS = (OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA)
+
+
+def _chave_entradas(contexto, parametros) -> str:
+    return f"{contexto.task.name}-{parametros['chave']}"
+
+
+@task(
+    name="carregar",
+    cache_key_fn=_chave_entradas,
+    cache_expiration=VALIDADE_CACHE,
+    persist_result=True,
+    retries=2,
+    retry_delay_seconds=5,
+)
+def carregar(caminho_tarefas: str, caminho_recursos: str, chave: str):
+    """
+    Lê tarefas e recursos, com as tarefas em ordem de prioridade.
+
+    Args:
+        caminho_tarefas (str): CSV de tarefas.
+        caminho_recursos (str): CSV de recursos.
+        chave (str): Hash do conteúdo dos dois arquivos; identifica o resultado guardado.
+
+    Returns:
+        tuple: (TarefasColunares, RecursosColunares).
+    """
+    tarefas, recursos = carregar_dados(caminho_tarefas, caminho_recursos)
+    return tarefas.ordenar_por_prioridade(), recursos
+
+
+@task(name="indexar", cache_key_fn=_chave_entradas, cache_expiration=VALIDADE_CACHE, persist_result=True)
+def indexar(tarefas: TarefasColunares, recursos: RecursosColunares, chave: str) -> IndiceElegibilidade:
+    """Índice de elegibilidade das entradas identificadas por `chave`."""
+    return IndiceElegibilidade.de_dados(tarefas, recursos)
+
+
+@task(name="reduzir", cache_policy=NO_CACHE, persist_result=False)
+def reduzir_problema(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    indice: IndiceElegibilidade,
+    objetivo: str,
+    pesos: Optional[Dict[str, int]],
+) -> Reducao:
+    """Remove pares e tarefas impossíveis e fixa atribuições forçadas (ver `reducao`)."""
+    reducao = reduzir(tarefas, recursos, objetivo, pesos, indice=indice)
+    get_run_logger().info(reducao.resumo())
+    return reducao
+
+
+@task(name="construir", cache_policy=NO_CACHE, persist_result=False)
+def construir(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    indice: Optional[IndiceElegibilidade],
+    objetivo: str,
+    pesos: Optional[Dict[str, int]],
+    opcoes: dict,
+    chave: Optional[str] = None,
+) -> ModeloAlocacao:
+    """
+    Monta o modelo. Com CACHE_MODELO configurado e `chave` informada, usa o
+    modelo já construído para as mesmas entradas e opções (ver `cache_modelo`).
+    """
+    cache = cache_de_ambiente() if chave is not None else None
+    if cache is not None:
+        alocacao = cache.carregar(chave)
+        if alocacao is not None:
+            get_run_logger().info("Modelo lido do cache (%s).", chave[:16])
+            return alocacao
+    alocacao = construir_modelo(tarefas, recursos, objetivo, pesos, indice=indice, **opcoes)
+    if cache is not None:
+        cache.salvar(chave, alocacao)
+    return alocacao
+
+
+@task(name="resolver", cache_policy=NO_CACHE, persist_result=False)
+def resolver(
+    alocacao: ModeloAlocacao,
+    objetivo: str,
+    pesos: Optional[Dict[str, int]],
+    tempo_limite: float,
+    configuracao: ConfiguracaoSolver,
+    tempo_heuristica: float = 0.0,
+) -> dict:
+    """
+    Resolve o modelo, com a heurística como dica quando `tempo_heuristica` > 0.
+    Se o solver não encontrar solução, a da heurística é a resposta.
+
+    Returns:
+        dict: atribuicao (por tarefa de `alocacao.tarefas_da_atribuicao()`), status,
+            objetivo, limite e gap.
+    """
+    tarefas = alocacao.tarefas_da_atribuicao()
+    reserva = None
+    if tempo_heuristica:
+        reserva = resolver_heuristica(
+            tarefas, alocacao.recursos, objetivo, pesos, tempo_heuristica, alocacao.max_prioridade
+        )
+        aplicar_dicas(alocacao, reserva.atribuicao)
+    solver = criar_solver(tempo_limite, configuracao)
+    status = solver.Solve(alocacao.modelo)
+    logger = get_run_logger()
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        logger.info("%s em %.2fs, objetivo %s", solver.StatusName(status), solver.WallTime(), solver.ObjectiveValue())
+        return {
+            "atribuicao": alocacao.atribuicao(solver),
+            "status": solver.StatusName(status),
+            "objetivo": solver.ObjectiveValue(),
+            "limite": solver.BestObjectiveBound(),
+            "gap": gap_relativo(solver),
+        }
+    logger.warning("Solver sem solução (%s); usando a heurística.", solver.StatusName(status))
+    if reserva is None:
+        reserva = resolver_heuristica(
+            tarefas, alocacao.recursos, objetivo, pesos, max_prioridade=alocacao.max_prioridade
+        )
+    return {"atribuicao": reserva.atribuicao, "status": "HEURISTICA", "objetivo": reserva.objetivo, "limite": None, "gap": None}
+
+
+@task(name="resolver-subproblema", cache_policy=NO_CACHE, persist_result=False)
+def resolver_componente(tarefas, recursos, objetivo, pesos, tempo_limite, configuracao, opcoes):
+    """`decomposicao.resolver_subproblema` como tarefa, para rodar os subproblemas em concorrência."""
+    return resolver_subproblema(tarefas, recursos, objetivo, pesos, tempo_limite, configuracao, opcoes)
+
+
+@task(name="avaliar-cenario", cache_policy=NO_CACHE, persist_result=False)
+def avaliar_cenario(cenario: Cenario, tarefas, recursos, indice, max_prioridade, tempo_heuristica, configuracao, opcoes):
+    """`cenarios.resolver_cenario` como tarefa, para rodar os cenários em concorrência."""
+    return resolver_cenario(cenario, tarefas, recursos, indice, max_prioridade, tempo_heuristica, configuracao, opcoes)
+
+
+@task(name="exportar", cache_policy=NO_CACHE, retries=2, retry_delay_seconds=5)
+def exportar(atribuicao, tarefas: TarefasColunares, recursos: RecursosColunares, caminho: str, formato=None):
+    """Grava o plano (ver `exportacao.exportar_plano`)."""
+    return exportar_plano(atribuicao, tarefas, recursos, caminho, formato)
+
+
+def _tempos_das_fases(medicao: Instrumentacao) -> Dict[str, float]:
+    return {r["nome"]: r["tempo"] for r in medicao.registros if r["evento"] == "fase"}
+
+
+@flow(name="alocacao")
+def fluxo_alocacao(
+    caminho_tarefas: str,
+    caminho_recursos: str,
+    objetivo: str = OBJETIVO_PRIORIDADE_MAXIMA,
+    pesos: Optional[Dict[str, int]] = None,
+    tempo_limite: float = 30.0,
+    perfil: str = "padrao",
+    tempo_heuristica: float = 0.0,
+    decomposicao: str = "",
+    agregado: bool = False,
+    enxuto: bool = False,
+    reducao: bool = False,
+    caminho_saida: Optional[str] = None,
+    formato: Optional[str] = None,
+) -> dict:
+    """
+    Alocação completa: carga, índice, redução, construção, solução e exportação do plano.
+
+    Args:
+        caminho_tarefas (str): CSV de tarefas.
+        caminho_recursos (str): CSV de recursos.
+        objetivo (str, optional): Objetivo de `modelagem.construir_modelo`. Defaults to OBJETIVO_PRIORIDADE_MAXIMA.
+        pesos (dict, optional): Pesos do objetivo de prioridade máxima.
+        tempo_limite (float, optional): Tempo do solver (de cada subproblema, na decomposição). Defaults to 30.0.
+        perfil (str, optional): Perfil do solver ou arquivo JSON; as variáveis SOLVER_* valem por
+            cima dele (ver `configuracao_solver.configuracao_de_ambiente`). Defaults to "padrao".
+        tempo_heuristica (float, optional): Tempo da heurística usada como dica (0 desativa). Defaults to 0.0.
+        decomposicao (str, optional): Modo de `decomposicao.decompor` (vazio desativa); cada
+            subproblema é uma tarefa concorrente, com os núcleos divididos entre elas. Defaults to "".
+        agregado (bool, optional): Formulação por classes (ver `agregacao`). Defaults to False.
+        enxuto (bool, optional): Modelo enxuto em memória. Defaults to False.
+        reducao (bool, optional): Reduz o problema antes da construção (ver `reducao`); não se
+            aplica ao modelo agregado. Defaults to False.
+        caminho_saida (str, optional): Arquivo da distribuição. Defaults to o da CLI
+            (`alocacao.execucao.caminho_saida_padrao`).
+        formato (str, optional): csv ou parquet. Defaults to o da extensão.
+
+    Returns:
+        dict: Status, objetivo, tarefas atribuídas, arquivos gravados e a duração de cada etapa.
+    """
+    logger = get_run_logger()
+    medicao = Instrumentacao()
+    configuracao = configuracao_de_ambiente(perfil)
+    opcoes = {"agregado": agregado, "enxuto": enxuto}
+    caminho_saida = caminhos_plano(caminho_saida or caminho_saida_padrao(objetivo), formato)["distribuicao"]
+
+    chave = chave_modelo((caminho_tarefas, caminho_recursos))
+    with medicao.fase("carregamento"):
+        tarefas, recursos = carregar(caminho_tarefas, caminho_recursos, chave)
+
+    reduzido = None
+    if decomposicao:
+        with medicao.fase("solucao"):
+            subproblemas = decompor(tarefas, recursos, decomposicao)
+            if objetivo == OBJETIVO_PRIORIDADE_MAXIMA:
+                # O score de cada subproblema precisa usar a mesma escala do problema completo
+                opcoes["max_prioridade"] = maior_prioridade(tarefas)
+            # Os subproblemas rodam ao mesmo tempo: cada um fica com a sua parte dos núcleos
+            configuracao_subproblema = dividir_trabalhadores(configuracao, len(subproblemas))
+            futuros = [
+                resolver_componente.submit(
+                    tarefas.selecionar(s.tarefas),
+                    recursos.selecionar(s.recursos),
+                    objetivo,
+                    pesos,
+                    tempo_limite,
+                    configuracao_subproblema,
+                    opcoes,
+                )
+                for s in subproblemas
+            ]
+            resultados = [futuro.result() for futuro in futuros]
+            atribuicao, status = combinar_subproblemas(len(tarefas), subproblemas, resultados)
+            objetivos = [r.objetivo for r in resultados if r.objetivo is not None]
+            resultado = {
+                "atribuicao": atribuicao,
+                "status": cp_model.CpSolverStatus(status).name,
+                "objetivo": sum(objetivos) if objetivos else None,
+            }
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                logger.warning("Subproblemas sem solução (%s); usando a heurística.", resultado["status"])
+                reserva = resolver_heuristica(tarefas, recursos, objetivo, pesos, max_prioridade=opcoes.get("max_prioridade"))
+                resultado.update(atribuicao=reserva.atribuicao, status="HEURISTICA", objetivo=reserva.objetivo)
+        logger.info("%d subproblemas, status %s", len(subproblemas), resultado["status"])
+    else:
+        # No modelo agregado o índice é o das classes, montado por `construir_modelo`
+        with medicao.fase("elegibilidade"):
+            indice = None if agregado else indexar(tarefas, recursos, chave)
+        if reducao and not agregado:
+            with medicao.fase("reducao"):
+                reduzido = reduzir_problema(tarefas, recursos, indice, objetivo, pesos)
+                indice = reduzido.indice
+        if reduzido is not None and reduzido.solucao is not None:
+            # Todas as tarefas possíveis cabem: a alocação gulosa já é ótima
+            resultado = {
+                "atribuicao": reduzido.solucao,
+                "status": "OPTIMAL",
+                "objetivo": valor_objetivo(reduzido.solucao, tarefas, recursos, objetivo, pesos),
+            }
+        else:
+            with medicao.fase("construcao"):
+                chave_construcao = chave_modelo(
+                    (caminho_tarefas, caminho_recursos),
+                    objetivo=objetivo,
+                    pesos=pesos,
+                    simetria=False,
+                    lexicografico=False,
+                    reducao=reduzido is not None,
+                    **opcoes,
+                )
+                alocacao = construir(tarefas, recursos, indice, objetivo, pesos, opcoes, chave_construcao)
+                if reduzido is not None:
+                    fixar_atribuicao(alocacao, reduzido.fixadas)
+            with medicao.fase("solucao"):
+                resultado = resolver(alocacao, objetivo, pesos, tempo_limite, configuracao, tempo_heuristica)
+            tarefas = alocacao.tarefas_da_atribuicao()
+
+    with medicao.fase("exportacao"):
+        arquivos = exportar(resultado["atribuicao"], tarefas, recursos, caminho_saida, formato)
+        exportar_parametros(
+            caminho_saida,
+            configuracao,
+            tempo_limite,
+            modo="fluxo",
+            decomposicao=decomposicao or None,
+            reducao=reduzido.relatorio() if reduzido is not None else None,
+        )
+
+    logger.info(medicao.resumo())
+    return {
+        "status": resultado["status"],
+        "objetivo": resultado["objetivo"],
+        "tarefas_atribuidas": int((np.asarray(resultado["atribuicao"]) >= 0).sum()),
+        "arquivos": arquivos,
+        "tempos": _tempos_das_fases(medicao),
+    }
+
+
+@flow(name="cenarios-pesos")
+def fluxo_cenarios(
+    caminho_tarefas: str,
+    caminho_recursos: str,
+    pesos_prioridade: List[int] = (100, 80, 60, 40, 20),
+    tempos_limite: List[float] = (30.0,),
+    tempo_heuristica: float = 0.5,
+    perfil: str = "padrao",
+    caminho_saida: str = CAMINHO_CENARIOS,
+) -> List[dict]:
+    """
+    Grade de cenários de pesos (ver `cenarios`), com os dados e o índice
+    preparados uma vez e cada cenário como uma tarefa concorrente.
+
+    Returns:
+        List[dict]: Uma linha por cenário, com a coluna `pareto`; a tabela é gravada em `caminho_saida`.
+    """
+    chave = chave_modelo((caminho_tarefas, caminho_recursos))
+    tarefas, recursos = carregar(caminho_tarefas, caminho_recursos, chave)
+    indice = indexar(tarefas, recursos, chave)
+    cenarios = grade_cenarios(pesos_prioridade, tempos_limite)
+    # Os cenários rodam ao mesmo tempo: cada um fica com a sua parte dos núcleos
+    configuracao = dividir_trabalhadores(configuracao_de_ambiente(perfil), len(cenarios))
+    futuros = [
+        avaliar_cenario.submit(
+            cenario, tarefas, recursos, indice, maior_prioridade(tarefas), tempo_heuristica, configuracao, {}
+        )
+        for cenario in cenarios
+    ]
+    tabela = pd.DataFrame([futuro.result() for futuro in futuros])
+    for coluna in ("score_prioridade", "esforco_atribuido"):
+        if coluna not in tabela:
+            tabela[coluna] = np.nan
+    tabela["pareto"] = marcar_pareto(tabela)
+    gravar_csv_atomico(tabela, caminho_saida)
+    get_run_logger().info("Cenários exportados para '%s'.", caminho_saida)
+    return tabela.to_dict(orient="records")
+
+
+def _lista_env(nome, padrao, tipo):
+    return [tipo(v) for v in os.getenv(nome, padrao).split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa ou agenda os fluxos Prefect da alocação.")
+    parser.add_argument("--objetivo", choices=OBJETIVOS, default=OBJETIVO_PRIORIDADE_MAXIMA)
+    parser.add_argument("--cenarios", action="store_true", help="executa a grade de cenários de pesos")
+    parser.add_argument("--agendar", metavar="CRON", help="serve o fluxo com este agendamento (ex.: '0 6 * * *')")
+    args = parser.parse_args()
+
+    caminhos = {"caminho_tarefas": os.getenv("CAMINHO_TAREFAS"), "caminho_recursos": os.getenv("CAMINHO_RECURSOS")}
+    perfil = os.getenv("SOLVER_PERFIL") or "padrao"
+    if args.cenarios:
+        fluxo = fluxo_cenarios
+        parametros = dict(
+            caminhos,
+            pesos_prioridade=_lista_env("CENARIOS_PESO_PRIORIDADE", "100,80,60,40,20", int),
+            tempos_limite=_lista_env("CENARIOS_TEMPO_LIMITE", os.getenv("TEMPO_LIMITE", "30"), float),
+            tempo_heuristica=float(os.getenv("TEMPO_HEURISTICA", 0.5)),
+            perfil=perfil,
+        )
+    else:
+        fluxo = fluxo_alocacao
+        parametros = dict(
+            caminhos,
+            objetivo=args.objetivo,
+            pesos={"prioridade": int(os.getenv("PESO_PRIORIDADE", 60)), "esforco": int(os.getenv("PESO_ESFORCO", 40))},
+            tempo_limite=float(os.getenv("TEMPO_LIMITE", 30.0)),
+            perfil=perfil,
+            tempo_heuristica=float(os.getenv("TEMPO_HEURISTICA", 1.0)) if os.getenv("HEURISTICA", "0") == "1" else 0.0,
+            decomposicao=os.getenv("DECOMPOSICAO", ""),
+            agregado=os.getenv("MODELO_AGREGADO", "0") == "1",
+            enxuto=os.getenv("MODELO_ENXUTO", "0") == "1",
+            reducao=os.getenv("REDUCAO", "0") == "1",
+            formato=os.getenv("FORMATO_SAIDA") or None,
+        )
+
+    if args.agendar:
+        fluxo.serve(name=f"{fluxo.name}-agendado", cron=args.agendar, parameters=parametros)
+        return
+    resultado = fluxo(**parametros)
+    if not args.cenarios:
+        print(f"Status: {resultado['status']} | objetivo: {resultado['objetivo']} | "
+              f"{resultado['tarefas_atribuidas']} tarefas atribuídas")
+        print("Etapas: " + ", ".join(f"{nome} {tempo:.2f}s" for nome, tempo in resultado["tempos"].items()))
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    main()
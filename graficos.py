@@ -1,5 +1,6 @@
 from matplotlib import pyplot as plt
 import numpy as np
+import pandas as pd
 
 def prioridade_x_esforco(peso_prioridade=1, peso_esforco=1, esforco_maximo_geral=2000):
   # Solução A: Score de prioridade = 500, esforco máximo = 2000
@@ -124,11 +125,32 @@ def campo_de_decisao():
   plt.axis('equal') # Garante que a proporção visual esteja correta
   plt.show()
 
+def fronteira_de_decisao(caminho="./data/cenarios_pesos.csv"):
+  # Pontos reais calculados por cenarios.py (um por combinação de pesos)
+  tabela = pd.read_csv(caminho, sep=";", encoding="utf-8").dropna(subset=['score_prioridade'])
+  pareto = tabela[tabela['pareto']].sort_values('esforco_atribuido')
+
+  plt.figure(figsize=(12, 8))
+  plt.scatter(tabela['esforco_atribuido'], tabela['score_prioridade'], c='gray', s=60, label='Cenários')
+  plt.plot(pareto['esforco_atribuido'], pareto['score_prioridade'], 'o-', color='magenta', markersize=10, label='Fronteira de Pareto')
+
+  for _, linha in pareto.iterrows():
+    plt.annotate(f"{linha['peso_prioridade']}/{linha['peso_esforco']}", (linha['esforco_atribuido'], linha['score_prioridade']),
+                 textcoords='offset points', xytext=(8, 8), fontsize=10)
+
+  plt.title('Gráfico: Fronteira de Decisão (Prioridade vs. Esforço)', fontsize=16)
+  plt.xlabel('Esforço Total Atribuído', fontsize=12)
+  plt.ylabel('Score Total de Prioridade', fontsize=12)
+  plt.legend()
+  plt.grid(True, linestyle='--', alpha=0.3)
+  plt.show()
+
 def main():
   # prioridade_x_esforco()
   # esforco_x_balanceamento()
   # representacao_grafica()
   campo_de_decisao()
+  # fronteira_de_decisao()
 
 if __name__ == "__main__":
   main()
\ No newline at end of file
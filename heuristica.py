@@ -0,0 +1,324 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from carregamento import RecursosColunares, TarefasColunares
+from modelagem import (
+    OBJETIVO_ESFORCO_MAXIMO,
+    OBJETIVO_PRIORIDADE_MAXIMA,
+    PESO_MAXIMIZACAO,
+    PESOS_PADRAO,
+    maior_prioridade,
+)
+
+
+@dataclass
+class ResultadoHeuristica:
+    """
+    Atribuição encontrada pela heurística, no mesmo formato de
+    `ModeloAlocacao.atribuicao`, e o valor que o objetivo do CP-SAT teria nela.
+    """
+
+    atribuicao: np.ndarray
+    objetivo: int
+    objetivo_guloso: int
+    movimentos: int
+    tempo: float
+
+    def resumo(self) -> str:
+        return (
+            f"Heurística: objetivo {self.objetivo} (guloso {self.objetivo_guloso}), "
+            f"{int((self.atribuicao >= 0).sum())} tarefas atribuídas, "
+            f"{self.movimentos} movimentos de busca local, {self.tempo:.3f}s"
+        )
+
+
+def valor_tarefas(
+    tarefas: TarefasColunares,
+    objetivo=OBJETIVO_ESFORCO_MAXIMO,
+    pesos: Optional[Dict[str, int]] = None,
+    max_prioridade: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Quanto cada tarefa soma ao objetivo do CP-SAT quando é atribuída.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        objetivo (str, optional): Objetivo de `modelagem.construir_modelo`.
+        pesos (dict, optional): Pesos do objetivo de prioridade máxima. Defaults to PESOS_PADRAO.
+        max_prioridade (int, optional): Maior prioridade usada no score. Defaults to a das tarefas.
+
+    Returns:
+        np.ndarray: O valor de cada tarefa.
+    """
+    if objetivo == OBJETIVO_ESFORCO_MAXIMO:
+        return tarefas.esforco.astype(np.int64) * PESO_MAXIMIZACAO
+    if objetivo != OBJETIVO_PRIORIDADE_MAXIMA:
+        raise ValueError(f"Objetivo desconhecido: {objetivo}")
+    pesos = PESOS_PADRAO if pesos is None else pesos
+    if max_prioridade is None:
+        max_prioridade = maior_prioridade(tarefas)
+    score = max_prioridade + 1 - tarefas.prioridade.astype(np.int64)
+    return score * pesos["prioridade"] + tarefas.esforco.astype(np.int64) * pesos["esforco"]
+
+
+def valor_objetivo(
+    atribuicao, tarefas, recursos, objetivo=OBJETIVO_ESFORCO_MAXIMO, pesos=None, max_prioridade=None
+) -> int:
+    """Valor do objetivo do CP-SAT para uma atribuição por tarefa."""
+    atribuicao = np.asarray(atribuicao)
+    atribuidas = atribuicao >= 0
+    valor = int(valor_tarefas(tarefas, objetivo, pesos, max_prioridade)[atribuidas].sum())
+    if objetivo == OBJETIVO_ESFORCO_MAXIMO and len(recursos):
+        carga = np.bincount(
+            atribuicao[atribuidas], weights=tarefas.esforco[atribuidas], minlength=len(recursos)
+        )
+        valor -= int(carga.max() - carga.min())
+    return valor
+
+
+def _elegiveis_por_assinatura(tarefas: TarefasColunares, recursos: RecursosColunares):
+    """Recursos elegíveis de cada assinatura (máscara distinta) e a assinatura de cada tarefa."""
+    assinaturas, assinatura_tarefa = np.unique(tarefas.mascara, return_inverse=True)
+    elegiveis = [np.flatnonzero((a & ~recursos.mascara) == 0) for a in assinaturas.tolist()]
+    return elegiveis, assinatura_tarefa.reshape(-1)
+
+
+def alocacao_gulosa(
+    tarefas: TarefasColunares, recursos: RecursosColunares, valor, elegiveis, assinatura
+) -> np.ndarray:
+    """
+    Best-fit em ordem de valor: cada tarefa vai para o recurso elegível que
+    fica com a menor folga depois de recebê-la.
+
+    Returns:
+        np.ndarray: Para cada tarefa, o índice do recurso atribuído ou -1.
+    """
+    atribuicao = np.full(len(tarefas), -1, dtype=np.int64)
+    livre = np.maximum(recursos.disponibilidade.astype(np.int64), 0)
+    esforco = tarefas.esforco.tolist()
+    # Maior valor primeiro; no empate, a tarefa de maior prioridade (menor número)
+    ordem = np.lexsort((tarefas.prioridade, -valor))
+    sem_folga = np.iinfo(np.int64).max
+    # Limite superior da maior folga entre os elegíveis de cada assinatura (a folga só diminui)
+    teto = [int(livre[e].max()) if len(e) else -1 for e in elegiveis]
+
+    for t in ordem.tolist():
+        a = assinatura[t]
+        if esforco[t] > teto[a]:
+            continue
+        candidatos = elegiveis[a]
+        folga = livre[candidatos] - esforco[t]
+        if folga.max() < 0:
+            teto[a] = int(folga.max()) + esforco[t]
+            continue
+        r = candidatos[np.argmin(np.where(folga >= 0, folga, sem_folga))]
+        atribuicao[t] = r
+        livre[r] -= esforco[t]
+    return atribuicao
+
+
+class _BuscaLocal:
+    """Estado da busca local: carga livre e tarefas de cada recurso."""
+
+    def __init__(self, atribuicao, tarefas, recursos, valor, elegiveis, assinatura):
+        self.atribuicao = atribuicao
+        self.esforco = tarefas.esforco.tolist()
+        self.valor = valor.tolist()
+        self.elegiveis = [e.tolist() for e in elegiveis]
+        self.assinatura = assinatura.tolist()
+        self.disponibilidade = np.maximum(recursos.disponibilidade, 0).tolist()
+        self.tarefas_recurso: List[set] = [set() for _ in range(len(recursos))]
+        for t, r in enumerate(atribuicao.tolist()):
+            if r >= 0:
+                self.tarefas_recurso[r].add(t)
+        self.livre = [
+            d - sum(self.esforco[t] for t in ts) for d, ts in zip(self.disponibilidade, self.tarefas_recurso)
+        ]
+        # Menor valor entre as tarefas de cada recurso (None: recalcular)
+        self._menor_valor: List[Optional[int]] = [None] * len(recursos)
+        self.movimentos = 0
+
+    def menor_valor(self, r) -> int:
+        if self._menor_valor[r] is None:
+            self._menor_valor[r] = min((self.valor[u] for u in self.tarefas_recurso[r]), default=0)
+        return self._menor_valor[r]
+
+    def mover(self, t, r):
+        anterior = self.atribuicao[t]
+        for alterado in (anterior, r):
+            if alterado >= 0:
+                self._menor_valor[alterado] = None
+        if anterior >= 0:
+            self.tarefas_recurso[anterior].discard(t)
+            self.livre[anterior] += self.esforco[t]
+        if r >= 0:
+            self.tarefas_recurso[r].add(t)
+            self.livre[r] -= self.esforco[t]
+        self.atribuicao[t] = r
+        self.movimentos += 1
+
+    def destino(self, u, excluir, cache=None):
+        """
+        Recurso elegível (exceto `excluir`) com folga para `u`, preferindo a menor folga.
+        O `cache` guarda a resposta por (assinatura, esforço, excluído) enquanto nada se move.
+        """
+        if cache is not None:
+            chave = (self.assinatura[u], self.esforco[u], excluir)
+            if chave not in cache:
+                cache[chave] = self.destino(u, excluir)
+            return cache[chave]
+        melhor, menor_folga = -1, None
+        for r in self.elegiveis[self.assinatura[u]]:
+            folga = self.livre[r] - self.esforco[u]
+            if r != excluir and folga >= 0 and (menor_folga is None or folga < menor_folga):
+                melhor, menor_folga = r, folga
+        return melhor
+
+    def inserir(self, t) -> bool:
+        """
+        Tenta atribuir a tarefa `t`, ainda sem recurso:
+
+        1. direto, em um recurso com folga;
+        2. realocando uma tarefa do recurso para outro com folga;
+        3. trocando por tarefas de menor valor, que ficam sem recurso.
+        """
+        esforco = self.esforco[t]
+        candidatos = self.elegiveis[self.assinatura[t]]
+        direto = self.destino(t, -1)
+        if direto >= 0:
+            self.mover(t, direto)
+            return True
+
+        maior_livre = max(self.livre)
+        cache = {}
+        for r in candidatos:
+            falta = esforco - self.livre[r]
+            if falta > min(self.disponibilidade[r], maior_livre):
+                continue
+            for u in self.tarefas_recurso[r]:
+                if not falta <= self.esforco[u] <= maior_livre:
+                    continue
+                r2 = self.destino(u, r, cache)
+                if r2 >= 0:
+                    self.mover(u, r2)
+                    self.mover(t, r)
+                    return True
+
+        melhor = None
+        for r in candidatos:
+            falta = esforco - self.livre[r]
+            if falta > self.disponibilidade[r] or self.menor_valor(r) >= self.valor[t]:
+                continue
+            # Retira as tarefas de menor valor até caber
+            retiradas, liberado, perda = [], 0, 0
+            for u in sorted(self.tarefas_recurso[r], key=self.valor.__getitem__):
+                if liberado >= falta or perda + self.valor[u] >= self.valor[t]:
+                    break
+                retiradas.append(u)
+                liberado += self.esforco[u]
+                perda += self.valor[u]
+            if liberado >= falta and perda < self.valor[t] and (melhor is None or perda < melhor[0]):
+                melhor = (perda, r, retiradas)
+        if melhor is None:
+            return False
+        _, r, retiradas = melhor
+        for u in retiradas:
+            self.mover(u, -1)
+        self.mover(t, r)
+        return True
+
+    def balancear(self, fim):
+        """Move tarefas do recurso mais carregado para o menos carregado enquanto a diferença cair."""
+        carga = [d - l for d, l in zip(self.disponibilidade, self.livre)]
+        while time.perf_counter() < fim:
+            r_max = max(range(len(carga)), key=carga.__getitem__)
+            r_min = min(range(len(carga)), key=carga.__getitem__)
+            diferenca = carga[r_max] - carga[r_min]
+            escolhida = None
+            for u in self.tarefas_recurso[r_max]:
+                e = self.esforco[u]
+                if e < diferenca and e <= self.livre[r_min] and r_min in self.elegiveis[self.assinatura[u]]:
+                    # A melhor transferência leva a carga das duas o mais perto possível da média
+                    if escolhida is None or abs(diferenca - 2 * e) < abs(diferenca - 2 * self.esforco[escolhida]):
+                        escolhida = u
+            if escolhida is None:
+                return
+            self.mover(escolhida, r_min)
+            carga[r_max] -= self.esforco[escolhida]
+            carga[r_min] += self.esforco[escolhida]
+
+
+def resolver_heuristica(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    objetivo=OBJETIVO_ESFORCO_MAXIMO,
+    pesos: Optional[Dict[str, int]] = None,
+    tempo_limite=1.0,
+    max_prioridade: Optional[int] = None,
+    inicial=None,
+) -> ResultadoHeuristica:
+    """
+    Heurística construtiva com busca local, sem CP-SAT.
+
+    O best-fit guloso termina sempre; a busca local melhora a atribuição até
+    não encontrar movimentos ou até esgotar `tempo_limite`. O resultado respeita
+    todas as restrições do modelo e serve como dica inicial para o solver ou
+    como resposta quando o solver não encontra solução.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        objetivo (str, optional): Objetivo de `modelagem.construir_modelo`. Defaults to OBJETIVO_ESFORCO_MAXIMO.
+        pesos (dict, optional): Pesos do objetivo de prioridade máxima. Defaults to PESOS_PADRAO.
+        tempo_limite (float, optional): Tempo máximo em segundos da busca local. Defaults to 1.0.
+        max_prioridade (int, optional): Maior prioridade usada no score. Defaults to a das tarefas.
+        inicial (np.ndarray, optional): Atribuição viável (parcial) usada no lugar do best-fit
+            guloso, como o arredondamento de `relaxacao`. Defaults to None.
+
+    Returns:
+        ResultadoHeuristica: A atribuição e o valor do objetivo correspondente.
+    """
+    inicio = time.perf_counter()
+    fim = inicio + tempo_limite
+    valor = valor_tarefas(tarefas, objetivo, pesos, max_prioridade)
+    elegiveis, assinatura = _elegiveis_por_assinatura(tarefas, recursos)
+
+    if inicial is None:
+        atribuicao = alocacao_gulosa(tarefas, recursos, valor, elegiveis, assinatura)
+    else:
+        atribuicao = np.array(inicial, dtype=np.int64)
+    objetivo_guloso = valor_objetivo(atribuicao, tarefas, recursos, objetivo, pesos, max_prioridade)
+
+    busca = _BuscaLocal(atribuicao, tarefas, recursos, valor, elegiveis, assinatura)
+    melhorou = True
+    while melhorou and time.perf_counter() < fim:
+        melhorou = False
+        # Se uma tarefa não coube, as seguintes da mesma assinatura (de valor menor ou igual)
+        # com esforço maior ou igual também não cabem, até algo mudar
+        falha = {}
+        pendentes = np.flatnonzero(atribuicao < 0)
+        for t in pendentes[np.lexsort((tarefas.prioridade[pendentes], -valor[pendentes]))].tolist():
+            if time.perf_counter() >= fim:
+                break
+            a, e = busca.assinatura[t], busca.esforco[t]
+            if atribuicao[t] >= 0 or e >= falha.get(a, e + 1):
+                continue
+            if busca.inserir(t):
+                melhorou = True
+                falha.clear()
+            else:
+                falha[a] = e
+
+    if objetivo == OBJETIVO_ESFORCO_MAXIMO:
+        busca.balancear(fim)
+
+    return ResultadoHeuristica(
+        atribuicao,
+        valor_objetivo(atribuicao, tarefas, recursos, objetivo, pesos, max_prioridade),
+        objetivo_guloso,
+        busca.movimentos,
+        time.perf_counter() - inicio,
+    )
@@ -0,0 +1,175 @@
+import time
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from carregamento import RecursosColunares, TarefasColunares
+from configuracao_solver import ConfiguracaoSolver, criar_solver
+from heuristica import resolver_heuristica
+from modelagem import OBJETIVO_PRIORIDADE_MAXIMA, construir_modelo, maior_prioridade
+from partida_quente import aplicar_dicas
+
+TAMANHO_FAIXA_PADRAO = 2000
+
+
+@dataclass
+class ResultadoFaixa:
+    prioridades: Tuple[int, int]
+    num_tarefas: int
+    num_recursos: int
+    status: int
+    objetivo: Optional[float]
+    atribuidas: int
+    orcamento: float
+    tempo: float
+
+
+@dataclass
+class ResultadoHorizonte:
+    """
+    Resultado da solução por faixas de prioridade.
+
+    `atribuicao` usa os índices globais de tarefas e recursos, no mesmo
+    formato de `ModeloAlocacao.atribuicao`.
+    """
+
+    atribuicao: np.ndarray
+    status: int
+    faixas: List[ResultadoFaixa] = field(default_factory=list)
+    tempo: float = 0.0
+
+    def resumo(self) -> str:
+        linhas = [
+            f"Horizonte rolante: {len(self.faixas)} faixas | Status: {cp_model.CpSolverStatus(self.status).name} | "
+            f"{int((self.atribuicao >= 0).sum())} tarefas atribuídas | {self.tempo:.2f}s"
+        ]
+        for i, faixa in enumerate(self.faixas):
+            linhas.append(
+                f"  faixa {i} (prioridades {faixa.prioridades[0]}-{faixa.prioridades[1]}): "
+                f"{faixa.num_tarefas} tarefas, {faixa.num_recursos} recursos, "
+                f"{cp_model.CpSolverStatus(faixa.status).name}, {faixa.atribuidas} atribuídas, "
+                f"{faixa.tempo:.2f}s de {faixa.orcamento:.2f}s"
+            )
+        return "\n".join(linhas)
+
+
+def faixas_de_prioridade(tarefas: TarefasColunares, tamanho_faixa=TAMANHO_FAIXA_PADRAO) -> List[np.ndarray]:
+    """
+    Divide as tarefas em faixas consecutivas de prioridade com cerca de
+    `tamanho_faixa` tarefas. Tarefas de mesma prioridade ficam na mesma faixa.
+
+    Returns:
+        List[np.ndarray]: Índices das tarefas de cada faixa, da mais prioritária à menos.
+    """
+    ordem = np.argsort(tarefas.prioridade, kind="stable")
+    prioridades = tarefas.prioridade[ordem]
+    faixas = []
+    inicio = 0
+    while inicio < len(ordem):
+        fim = min(inicio + tamanho_faixa, len(ordem))
+        # Estende a faixa até o fim do empate na última prioridade
+        fim = int(np.searchsorted(prioridades, prioridades[fim - 1], side="right"))
+        faixas.append(ordem[inicio:fim])
+        inicio = fim
+    return faixas
+
+
+def resolver_horizonte(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    objetivo=OBJETIVO_PRIORIDADE_MAXIMA,
+    pesos=None,
+    tempo_limite=30.0,
+    tamanho_faixa=TAMANHO_FAIXA_PADRAO,
+    configuracao: Optional[ConfiguracaoSolver] = None,
+    tempo_heuristica=0.0,
+    **opcoes,
+) -> ResultadoHorizonte:
+    """
+    Resolve as faixas de prioridade em sequência (horizonte rolante).
+
+    Cada faixa é um modelo pequeno com a disponibilidade que as faixas
+    anteriores deixaram; as atribuições de uma faixa são definitivas e o
+    esforço delas é descontado dos recursos antes da faixa seguinte.
+    Recursos sem folga para a menor tarefa da faixa ficam fora do modelo.
+
+    A solução não é ótima para o problema completo: uma tarefa de prioridade
+    alta nunca cede lugar a várias de prioridade mais baixa, e no objetivo de
+    esforço máximo o balanceamento é feito faixa a faixa.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        objetivo (str, optional): Objetivo de `modelagem.construir_modelo`.
+        pesos (dict, optional): Pesos do objetivo de prioridade máxima.
+        tempo_limite (float, optional): Tempo total, dividido entre as faixas; o que
+            uma faixa não usa passa para as seguintes. Defaults to 30.0.
+        tamanho_faixa (int, optional): Tarefas por faixa. Defaults to TAMANHO_FAIXA_PADRAO.
+        configuracao (ConfiguracaoSolver, optional): Parâmetros do solver de cada faixa.
+        tempo_heuristica (float, optional): Tempo da heurística usada como dica e como
+            reserva em cada faixa (0 desativa). Defaults to 0.0.
+        **opcoes: Repassadas a `modelagem.construir_modelo` (agregado, simetria, enxuto).
+
+    Returns:
+        ResultadoHorizonte: A atribuição global e o resultado de cada faixa.
+    """
+    inicio = time.perf_counter()
+    if objetivo == OBJETIVO_PRIORIDADE_MAXIMA:
+        # O score de cada faixa precisa usar a mesma escala do problema completo
+        opcoes.setdefault("max_prioridade", maior_prioridade(tarefas))
+
+    faixas = faixas_de_prioridade(tarefas, tamanho_faixa)
+    disponivel = recursos.disponibilidade.astype(np.int64)
+    atribuicao = np.full(len(tarefas), -1, dtype=np.int64)
+    resultados = []
+
+    for i, indices in enumerate(faixas):
+        restante = max(tempo_limite - (time.perf_counter() - inicio), 0.0)
+        orcamento = restante / (len(faixas) - i)
+        faixa = tarefas.selecionar(indices)
+        prioridades = (int(faixa.prioridade.min()), int(faixa.prioridade.max()))
+
+        ativos = np.flatnonzero(disponivel >= faixa.esforco.min())
+        if not len(ativos):
+            resultados.append(ResultadoFaixa(prioridades, len(faixa), 0, cp_model.OPTIMAL, None, 0, orcamento, 0.0))
+            continue
+        recursos_faixa = replace(recursos.selecionar(ativos), disponibilidade=disponivel[ativos])
+
+        alocacao = construir_modelo(faixa, recursos_faixa, objetivo, pesos, **opcoes)
+        semente = None
+        if tempo_heuristica:
+            semente = resolver_heuristica(
+                faixa, recursos_faixa, objetivo, pesos, tempo_heuristica, opcoes.get("max_prioridade")
+            )
+            aplicar_dicas(alocacao, semente.atribuicao)
+        solver = criar_solver(orcamento, configuracao)
+        status = solver.Solve(alocacao.modelo)
+
+        valor = None
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            local = alocacao.atribuicao(solver)
+            valor = solver.ObjectiveValue()
+        elif semente is not None:
+            local = semente.atribuicao
+        else:
+            local = np.full(len(faixa), -1, dtype=np.int64)
+
+        # Atribuições definitivas: o esforço sai da disponibilidade das próximas faixas
+        atribuidas = local >= 0
+        globais = ativos[local[atribuidas]]
+        atribuicao[indices[atribuidas]] = globais
+        disponivel -= np.bincount(globais, weights=faixa.esforco[atribuidas], minlength=len(recursos)).astype(
+            np.int64
+        )
+        resultados.append(
+            ResultadoFaixa(
+                prioridades, len(faixa), len(ativos), status, valor, int(atribuidas.sum()), orcamento, solver.WallTime()
+            )
+        )
+
+    # Deixar tarefas sem recurso é sempre viável; a sequência de faixas não prova otimalidade
+    resolvidas = [r.status in (cp_model.OPTIMAL, cp_model.FEASIBLE) for r in resultados]
+    status = cp_model.FEASIBLE if any(resolvidas) or (atribuicao >= 0).any() else cp_model.UNKNOWN
+    return ResultadoHorizonte(atribuicao, status, resultados, time.perf_counter() - inicio)
@@ -0,0 +1,350 @@
+import argparse
+import datetime
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from ortools.sat.python import cp_model
+
+from modelagem import gap_relativo
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Gaps relativos do resumo de tempo até o gap
+LIMIARES_GAP = (0.1, 0.05, 0.01, 0.0)
+# Intervalo, em segundos, entre as amostras do limite durante a busca
+INTERVALO_LIMITE = 1.0
+
+
+class RegistroSolucoes(cp_model.CpSolverSolutionCallback):
+    """
+    Callback que registra o instante e o valor do objetivo de cada solução
+    encontrada pelo solver.
+
+    `ao_melhorar`, se informado, é chamado com o próprio callback a cada
+    solução, enquanto os valores dela ainda podem ser lidos (`Value`).
+    """
+
+    def __init__(self, ao_melhorar: Optional[Callable[["RegistroSolucoes"], None]] = None):
+        super().__init__()
+        self.inicio = time.perf_counter()
+        self.solucoes: List[Tuple[float, float]] = []
+        self.ao_melhorar = ao_melhorar
+
+    def on_solution_callback(self):
+        self.solucoes.append((time.perf_counter() - self.inicio, self.ObjectiveValue()))
+        if self.ao_melhorar is not None:
+            self.ao_melhorar(self)
+
+    def primeira_solucao(self) -> Optional[Tuple[float, float]]:
+        """(tempo, objetivo) da primeira solução, ou None."""
+        return self.solucoes[0] if self.solucoes else None
+
+    def melhor_solucao(self) -> Optional[Tuple[float, float]]:
+        """(tempo, objetivo) da última solução (a melhor encontrada), ou None."""
+        return self.solucoes[-1] if self.solucoes else None
+
+    def resumo(self) -> str:
+        if not self.solucoes:
+            return "Nenhuma solução encontrada."
+        (t0, v0), (t1, v1) = self.solucoes[0], self.solucoes[-1]
+        return (
+            f"Primeira solução em {t0:.2f}s (objetivo {v0}); "
+            f"melhor solução em {t1:.2f}s (objetivo {v1}); {len(self.solucoes)} soluções"
+        )
+
+
+def memoria_pico_mb() -> Optional[float]:
+    """Pico de memória residente do processo (MB), ou None fora de sistemas Unix."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    return pico / 1024**2 if sys.platform == "darwin" else pico / 1024
+
+
+class Instrumentacao:
+    """
+    Registro estruturado das fases de uma execução.
+
+    Cada fase medida (`fase` ou o decorador `medir`) grava tempo de parede,
+    tempo de CPU e pico de memória; `registrar_modelo` grava o tamanho do
+    modelo e `TelemetriaSolver` as soluções do solver. Com um `caminho`,
+    cada registro é também acrescentado como uma linha JSON ao arquivo,
+    identificado pelo início da `execucao`.
+
+    Enquanto não for ativada, as fases apenas executam, sem medição.
+    """
+
+    def __init__(self, caminho=None, ativa=True):
+        self.ativa = False
+        self.caminho = caminho
+        self.execucao = None
+        self.inicio = time.perf_counter()
+        self.registros: List[dict] = []
+        if ativa:
+            self.ativar(caminho)
+
+    def ativar(self, caminho=None):
+        self.ativa = True
+        self.caminho = caminho
+        self.execucao = datetime.datetime.now().isoformat(timespec="milliseconds")
+        self.inicio = time.perf_counter()
+
+    def registrar(self, evento: str, **dados):
+        if not self.ativa:
+            return
+        registro = {"evento": evento, "execucao": self.execucao, **dados}
+        self.registros.append(registro)
+        if self.caminho:
+            with open(self.caminho, "a", encoding="utf-8") as arquivo:
+                arquivo.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+
+    @contextmanager
+    def fase(self, nome: str):
+        if not self.ativa:
+            yield
+            return
+        memoria_inicial = memoria_pico_mb()
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            memoria = memoria_pico_mb()
+            self.registrar(
+                "fase",
+                nome=nome,
+                tempo=round(time.perf_counter() - inicio, 4),
+                cpu=round(time.process_time() - inicio_cpu, 4),
+                memoria_pico_mb=None if memoria is None else round(memoria, 1),
+                memoria_acrescimo_mb=None if memoria is None else round(memoria - memoria_inicial, 1),
+            )
+
+    def medir(self, nome: Optional[str] = None):
+        """Decorador que mede cada chamada da função como uma fase."""
+
+        def decorador(funcao):
+            @functools.wraps(funcao)
+            def medida(*args, **kwargs):
+                with self.fase(nome or funcao.__name__):
+                    return funcao(*args, **kwargs)
+
+            return medida
+
+        return decorador
+
+    def registrar_modelo(self, alocacao):
+        """Tamanho do modelo: variáveis, restrições e pares elegíveis."""
+        if not self.ativa:
+            return
+        proto = alocacao.modelo.Proto()
+        self.registrar(
+            "modelo",
+            tarefas=len(alocacao.tarefas),
+            recursos=len(alocacao.recursos),
+            pares_elegiveis=len(alocacao.indice),
+            variaveis=len(proto.variables),
+            restricoes=len(proto.constraints),
+        )
+
+    def registrar_solver(self, solver: cp_model.CpSolver, status):
+        """Resultado final do solver (o limite final costuma ser melhor que o da última solução)."""
+        encontrou = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        self.registrar(
+            "resultado",
+            status=solver.StatusName(status),
+            tempo=round(solver.WallTime(), 4),
+            objetivo=solver.ObjectiveValue() if encontrou else None,
+            limite=solver.BestObjectiveBound() if encontrou else None,
+            gap=gap_relativo(solver) if encontrou else None,
+            ramificacoes=solver.NumBranches(),
+            conflitos=solver.NumConflicts(),
+        )
+
+    def telemetria(self, ao_melhorar=None) -> RegistroSolucoes:
+        """Callback do solver ligado a este registro (ou um RegistroSolucoes simples, se inativo)."""
+        return TelemetriaSolver(self, ao_melhorar) if self.ativa else RegistroSolucoes(ao_melhorar)
+
+    def amostrar_limite(self, solver: cp_model.CpSolver, registro: RegistroSolucoes, intervalo=INTERVALO_LIMITE):
+        """
+        Amostras do limite durante a busca (ver `AmostragemLimite`), no tempo do `registro`;
+        sem efeito se inativa.
+
+        Uso:
+            with medicao.amostrar_limite(solver, registro):
+                status = solver.Solve(modelo, registro)
+        """
+        if not self.ativa:
+            return nullcontext()
+        return AmostragemLimite(self, solver, registro.inicio, intervalo)
+
+    def resumo(self) -> str:
+        fases = [r for r in self.registros if r["evento"] == "fase"]
+        if not fases:
+            return "Nenhuma fase registrada."
+        linhas = [f"Fases ({time.perf_counter() - self.inicio:.2f}s no total):"]
+        for r in fases:
+            memoria = "" if r["memoria_pico_mb"] is None else f", pico {r['memoria_pico_mb']:.0f} MB"
+            linhas.append(f"  {r['nome']}: {r['tempo']:.3f}s (CPU {r['cpu']:.3f}s){memoria}")
+        for r in self.registros:
+            if r["evento"] == "modelo":
+                linhas.append(
+                    f"  modelo: {r['variaveis']} variáveis, {r['restricoes']} restrições, "
+                    f"{r['pares_elegiveis']} pares elegíveis"
+                )
+        tempos = tempos_ate_gap(self.registros)
+        if any(tempo is not None for tempo in tempos.values()):
+            linhas.append(
+                "  tempo até o gap: "
+                + ", ".join(f"{limiar:.0%} " + ("-" if t is None else f"{t:.2f}s") for limiar, t in tempos.items())
+            )
+        return "\n".join(linhas)
+
+
+class TelemetriaSolver(RegistroSolucoes):
+    """
+    Callback que, além do RegistroSolucoes, grava objetivo, limite e gap de
+    cada solução no registro de uma Instrumentacao (e no seu arquivo JSON-lines).
+    """
+
+    def __init__(self, instrumentacao: Instrumentacao, ao_melhorar=None):
+        super().__init__(ao_melhorar)
+        self.instrumentacao = instrumentacao
+
+    def on_solution_callback(self):
+        tempo, objetivo = time.perf_counter() - self.inicio, self.ObjectiveValue()
+        self.instrumentacao.registrar(
+            "solucao",
+            tempo=round(tempo, 4),
+            objetivo=objetivo,
+            limite=self.BestObjectiveBound(),
+            gap=gap_relativo(self),
+        )
+        super().on_solution_callback()
+
+
+class AmostragemLimite:
+    """
+    Registra o limite do objetivo durante a busca, inclusive quando nenhuma
+    solução nova aparece (na prova de otimalidade, por exemplo).
+
+    O solver informa cada melhora do limite pelo `best_bound_callback`; uma
+    thread grava o valor mais recente a cada `intervalo` segundos, se ele mudou,
+    como eventos "limite". O último valor é gravado ao final da busca.
+    """
+
+    def __init__(self, instrumentacao: Instrumentacao, solver: cp_model.CpSolver, inicio: float, intervalo=INTERVALO_LIMITE):
+        self.instrumentacao = instrumentacao
+        self.solver = solver
+        self.inicio = inicio
+        self.intervalo = intervalo
+        self._limite = self._gravado = None
+        self._encerrar = threading.Event()
+        self._thread = None
+
+    def _novo_limite(self, limite: float):
+        self._limite = limite
+
+    def _gravar(self):
+        limite = self._limite
+        if limite is not None and limite != self._gravado:
+            self._gravado = limite
+            self.instrumentacao.registrar("limite", tempo=round(time.perf_counter() - self.inicio, 4), limite=limite)
+
+    def _amostrar(self):
+        while not self._encerrar.wait(self.intervalo):
+            self._gravar()
+
+    def __enter__(self):
+        self.solver.best_bound_callback = self._novo_limite
+        self._thread = threading.Thread(target=self._amostrar, name="amostragem-limite", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *excecao):
+        self._encerrar.set()
+        self._thread.join()
+        self.solver.best_bound_callback = None
+        self._gravar()
+        return False
+
+
+def tempos_ate_gap(registros: Sequence[dict], limiares=LIMIARES_GAP) -> Dict[float, Optional[float]]:
+    """
+    Instante em que o gap ficou abaixo de cada limiar, nos registros de uma
+    execução: o objetivo vem das soluções e o limite, das soluções e das
+    amostras de `AmostragemLimite`.
+
+    Returns:
+        dict: limiar -> tempo em segundos, ou None se não alcançado.
+    """
+    eventos = sorted((r for r in registros if r["evento"] in ("solucao", "limite")), key=lambda r: r["tempo"])
+    alcancados: Dict[float, Optional[float]] = dict.fromkeys(limiares)
+    objetivo = limite = None
+    for registro in eventos:
+        if registro["evento"] == "solucao":
+            objetivo = registro["objetivo"]
+        if registro.get("limite") is not None:
+            limite = registro["limite"]
+        if objetivo is None or limite is None:
+            continue
+        gap = abs(limite - objetivo) / max(1.0, abs(objetivo))
+        for limiar in limiares:
+            if alcancados[limiar] is None and gap <= limiar:
+                alcancados[limiar] = registro["tempo"]
+    return alcancados
+
+
+def tempo_ate_gap(caminho, limiares=LIMIARES_GAP) -> pd.DataFrame:
+    """
+    Lê um arquivo de telemetria e calcula, para cada execução, o instante em
+    que o gap ficou abaixo de cada limiar (ver `tempos_ate_gap`). Base para
+    escolher o TEMPO_LIMITE a partir dos dados.
+
+    Args:
+        caminho (str): Arquivo JSON-lines gravado pela Instrumentacao.
+        limiares (Sequence[float], optional): Gaps relativos de interesse. Defaults to LIMIARES_GAP.
+
+    Returns:
+        pd.DataFrame: Uma linha por execução e uma coluna por limiar (NaN se não alcançado).
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        registros = [json.loads(linha) for linha in arquivo if linha.strip()]
+    execucoes: Dict[str, List[dict]] = {}
+    for registro in registros:
+        execucoes.setdefault(registro["execucao"], []).append(registro)
+
+    linhas = []
+    for execucao, grupo in execucoes.items():
+        tempos = tempos_ate_gap(grupo, limiares)
+        if all(tempo is None for tempo in tempos.values()) and not any(r["evento"] == "solucao" for r in grupo):
+            continue
+        linhas.append(
+            {"execucao": execucao, **{f"gap_{l:g}": np.nan if t is None else t for l, t in tempos.items()}}
+        )
+    return pd.DataFrame(linhas, columns=["execucao", *(f"gap_{l:g}" for l in limiares)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo até cada gap nas execuções de um arquivo de telemetria.")
+    parser.add_argument("caminho", nargs="?", default=os.getenv("CAMINHO_TELEMETRIA", "./data/telemetria.jsonl"))
+    args = parser.parse_args()
+    tabela = tempo_ate_gap(args.caminho)
+    print(tabela.to_string(index=False) if len(tabela) else f"Nenhuma solução registrada em '{args.caminho}'.")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    main()
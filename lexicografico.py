@@ -0,0 +1,166 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from configuracao_solver import ConfiguracaoSolver, criar_solver
+from modelagem import ModeloAlocacao, criar_cargas
+from parada_antecipada import VigiaEstagnacao
+from partida_quente import aplicar_dicas
+
+ETAPA_PRIORIDADE = "prioridade"
+ETAPA_ESFORCO = "esforco"
+ETAPA_BALANCEAMENTO = "balanceamento"
+
+ETAPAS_PADRAO = (ETAPA_PRIORIDADE, ETAPA_ESFORCO, ETAPA_BALANCEAMENTO)
+
+# Fração do tempo total de cada etapa, normalizada entre as etapas escolhidas
+FRACOES_PADRAO = {ETAPA_PRIORIDADE: 0.5, ETAPA_ESFORCO: 0.3, ETAPA_BALANCEAMENTO: 0.2}
+
+
+@dataclass
+class ResultadoEtapa:
+    nome: str
+    status: int
+    valor: Optional[float]
+    limite: Optional[float]
+    orcamento: float
+    tempo: float
+
+
+@dataclass
+class ResultadoLexicografico:
+    """
+    Resultado da solução em etapas.
+
+    `atribuicao` é a da última etapa com solução (None se nenhuma encontrou),
+    no mesmo formato de `ModeloAlocacao.atribuicao`.
+    """
+
+    atribuicao: Optional[np.ndarray]
+    status: int
+    etapas: List[ResultadoEtapa] = field(default_factory=list)
+    tempo: float = 0.0
+
+    def resumo(self) -> str:
+        linhas = [f"Solução lexicográfica: {cp_model.CpSolverStatus(self.status).name} | {self.tempo:.2f}s"]
+        for etapa in self.etapas:
+            linhas.append(
+                f"  {etapa.nome}: {cp_model.CpSolverStatus(etapa.status).name}, valor {etapa.valor}, "
+                f"limite {etapa.limite}, {etapa.tempo:.2f}s de {etapa.orcamento:.2f}s"
+            )
+        return "\n".join(linhas)
+
+
+def _objetivos_das_etapas(alocacao: ModeloAlocacao, etapas, max_prioridade=None) -> Dict[str, tuple]:
+    """(expressão, maximizar) de cada etapa."""
+    objetivos = {}
+    for nome in etapas:
+        if nome == ETAPA_PRIORIDADE:
+            objetivos[nome] = (alocacao.expressao_prioridade(max_prioridade), True)
+        elif nome == ETAPA_ESFORCO:
+            objetivos[nome] = (alocacao.expressao_esforco(), True)
+        elif nome == ETAPA_BALANCEAMENTO:
+            objetivos[nome] = (criar_cargas(alocacao), False)
+        else:
+            raise ValueError(f"Etapa desconhecida: {nome}")
+    return objetivos
+
+
+def resolver_lexicografico(
+    alocacao: ModeloAlocacao,
+    tempo_limite=30.0,
+    etapas: Sequence[str] = ETAPAS_PADRAO,
+    tolerancia=0.0,
+    fracoes: Optional[Dict[str, float]] = None,
+    atribuicao_inicial=None,
+    max_prioridade: Optional[int] = None,
+    callback: Optional[cp_model.CpSolverSolutionCallback] = None,
+    configuracao: Optional[ConfiguracaoSolver] = None,
+    estagnacao: Optional[float] = None,
+) -> ResultadoLexicografico:
+    """
+    Otimiza os objetivos em ordem de importância, em vez de somá-los com pesos.
+
+    Cada etapa otimiza um único objetivo; o valor alcançado vira uma restrição
+    (com a `tolerancia` relativa) para as etapas seguintes, e a solução da
+    etapa é a dica inicial da próxima. O tempo que uma etapa não usa passa
+    para as seguintes, de modo que o total nunca ultrapassa `tempo_limite`.
+
+    Args:
+        alocacao (ModeloAlocacao): O modelo com as restrições e sem objetivo.
+        tempo_limite (float, optional): Tempo total das etapas, em segundos. Defaults to 30.0.
+        etapas (Sequence[str], optional): Etapas em ordem de importância. Defaults to ETAPAS_PADRAO.
+        tolerancia (float, optional): Perda relativa permitida em cada etapa já
+            otimizada (0.01 = 1%). Defaults to 0.0.
+        fracoes (dict, optional): Fração do tempo de cada etapa. Defaults to FRACOES_PADRAO.
+        atribuicao_inicial (np.ndarray, optional): Dica para a primeira etapa. Defaults to None.
+        max_prioridade (int, optional): Maior prioridade usada no score. Defaults to a das tarefas.
+        callback (cp_model.CpSolverSolutionCallback, optional): Chamado a cada solução de cada etapa.
+        configuracao (ConfiguracaoSolver, optional): Parâmetros do solver de cada etapa.
+        estagnacao (float, optional): Encerra cada etapa após este tempo sem melhora do
+            objetivo; exige um `callback` RegistroSolucoes. Defaults to None.
+
+    Returns:
+        ResultadoLexicografico: A atribuição final e o resultado de cada etapa.
+    """
+    inicio = time.perf_counter()
+    fracoes = FRACOES_PADRAO if fracoes is None else fracoes
+    objetivos = _objetivos_das_etapas(alocacao, etapas, max_prioridade)
+    modelo = alocacao.modelo
+
+    atribuicao = None if atribuicao_inicial is None else np.asarray(atribuicao_inicial)
+    if atribuicao is not None:
+        aplicar_dicas(alocacao, atribuicao)
+
+    resultados = []
+    for i, nome in enumerate(etapas):
+        restante = max(tempo_limite - (time.perf_counter() - inicio), 0.0)
+        peso_restante = sum(fracoes.get(e, 1.0) for e in etapas[i:])
+        orcamento = restante * fracoes.get(nome, 1.0) / peso_restante if peso_restante else restante
+
+        expressao, maximizar = objetivos[nome]
+        if maximizar:
+            modelo.Maximize(expressao)
+        else:
+            modelo.Minimize(expressao)
+
+        solver = criar_solver(orcamento, configuracao)
+        if atribuicao is not None:
+            # Sem isso o presolve pode descartar a solução da etapa anterior usada como dica
+            solver.parameters.keep_all_feasible_solutions_in_presolve = True
+        with VigiaEstagnacao(solver, callback, estagnacao if callback is not None else None):
+            status = solver.Solve(modelo, callback)
+
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            resultados.append(ResultadoEtapa(nome, status, None, None, orcamento, solver.WallTime()))
+            if status in (cp_model.INFEASIBLE, cp_model.MODEL_INVALID):
+                break
+            continue
+
+        valor = round(solver.ObjectiveValue())
+        resultados.append(
+            ResultadoEtapa(nome, status, valor, solver.BestObjectiveBound(), orcamento, solver.WallTime())
+        )
+        atribuicao = alocacao.atribuicao(solver)
+
+        # O valor alcançado passa a ser exigido nas etapas seguintes
+        folga = int(abs(valor) * tolerancia)
+        if maximizar:
+            modelo.Add(expressao >= valor - folga)
+        else:
+            modelo.Add(expressao <= valor + folga)
+        aplicar_dicas(alocacao, atribuicao)
+
+    status_etapas = [r.status for r in resultados]
+    if not any(s in (cp_model.OPTIMAL, cp_model.FEASIBLE) for s in status_etapas):
+        atribuicao = None
+        status = cp_model.INFEASIBLE if cp_model.INFEASIBLE in status_etapas else cp_model.UNKNOWN
+    elif len(status_etapas) == len(etapas) and all(s == cp_model.OPTIMAL for s in status_etapas):
+        status = cp_model.OPTIMAL
+    else:
+        status = cp_model.FEASIBLE
+
+    return ResultadoLexicografico(atribuicao, status, resultados, time.perf_counter() - inicio)
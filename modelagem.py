@@ -0,0 +1,460 @@
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from carregamento import RecursosColunares, TarefasColunares
+from elegibilidade import IndiceElegibilidade
+
+OBJETIVO_ESFORCO_MAXIMO = "esforco_maximo"
+OBJETIVO_PRIORIDADE_MAXIMA = "prioridade_maxima"
+
+# Cada ponto de esforço vale 1000 pontos de "não-balanceamento".
+PESO_MAXIMIZACAO = 1000
+
+PESOS_PADRAO = {"prioridade": 60, "esforco": 40}
+
+# Variáveis criadas por cópia de bloco no modelo enxuto (ver `adicionar_booleanas`)
+TAMANHO_BLOCO = 1 << 16
+
+
+class VariaveisIndexadas(Sequence):
+    """
+    Variáveis consecutivas do modelo, endereçadas pelo índice no proto.
+
+    Comporta-se como a lista de variáveis do modelo padrão, mas não mantém um
+    objeto Python por variável: cada acesso cria a variável a partir do índice.
+    """
+
+    def __init__(self, modelo: cp_model.CpModel, inicio: int, quantidade: int):
+        self.modelo = modelo
+        self.inicio = inicio
+        self.quantidade = quantidade
+
+    def __len__(self):
+        return self.quantidade
+
+    def __getitem__(self, p):
+        if isinstance(p, slice):
+            return [self[i] for i in range(*p.indices(self.quantidade))]
+        if p < 0:
+            p += self.quantidade
+        if not 0 <= p < self.quantidade:
+            raise IndexError(p)
+        return self.modelo.GetIntVarFromProtoIndex(self.inicio + int(p))
+
+    def indices(self, pares=None) -> np.ndarray:
+        """Índices no proto das variáveis dos pares (todas, se None)."""
+        if pares is None:
+            return np.arange(self.inicio, self.inicio + self.quantidade, dtype=np.int64)
+        return self.inicio + np.asarray(pares, dtype=np.int64)
+
+
+def adicionar_booleanas(modelo: cp_model.CpModel, quantidade: int) -> VariaveisIndexadas:
+    """
+    Cria `quantidade` variáveis booleanas sem nome diretamente no proto.
+
+    Um bloco de uma variável é dobrado por cópia até TAMANHO_BLOCO e mesclado
+    no modelo, o que evita um objeto Python e uma chamada por variável.
+    """
+    proto = modelo.Proto()
+    inicio = len(proto.variables)
+    bloco = cp_model.CpModel().Proto()
+    bloco.variables.add().domain.extend([0, 1])
+    copia = cp_model.CpModel().Proto()
+
+    cheios, resto = divmod(quantidade, TAMANHO_BLOCO)
+    tamanho = 1
+    while tamanho < TAMANHO_BLOCO:
+        if resto & tamanho:
+            proto.merge_from(bloco)
+        copia.copy_from(bloco)
+        bloco.merge_from(copia)
+        tamanho *= 2
+    for _ in range(cheios):
+        proto.merge_from(bloco)
+    return VariaveisIndexadas(modelo, inicio, quantidade)
+
+
+def somar_no_proto(modelo: cp_model.CpModel, indices: np.ndarray, coeficientes: np.ndarray) -> cp_model.IntVar:
+    """
+    Cria uma variável igual à soma ponderada das variáveis `indices`, com a
+    restrição escrita diretamente no proto (sem montar a expressão em Python).
+    """
+    coeficientes = np.asarray(coeficientes, dtype=np.int64)
+    soma = modelo.NewIntVar(int(coeficientes[coeficientes < 0].sum()), int(coeficientes[coeficientes > 0].sum()), "")
+    linear = modelo.Proto().constraints.add().linear
+    linear.vars.extend(np.asarray(indices, dtype=np.int64).tolist())
+    linear.vars.append(soma.Index())
+    linear.coeffs.extend(coeficientes.tolist())
+    linear.coeffs.append(-1)
+    linear.domain.extend([0, 0])
+    return soma
+
+
+def valores_das_variaveis(variaveis, solver) -> np.ndarray:
+    """
+    Valores das variáveis na solução, lidos em bloco da resposta do solver (ou
+    do callback, durante a busca) e mapeados pelo índice de cada variável no proto.
+
+    Args:
+        variaveis (Sequence[cp_model.IntVar]): Lista de variáveis ou VariaveisIndexadas.
+        solver: O CpSolver após a solução, ou um CpSolverSolutionCallback.
+
+    Returns:
+        np.ndarray: O valor de cada variável, na ordem de `variaveis`.
+    """
+    resposta = getattr(solver, "response_proto", None)
+    solucao = resposta.solution if resposta is not None else []
+    if not len(solucao):
+        return np.fromiter((solver.Value(v) for v in variaveis), dtype=np.int64, count=len(variaveis))
+    if isinstance(variaveis, VariaveisIndexadas):
+        indices = variaveis.indices()
+    else:
+        indices = np.fromiter((v.Index() for v in variaveis), dtype=np.int64, count=len(variaveis))
+    return np.asarray(solucao, dtype=np.int64)[indices]
+
+
+@dataclass
+class ModeloAlocacao:
+    """
+    Modelo CP-SAT de alocação junto com o índice que liga cada variável de
+    decisão ao seu par (tarefa, recurso).
+
+    `variaveis[p]` é a variável do par elegível `p` do `indice`. No modelo
+    enxuto, `variaveis` é um VariaveisIndexadas em vez de uma lista.
+    """
+
+    modelo: cp_model.CpModel
+    tarefas: TarefasColunares
+    recursos: RecursosColunares
+    indice: IndiceElegibilidade
+    variaveis: List[cp_model.IntVar]
+    # Componentes do objetivo (expressões ou variáveis) para relatório
+    componentes: Dict[str, cp_model.LinearExprT] = field(default_factory=dict)
+    # Variáveis de carga por recurso, quando o objetivo as cria
+    cargas: List[cp_model.IntVar] = field(default_factory=list)
+    max_prioridade: Optional[int] = None
+    tempo_construcao: float = 0.0
+
+    def tarefas_da_atribuicao(self) -> TarefasColunares:
+        """Tarefas indexadas pela atribuição retornada por `atribuicao`."""
+        return self.tarefas
+
+    def total_tarefas(self) -> int:
+        """Número de tarefas representadas pelo modelo."""
+        return len(self.tarefas)
+
+    def esforco_total(self) -> int:
+        """Soma do esforço de todas as tarefas representadas pelo modelo."""
+        return int(self.tarefas.esforco.sum())
+
+    def esforco_dos_pares(self) -> np.ndarray:
+        return self.tarefas.esforco[self.indice.par_tarefa]
+
+    def soma_ponderada(self, coeficientes, pares=None) -> cp_model.LinearExprT:
+        """
+        Soma dos `coeficientes` pelas variáveis dos `pares` (todos, se None).
+        No modelo enxuto, é uma variável auxiliar definida no proto.
+        """
+        if isinstance(self.variaveis, VariaveisIndexadas):
+            return somar_no_proto(self.modelo, self.variaveis.indices(pares), coeficientes)
+        variaveis = self.variaveis if pares is None else [self.variaveis[p] for p in pares]
+        return cp_model.LinearExpr.WeightedSum(variaveis, np.asarray(coeficientes).tolist())
+
+    def expressao_esforco(self) -> cp_model.LinearExpr:
+        """Esforço total atribuído."""
+        return self.soma_ponderada(self.esforco_dos_pares())
+
+    def expressao_prioridade(self, max_prioridade=None) -> cp_model.LinearExpr:
+        """
+        Score de prioridade: uma tarefa de prioridade 1 vale mais pontos que uma
+        de prioridade 2 (`max_prioridade + 1 - prioridade`).
+        """
+        if max_prioridade is None:
+            max_prioridade = maior_prioridade(self.tarefas)
+        pesos = max_prioridade + 1 - self.tarefas.prioridade[self.indice.par_tarefa]
+        return self.soma_ponderada(pesos)
+
+    def expressao_carga(self, r) -> cp_model.LinearExpr:
+        """Carga (soma do esforço) atribuída ao recurso `r`."""
+        pares = self.indice.pares_do_recurso(r)
+        esforcos = self.tarefas.esforco[self.indice.par_tarefa[pares]]
+        return self.soma_ponderada(esforcos, pares)
+
+    def valores_da_atribuicao(self, atribuicao) -> np.ndarray:
+        """
+        Converte uma atribuição por tarefa no valor de cada variável do modelo.
+        Atribuições a pares não elegíveis são ignoradas.
+        """
+        atribuicao = np.asarray(atribuicao)
+        return (atribuicao[self.indice.par_tarefa] == self.indice.par_recurso).astype(np.int64)
+
+    def valores_auxiliares(self, atribuicao) -> List[tuple]:
+        """
+        Valores das variáveis auxiliares (cargas e componentes do objetivo)
+        correspondentes a uma atribuição por tarefa, para completar dicas ao solver.
+
+        Returns:
+            List[tuple]: Pares (variável, valor).
+        """
+        atribuicao = np.asarray(atribuicao)
+        tarefas = self.tarefas_da_atribuicao()
+        atribuidas = atribuicao >= 0
+        carga = np.bincount(
+            atribuicao[atribuidas], weights=tarefas.esforco[atribuidas], minlength=len(self.recursos)
+        ).astype(np.int64)
+
+        valores = list(zip(self.cargas, carga.tolist()))
+        calculados = {
+            "carga_max": int(carga.max()) if len(carga) else 0,
+            "carga_min": int(carga.min()) if len(carga) else 0,
+            "esforco": int(tarefas.esforco[atribuidas].sum()),
+        }
+        if self.max_prioridade is not None:
+            calculados["prioridade"] = int((self.max_prioridade + 1 - tarefas.prioridade[atribuidas]).sum())
+        for nome, variavel in self.componentes.items():
+            if nome in calculados and isinstance(variavel, cp_model.IntVar):
+                valores.append((variavel, calculados[nome]))
+        return valores
+
+    def atribuicao(self, solver: cp_model.CpSolver) -> np.ndarray:
+        """
+        Lê a solução do solver (ou do callback), com todos os valores lidos de uma vez.
+
+        Returns:
+            np.ndarray: Para cada tarefa, o índice do recurso atribuído ou -1.
+        """
+        atribuicao = np.full(len(self.tarefas), -1, dtype=np.int64)
+        pares = np.flatnonzero(valores_das_variaveis(self.variaveis, solver))
+        atribuicao[self.indice.par_tarefa[pares]] = self.indice.par_recurso[pares]
+        return atribuicao
+
+
+def maior_prioridade(tarefas: TarefasColunares) -> int:
+    return int(tarefas.prioridade.max()) if len(tarefas) else 1
+
+
+def gap_relativo(solver: cp_model.CpSolver) -> float:
+    """Distância relativa entre o valor do objetivo e o melhor limite provado pelo solver."""
+    objetivo = solver.ObjectiveValue()
+    return abs(solver.BestObjectiveBound() - objetivo) / max(1.0, abs(objetivo))
+
+
+def aplicar_restricoes(
+    modelo: cp_model.CpModel,
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    indice: Optional[IndiceElegibilidade] = None,
+    enxuto: bool = False,
+) -> ModeloAlocacao:
+    """
+    Cria as variáveis de decisão e as restrições de atribuição e capacidade,
+    percorrendo apenas os pares elegíveis.
+
+    Args:
+        modelo (cp_model.CpModel): O objeto do modelo.
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        indice (IndiceElegibilidade, optional): Índice já calculado. Defaults to None.
+        enxuto (bool, optional): Variáveis sem nome, endereçadas por índice, e restrições
+            escritas direto no proto; reduz a memória em problemas grandes. Defaults to False.
+
+    Returns:
+        ModeloAlocacao: O modelo com as restrições e o mapeamento das variáveis.
+    """
+    if indice is None:
+        indice = IndiceElegibilidade.de_dados(tarefas, recursos)
+    if enxuto:
+        return _aplicar_restricoes_enxutas(modelo, tarefas, recursos, indice)
+
+    # Variáveis de decisão: nota atribuída ao projetista (uma por par elegível)
+    notas = tarefas.nota[indice.par_tarefa]
+    matriculas = recursos.matricula[indice.par_recurso]
+    variaveis = [
+        modelo.NewBoolVar(f"tarefa{nota}_proj{matricula}")
+        for nota, matricula in zip(notas.tolist(), matriculas)
+    ]
+    alocacao = ModeloAlocacao(modelo, tarefas, recursos, indice, variaveis)
+
+    # Restrição: cada tarefa atribuída a apenas um recurso elegível
+    inicio = indice.inicio_tarefa.tolist()
+    for t in range(len(tarefas)):
+        if inicio[t + 1] > inicio[t]:
+            modelo.AddAtMostOne(variaveis[inicio[t]:inicio[t + 1]])
+
+    # Restrição: carga horária por projetista (sem pares, não há o que limitar)
+    disponibilidade = recursos.disponibilidade.tolist()
+    for r in indice.recursos_com_pares().tolist():
+        modelo.Add(alocacao.expressao_carga(r) <= disponibilidade[r])
+
+    return alocacao
+
+
+def _aplicar_restricoes_enxutas(modelo, tarefas, recursos, indice: IndiceElegibilidade) -> ModeloAlocacao:
+    variaveis = adicionar_booleanas(modelo, len(indice))
+    alocacao = ModeloAlocacao(modelo, tarefas, recursos, indice, variaveis)
+    proto = modelo.Proto()
+
+    # Restrição: cada tarefa atribuída a apenas um recurso elegível
+    inicio = (variaveis.inicio + indice.inicio_tarefa).tolist()
+    for t in range(len(tarefas)):
+        if inicio[t + 1] > inicio[t]:
+            proto.constraints.add().at_most_one.literals.extend(range(inicio[t], inicio[t + 1]))
+
+    # Restrição: carga horária por projetista (sem pares, não há o que limitar)
+    esforco_dos_pares = alocacao.esforco_dos_pares()
+    disponibilidade = recursos.disponibilidade.tolist()
+    for r in indice.recursos_com_pares().tolist():
+        pares = indice.pares_do_recurso(r)
+        linear = proto.constraints.add().linear
+        linear.vars.extend(variaveis.indices(pares).tolist())
+        linear.coeffs.extend(esforco_dos_pares[pares].tolist())
+        linear.domain.extend([0, disponibilidade[r]])
+
+    return alocacao
+
+
+def objetivo_esforco_maximo(alocacao: ModeloAlocacao, peso_maximizacao=PESO_MAXIMIZACAO):
+    """
+    Cria um objetivo com duas metas:
+    1. Maximizar o esforço total das tarefas atribuídas (maior prioridade).
+    2. Balancear a carga de trabalho entre os recursos (menor prioridade).
+
+    Args:
+        alocacao (ModeloAlocacao): O modelo com as restrições.
+        peso_maximizacao (int, optional): Peso do esforço sobre o balanceamento. Defaults to PESO_MAXIMIZACAO.
+
+    Returns:
+        ModeloAlocacao: O mesmo modelo, com o objetivo definido.
+    """
+    esforco_total_atribuido = alocacao.expressao_esforco()
+    diferenca_carga = criar_cargas(alocacao)
+
+    # Damos um peso muito maior para o trabalho feito, de forma que o solver
+    # nunca sacrifique uma tarefa em prol de um melhor balanceamento.
+    alocacao.modelo.Maximize(esforco_total_atribuido * peso_maximizacao - diferenca_carga)
+
+    alocacao.componentes.update(esforco=esforco_total_atribuido)
+    return alocacao
+
+
+def criar_cargas(alocacao: ModeloAlocacao) -> cp_model.LinearExpr:
+    """
+    Cria a variável de carga de cada recurso e as variáveis de carga máxima e mínima.
+
+    Args:
+        alocacao (ModeloAlocacao): O modelo com as restrições.
+
+    Returns:
+        cp_model.LinearExpr: A diferença entre a carga máxima e a mínima.
+    """
+    modelo = alocacao.modelo
+    variaveis_carga = []
+    for r, disponibilidade in enumerate(alocacao.recursos.disponibilidade.tolist()):
+        carga_recurso = modelo.NewIntVar(0, disponibilidade, f"carga_{alocacao.recursos.matricula[r]}")
+        modelo.Add(carga_recurso == alocacao.expressao_carga(r))
+        variaveis_carga.append(carga_recurso)
+
+    esforco_maximo = alocacao.esforco_total()
+    carga_max = modelo.NewIntVar(0, esforco_maximo, "carga_max")
+    carga_min = modelo.NewIntVar(0, esforco_maximo, "carga_min")
+    modelo.AddMaxEquality(carga_max, variaveis_carga)
+    modelo.AddMinEquality(carga_min, variaveis_carga)
+
+    alocacao.componentes.update(carga_max=carga_max, carga_min=carga_min)
+    alocacao.cargas = variaveis_carga
+    return carga_max - carga_min
+
+
+def objetivo_prioridade_maxima(
+    alocacao: ModeloAlocacao, pesos: Optional[Dict[str, int]] = None, max_prioridade: Optional[int] = None
+):
+    """
+    Define a função objetivo como uma combinação ponderada da prioridade e do
+    esforço das tarefas atribuídas.
+
+    Args:
+        alocacao (ModeloAlocacao): O modelo com as restrições.
+        pesos (dict, optional): Pesos percentuais de 'prioridade' e 'esforco'. Defaults to PESOS_PADRAO.
+        max_prioridade (int, optional): Maior prioridade usada no score. Informe a do problema
+            completo ao resolver partes dele. Defaults to a maior prioridade das tarefas do modelo.
+
+    Returns:
+        ModeloAlocacao: O mesmo modelo, com o objetivo definido.
+    """
+    pesos = PESOS_PADRAO if pesos is None else pesos
+    modelo = alocacao.modelo
+    if max_prioridade is None:
+        max_prioridade = maior_prioridade(alocacao.tarefas)
+
+    score_total_prioridade = modelo.NewIntVar(
+        0, alocacao.total_tarefas() * (max_prioridade + 1), "score_prioridade"
+    )
+    modelo.Add(score_total_prioridade == alocacao.expressao_prioridade(max_prioridade))
+
+    esforco_total_atribuido = modelo.NewIntVar(0, alocacao.esforco_total(), "esforco_total")
+    modelo.Add(esforco_total_atribuido == alocacao.expressao_esforco())
+
+    modelo.Maximize(
+        score_total_prioridade * pesos["prioridade"] + esforco_total_atribuido * pesos["esforco"]
+    )
+
+    alocacao.componentes.update(prioridade=score_total_prioridade, esforco=esforco_total_atribuido)
+    alocacao.max_prioridade = max_prioridade
+    return alocacao
+
+
+def construir_modelo(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    objetivo=OBJETIVO_ESFORCO_MAXIMO,
+    pesos: Optional[Dict[str, int]] = None,
+    indice: Optional[IndiceElegibilidade] = None,
+    agregado: bool = False,
+    simetria: bool = False,
+    max_prioridade: Optional[int] = None,
+    enxuto: bool = False,
+) -> ModeloAlocacao:
+    """
+    Monta o modelo completo (restrições e objetivo) e mede o tempo de construção.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        objetivo (str, optional): OBJETIVO_ESFORCO_MAXIMO ou OBJETIVO_PRIORIDADE_MAXIMA.
+        pesos (dict, optional): Pesos usados pelo objetivo de prioridade máxima.
+        indice (IndiceElegibilidade, optional): Índice já calculado. Defaults to None.
+        agregado (bool, optional): Usa a formulação por classes de tarefas idênticas
+            (ver `agregacao`). Nesse caso `indice` deve ser o índice das classes. Defaults to False.
+        simetria (bool, optional): Adiciona quebra de simetria entre recursos
+            intercambiáveis (ver `simetria`). Defaults to False.
+        max_prioridade (int, optional): Repassado a `objetivo_prioridade_maxima`.
+        enxuto (bool, optional): Modelo enxuto em memória (ver `aplicar_restricoes`); não se
+            aplica ao modelo agregado, que já é pequeno. Defaults to False.
+
+    Returns:
+        ModeloAlocacao: O modelo pronto para ser resolvido.
+    """
+    inicio = time.perf_counter()
+    if agregado:
+        from agregacao import aplicar_restricoes_agregadas
+
+        alocacao = aplicar_restricoes_agregadas(cp_model.CpModel(), tarefas, recursos, indice)
+    else:
+        alocacao = aplicar_restricoes(cp_model.CpModel(), tarefas, recursos, indice, enxuto)
+    if simetria:
+        from simetria import aplicar_quebra_simetria
+
+        aplicar_quebra_simetria(alocacao)
+    if objetivo == OBJETIVO_ESFORCO_MAXIMO:
+        objetivo_esforco_maximo(alocacao)
+    elif objetivo == OBJETIVO_PRIORIDADE_MAXIMA:
+        objetivo_prioridade_maxima(alocacao, pesos, max_prioridade)
+    else:
+        raise ValueError(f"Objetivo desconhecido: {objetivo}")
+    alocacao.tempo_construcao = time.perf_counter() - inicio
+    return alocacao
@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Optional
+
+from ortools.sat.python import cp_model
+
+from exportacao import exportar_distribuicao
+from instrumentacao import RegistroSolucoes
+from modelagem import ModeloAlocacao
+
+
+class VigiaEstagnacao:
+    """
+    Interrompe a busca quando o objetivo passa `estagnacao` segundos sem melhorar.
+
+    O solver só chama o callback quando encontra uma solução, então a
+    estagnação é vigiada por uma thread que acompanha as soluções registradas
+    pelo `registro` e chama `solver.StopSearch()`. A contagem começa na
+    primeira solução desta busca: antes dela não há o que preservar.
+
+    Uso:
+        with VigiaEstagnacao(solver, registro, 5.0) as vigia:
+            status = solver.Solve(modelo, registro)
+        if vigia.interrompeu: ...
+
+    Sem `estagnacao` (None ou 0), nada é vigiado.
+    """
+
+    def __init__(
+        self, solver: cp_model.CpSolver, registro: RegistroSolucoes, estagnacao: Optional[float], intervalo=0.1
+    ):
+        self.solver = solver
+        self.registro = registro
+        self.estagnacao = estagnacao
+        self.intervalo = min(intervalo, estagnacao) if estagnacao else intervalo
+        self.interrompeu = False
+        self._encerrar = threading.Event()
+        self._thread = None
+
+    def _vigiar(self):
+        vistas = len(self.registro.solucoes)
+        ultima_melhoria = None
+        while not self._encerrar.wait(self.intervalo):
+            agora = time.perf_counter()
+            if len(self.registro.solucoes) > vistas:
+                vistas = len(self.registro.solucoes)
+                ultima_melhoria = agora
+            elif ultima_melhoria is not None and agora - ultima_melhoria >= self.estagnacao:
+                self.interrompeu = True
+                self.solver.StopSearch()
+                return
+
+    def __enter__(self):
+        if self.estagnacao:
+            self._thread = threading.Thread(target=self._vigiar, name="vigia-estagnacao", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *excecao):
+        if self._thread is not None:
+            self._encerrar.set()
+            self._thread.join()
+        return False
+
+
+class ExportacaoContinua:
+    """
+    Função `ao_melhorar` para RegistroSolucoes que grava cada solução melhor
+    no arquivo de saída assim que é encontrada, para que a distribuição possa ser
+    consumida antes do fim da busca.
+
+    A gravação é atômica (ver `exportacao.gravar_tabela`) e acontece na
+    thread do solver; `intervalo_minimo` limita a frequência das gravações em
+    problemas grandes. A exportação final continua a cargo de quem chamou o solver.
+    """
+
+    def __init__(self, alocacao: ModeloAlocacao, caminho, intervalo_minimo=1.0):
+        self.alocacao = alocacao
+        self.caminho = caminho
+        self.intervalo_minimo = intervalo_minimo
+        self.gravacoes = 0
+        self._ultima_gravacao = None
+
+    def __call__(self, registro: RegistroSolucoes):
+        agora = time.perf_counter()
+        if self._ultima_gravacao is not None and agora - self._ultima_gravacao < self.intervalo_minimo:
+            return
+        atribuicao = self.alocacao.atribuicao(registro)
+        exportar_distribuicao(atribuicao, self.alocacao.tarefas_da_atribuicao(), self.alocacao.recursos, self.caminho)
+        self._ultima_gravacao = time.perf_counter()
+        self.gravacoes += 1
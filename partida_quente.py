@@ -0,0 +1,160 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from agregacao import ModeloAgregado
+from carregamento import RecursosColunares, TarefasColunares
+from modelagem import ModeloAlocacao, VariaveisIndexadas
+
+
+@dataclass
+class PartidaQuente:
+    """
+    Resultado da aplicação de uma distribuição anterior ao modelo.
+
+    - `anterior`: recurso de cada tarefa na distribuição anterior (ou -1);
+    - `fixada`: recurso fixado para cada tarefa (ou -1).
+    """
+
+    anterior: np.ndarray
+    fixada: np.ndarray
+    num_dicas: int
+    num_fixadas: int
+
+    def resumo(self) -> str:
+        return (
+            f"Partida quente: {int((self.anterior >= 0).sum())} tarefas na distribuição anterior, "
+            f"{self.num_dicas} dicas, {self.num_fixadas} fixadas"
+        )
+
+
+def ler_distribuicao(caminho) -> pd.DataFrame:
+    """
+    Lê uma distribuição exportada anteriormente.
+
+    O separador é detectado automaticamente, pois há arquivos antigos com ','.
+    Uma coluna opcional `em_andamento` (0/1) marca as tarefas já em execução.
+    """
+    return pd.read_csv(caminho, encoding="utf-8", sep=None, engine="python")
+
+
+def atribuicao_da_distribuicao(df: pd.DataFrame, tarefas: TarefasColunares, recursos: RecursosColunares):
+    """
+    Converte uma distribuição (nota, matricula) em atribuição por tarefa.
+
+    Notas que não estão mais entre as tarefas, ou matrículas que não estão
+    mais entre os recursos, são ignoradas.
+
+    Returns:
+        tuple: (atribuição por tarefa, máscara booleana das tarefas em andamento).
+    """
+    posicao_tarefa = pd.Series(np.arange(len(tarefas)), index=tarefas.nota)
+    posicao_recurso = pd.Series(np.arange(len(recursos)), index=recursos.matricula)
+
+    t = posicao_tarefa.reindex(df["nota"].to_numpy(dtype=np.int64)).to_numpy()
+    r = posicao_recurso.reindex(df["matricula"].to_numpy(dtype=object)).to_numpy()
+    validas = ~(np.isnan(t) | np.isnan(r))
+    t, r = t[validas].astype(np.int64), r[validas].astype(np.int64)
+
+    anterior = np.full(len(tarefas), -1, dtype=np.int64)
+    anterior[t] = r
+
+    em_andamento = np.zeros(len(tarefas), dtype=bool)
+    if "em_andamento" in df.columns:
+        em_andamento[t] = df["em_andamento"].fillna(0).to_numpy()[validas].astype(bool)
+    return anterior, em_andamento
+
+
+def atribuicao_viavel(atribuicao, tarefas: TarefasColunares, recursos: RecursosColunares) -> np.ndarray:
+    """
+    Mantém apenas a parte da atribuição que continua viável hoje: o recurso
+    ainda tem as habilidades exigidas e a soma dos esforços cabe na sua
+    disponibilidade (tarefas de maior prioridade ficam primeiro).
+
+    Returns:
+        np.ndarray: A atribuição filtrada (-1 nas tarefas descartadas).
+    """
+    atribuicao = np.array(atribuicao, dtype=np.int64)
+    atribuidas = np.flatnonzero(atribuicao >= 0)
+    r = atribuicao[atribuidas]
+    elegivel = (tarefas.mascara[atribuidas] & ~recursos.mascara[r]) == 0
+    atribuicao[atribuidas[~elegivel]] = -1
+
+    atribuidas = atribuidas[elegivel]
+    ordem = atribuidas[np.argsort(tarefas.prioridade[atribuidas], kind="stable")]
+    carga = pd.Series(tarefas.esforco[ordem]).groupby(atribuicao[ordem]).cumsum().to_numpy()
+    excede = carga > recursos.disponibilidade[atribuicao[ordem]]
+    atribuicao[ordem[excede]] = -1
+    return atribuicao
+
+
+def aplicar_dicas(alocacao: ModeloAlocacao, atribuicao) -> int:
+    """
+    Informa a atribuição ao solver como solução inicial sugerida (`AddHint`),
+    incluindo as variáveis auxiliares de carga e do objetivo, para que a dica
+    seja uma solução completa.
+
+    Returns:
+        int: Número de variáveis com dica diferente de zero.
+    """
+    valores = alocacao.valores_da_atribuicao(atribuicao)
+    alocacao.modelo.ClearHints()
+    if isinstance(alocacao.variaveis, VariaveisIndexadas):
+        # Modelo enxuto: dicas em bloco, sem criar as variáveis
+        dica = alocacao.modelo.Proto().solution_hint
+        dica.vars.extend(alocacao.variaveis.indices().tolist())
+        dica.values.extend(valores.tolist())
+    else:
+        for variavel, valor in zip(alocacao.variaveis, valores.tolist()):
+            alocacao.modelo.AddHint(variavel, valor)
+    for variavel, valor in alocacao.valores_auxiliares(atribuicao):
+        alocacao.modelo.AddHint(variavel, valor)
+    return int(np.count_nonzero(valores))
+
+
+def fixar_atribuicao(alocacao: ModeloAlocacao, atribuicao) -> int:
+    """
+    Fixa a atribuição no modelo: cada par atribuído passa a ser obrigatório
+    (no modelo agregado, a contagem do par passa a ter esse mínimo).
+
+    Returns:
+        int: Número de variáveis restringidas.
+    """
+    valores = alocacao.valores_da_atribuicao(atribuicao)
+    fixadas = np.flatnonzero(valores)
+    for p, valor in zip(fixadas.tolist(), valores[fixadas].tolist()):
+        alocacao.modelo.Add(alocacao.variaveis[p] >= valor)
+    return len(fixadas)
+
+
+def aplicar_partida_quente(alocacao: ModeloAlocacao, caminho, fixar=False) -> PartidaQuente:
+    """
+    Usa uma distribuição anterior como ponto de partida do solver.
+
+    Args:
+        alocacao (ModeloAlocacao): O modelo já construído.
+        caminho (str): CSV de uma distribuição anterior.
+        fixar (bool, optional): Fixa as tarefas em andamento (coluna `em_andamento`)
+            ou, sem essa coluna, todas as tarefas da distribuição anterior. Defaults to False.
+
+    Returns:
+        PartidaQuente: As atribuições usadas e quantas dicas/fixações foram aplicadas.
+    """
+    tarefas = alocacao.tarefas_da_atribuicao()
+    recursos = alocacao.recursos
+    df = ler_distribuicao(caminho)
+    anterior, em_andamento = atribuicao_da_distribuicao(df, tarefas, recursos)
+    anterior = atribuicao_viavel(anterior, tarefas, recursos)
+
+    fixada = np.full(len(tarefas), -1, dtype=np.int64)
+    num_fixadas = 0
+    if fixar:
+        selecionadas = em_andamento if "em_andamento" in df.columns else anterior >= 0
+        fixada[selecionadas] = anterior[selecionadas]
+        num_fixadas = fixar_atribuicao(alocacao, fixada)
+
+    num_dicas = aplicar_dicas(alocacao, anterior)
+    if isinstance(alocacao, ModeloAgregado):
+        alocacao.preferencia = anterior
+    return PartidaQuente(anterior, fixada, num_dicas, num_fixadas)
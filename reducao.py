@@ -0,0 +1,222 @@
+"""
+Redução do problema antes da construção do modelo.
+
+Remove o que não pode fazer parte de nenhuma solução ótima e fixa o que está
+em alguma, deixando ao CP-SAT um modelo menor:
+
+- pares (tarefa, recurso) em que o esforço da tarefa excede a disponibilidade do recurso;
+- tarefas sem recurso elegível, ou cujo esforço excede todos os recursos elegíveis;
+- recursos sem pares restantes (por exemplo, sem disponibilidade), que deixam
+  de ter restrição de capacidade (a carga, sempre zero, continua no balanceamento);
+- tarefas dominadas: se outra tarefa exige menos habilidades, tem esforço
+  menor ou igual e valor maior ou igual, trocar uma pela outra nunca piora o
+  objetivo, e há uma solução ótima em que toda tarefa atribuída leva junto as
+  que a dominam; quando o esforço da tarefa somado ao das que a dominam
+  excede a disponibilidade total, ela fica de fora;
+- tarefas com um único recurso possível, quando todas as tarefas possíveis
+  desse recurso cabem juntas nele: atribuí-las nunca piora o objetivo, então
+  a atribuição é fixada.
+
+No objetivo de prioridade máxima, que só depende das tarefas atribuídas,
+se a alocação gulosa consegue atribuir todas as tarefas possíveis, ela já é
+ótima e a otimização é dispensada.
+
+O índice reduzido mantém as mesmas tarefas e recursos (apenas com menos
+pares), de modo que atribuições, dicas e exportações não mudam.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from carregamento import RecursosColunares, TarefasColunares
+from elegibilidade import IndiceElegibilidade
+from heuristica import resolver_heuristica, valor_tarefas
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA, maior_prioridade
+
+
+@dataclass
+class Reducao:
+    """
+    Resultado da redução.
+
+    - `indice`: os pares que restaram, para `modelagem.aplicar_restricoes`;
+    - `fixadas[t]`: recurso a que a tarefa `t` deve ser atribuída, ou -1;
+    - `solucao`: atribuição ótima quando a otimização pode ser dispensada, ou None.
+    """
+
+    indice: IndiceElegibilidade
+    fixadas: np.ndarray
+    solucao: Optional[np.ndarray]
+    pares_originais: int
+    pares_acima_da_disponibilidade: int
+    tarefas_sem_recurso: int
+    tarefas_acima_da_disponibilidade: int
+    tarefas_dominadas: int
+    recursos_sem_disponibilidade: int
+    recursos_sem_tarefas: int
+    tempo: float
+
+    @property
+    def tarefas_fixadas(self) -> int:
+        return int((self.fixadas >= 0).sum())
+
+    def relatorio(self) -> Dict[str, object]:
+        """Contagens da redução, por motivo."""
+        return {
+            "pares_originais": self.pares_originais,
+            "pares_restantes": len(self.indice),
+            "pares_removidos": {"esforco_acima_da_disponibilidade": self.pares_acima_da_disponibilidade},
+            "tarefas_removidas": {
+                "sem_recurso_elegivel": self.tarefas_sem_recurso,
+                "esforco_acima_da_disponibilidade": self.tarefas_acima_da_disponibilidade,
+                "dominadas": self.tarefas_dominadas,
+            },
+            "recursos_removidos": {
+                "sem_disponibilidade": self.recursos_sem_disponibilidade,
+                "sem_tarefas_possiveis": self.recursos_sem_tarefas,
+            },
+            "tarefas_fixadas": self.tarefas_fixadas,
+            "otimizacao_dispensada": self.solucao is not None,
+            "tempo": round(self.tempo, 4),
+        }
+
+    def resumo(self) -> str:
+        removidos = self.pares_originais - len(self.indice)
+        linhas = [
+            f"Redução ({self.tempo:.3f}s): {len(self.indice)} de {self.pares_originais} pares "
+            f"({removidos / max(1, self.pares_originais):.1%} removidos)",
+            f"  pares com esforço acima da disponibilidade: {self.pares_acima_da_disponibilidade}",
+            f"  tarefas sem recurso elegível: {self.tarefas_sem_recurso}",
+            f"  tarefas com esforço acima de todos os recursos elegíveis: {self.tarefas_acima_da_disponibilidade}",
+            f"  tarefas dominadas: {self.tarefas_dominadas}",
+            f"  recursos sem disponibilidade: {self.recursos_sem_disponibilidade}",
+            f"  recursos sem tarefas possíveis: {self.recursos_sem_tarefas}",
+            f"  tarefas fixadas: {self.tarefas_fixadas}",
+        ]
+        if self.solucao is not None:
+            linhas.append("  todas as tarefas possíveis cabem: otimização dispensada")
+        return "\n".join(linhas)
+
+
+def esforco_dominante(
+    esforco: np.ndarray, valor: np.ndarray, mascara: np.ndarray, candidatas: np.ndarray
+) -> np.ndarray:
+    """
+    Soma, para cada tarefa, o esforço das candidatas que a dominam: máscara de
+    habilidades contida na dela, esforço menor ou igual e valor maior ou igual.
+    Entre tarefas equivalentes, domina a de menor índice, o que mantém a
+    relação sem ciclos.
+
+    As tarefas são percorridas em ordem de (esforço, -valor, índice), com uma
+    árvore de Fenwick por máscara acumulando o esforço por posto de valor.
+
+    Returns:
+        np.ndarray: O esforço dominante de cada tarefa.
+    """
+    ordem = np.lexsort((np.arange(len(esforco)), -valor, esforco))
+    valores = np.unique(valor)
+    posto = (len(valores) - np.searchsorted(valores, valor)).tolist()  # 1 = maior valor
+    mascaras, assinatura = np.unique(mascara, return_inverse=True)
+    contidas = [np.flatnonzero((mascaras & ~m) == 0).tolist() for m in mascaras.tolist()]
+    arvores = [[0] * (len(valores) + 1) for _ in mascaras]
+
+    dominante = np.zeros(len(esforco), dtype=np.int64)
+    esforcos, assinaturas, candidatas = esforco.tolist(), assinatura.tolist(), candidatas.tolist()
+    for t in ordem.tolist():
+        soma, i = 0, posto[t]
+        for a in contidas[assinaturas[t]]:
+            arvore, j = arvores[a], i
+            while j > 0:
+                soma += arvore[j]
+                j -= j & -j
+        dominante[t] = soma
+        if candidatas[t]:
+            arvore, j = arvores[assinaturas[t]], i
+            while j < len(arvore):
+                arvore[j] += esforcos[t]
+                j += j & -j
+    return dominante
+
+
+def reduzir(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    objetivo=OBJETIVO_ESFORCO_MAXIMO,
+    pesos: Optional[Dict[str, int]] = None,
+    max_prioridade: Optional[int] = None,
+    indice: Optional[IndiceElegibilidade] = None,
+) -> Reducao:
+    """
+    Reduz o problema (ver a descrição do módulo).
+
+    No objetivo de esforço máximo, o valor é proporcional ao esforço: só
+    domina a tarefa de mesmo esforço, e a troca não muda a carga dos recursos.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        objetivo (str, optional): Objetivo de `modelagem.construir_modelo`. Defaults to OBJETIVO_ESFORCO_MAXIMO.
+        pesos (dict, optional): Pesos do objetivo de prioridade máxima.
+        max_prioridade (int, optional): Maior prioridade usada no score. Defaults to a das tarefas.
+        indice (IndiceElegibilidade, optional): Índice de `IndiceElegibilidade.de_dados`, já calculado. Defaults to None.
+
+    Returns:
+        Reducao: O índice reduzido, as tarefas fixadas e o relatório.
+    """
+    inicio = time.perf_counter()
+    if indice is None:
+        indice = IndiceElegibilidade.de_dados(tarefas, recursos)
+    if max_prioridade is None:
+        max_prioridade = maior_prioridade(tarefas)
+    esforco = tarefas.esforco.astype(np.int64)
+    disponibilidade = recursos.disponibilidade.astype(np.int64)
+
+    cabe = esforco[indice.par_tarefa] <= disponibilidade[indice.par_recurso]
+    reduzido = indice.filtrar(cabe)
+    elegiveis = indice.num_elegiveis_por_tarefa()
+    possiveis = reduzido.num_elegiveis_por_tarefa()
+    com_pares = np.diff(reduzido.inicio_recurso) > 0
+    capacidade = int(disponibilidade[com_pares].sum())
+
+    solucao = None
+    if objetivo == OBJETIVO_PRIORIDADE_MAXIMA and esforco[possiveis > 0].sum() <= capacidade:
+        # A demanda cabe na capacidade total: vale tentar atribuir tudo
+        gulosa = resolver_heuristica(tarefas, recursos, objetivo, pesos, 0.0, max_prioridade).atribuicao
+        if ((gulosa >= 0) | (possiveis == 0)).all():
+            solucao = gulosa
+
+    valor = valor_tarefas(tarefas, objetivo, pesos, max_prioridade)
+    dominante = esforco_dominante(esforco, valor, tarefas.mascara, possiveis > 0)
+    dominadas = (possiveis > 0) & (esforco + dominante > capacidade)
+    reduzido = reduzido.filtrar(~dominadas[reduzido.par_tarefa])
+    possiveis = reduzido.num_elegiveis_por_tarefa()
+
+    # Uma tarefa com um só recurso possível vai para ele se todas as tarefas
+    # possíveis do recurso couberem juntas
+    demanda = np.bincount(
+        reduzido.par_recurso, weights=esforco[reduzido.par_tarefa], minlength=len(recursos)
+    ).astype(np.int64)
+    fixadas = np.full(len(tarefas), -1, dtype=np.int64)
+    unicas = np.flatnonzero(possiveis == 1)
+    recurso_unico = reduzido.par_recurso[reduzido.inicio_tarefa[unicas]]
+    folgados = demanda[recurso_unico] <= disponibilidade[recurso_unico]
+    fixadas[unicas[folgados]] = recurso_unico[folgados]
+    com_pares = np.diff(reduzido.inicio_recurso) > 0
+
+    return Reducao(
+        indice=reduzido,
+        fixadas=fixadas,
+        solucao=solucao,
+        pares_originais=len(indice),
+        pares_acima_da_disponibilidade=int((~cabe).sum()),
+        tarefas_sem_recurso=int((elegiveis == 0).sum()),
+        tarefas_acima_da_disponibilidade=int(((elegiveis > 0) & (possiveis == 0) & ~dominadas).sum()),
+        tarefas_dominadas=int(dominadas.sum()),
+        recursos_sem_disponibilidade=int((~com_pares & (disponibilidade <= 0)).sum()),
+        recursos_sem_tarefas=int((~com_pares & (disponibilidade > 0)).sum()),
+        tempo=time.perf_counter() - inicio,
+    )
+
@@ -0,0 +1,240 @@
+"""
+Relaxação linear do problema de alocação, resolvida como fluxo de custo mínimo.
+
+Sem a integralidade, "a tarefa t vai para o recurso r" vira a fração x[t, r],
+com sum_r x[t, r] <= 1 e sum_t esforco[t] * x[t, r] <= disponibilidade[r].
+Medindo o fluxo em unidades de esforço (y = esforco * x), isso é um problema
+de transporte: fonte → classe de tarefas → recurso → sumidouro, com ganho
+valor/esforco por unidade. O fluxo sai da fonte direto para o sumidouro
+quando não compensa alocar.
+
+O valor ótimo é um limite superior do objetivo do CP-SAT (o termo de
+balanceamento do esforço máximo, que só subtrai, é ignorado), e o fluxo
+arredondado, completado pela busca local da heurística, é um plano viável.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+from ortools.graph.python import min_cost_flow
+
+from agregacao import ClassesTarefas, agrupar_tarefas
+from carregamento import RecursosColunares, TarefasColunares
+from elegibilidade import IndiceElegibilidade
+from heuristica import resolver_heuristica, valor_tarefas
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, maior_prioridade
+
+# Motores de solução dos scripts (MOTOR_SOLUCAO)
+MOTOR_CPSAT = "cpsat"
+MOTOR_RELAXACAO = "relaxacao"
+
+# Maior escala dos ganhos inteiros: o erro do limite é de no máximo fluxo / escala
+ESCALA_MAXIMA = 1 << 20
+# Folga para os custos multiplicados internamente pelo número de nós
+LIMITE_CUSTO = 1 << 60
+
+
+@dataclass
+class LimiteRelaxacao:
+    """
+    Solução da relaxação linear.
+
+    - `limite`: limite superior (inteiro) do objetivo do CP-SAT;
+    - `fluxo[p]`: esforço que a relaxação envia pelo par (classe, recurso) `p`
+      do `indice` de classes.
+    """
+
+    limite: int
+    classes: ClassesTarefas
+    indice: IndiceElegibilidade
+    fluxo: np.ndarray
+    tempo: float
+
+
+@dataclass
+class ResultadoRelaxacao:
+    """Limite da relaxação e o plano obtido do seu arredondamento."""
+
+    limite: int
+    atribuicao: np.ndarray
+    objetivo: int
+    arredondadas: int
+    tempo_relaxacao: float
+    tempo: float
+
+    def gap(self) -> float:
+        return gap_limite(self.objetivo, self.limite)
+
+    def resumo(self) -> str:
+        return (
+            f"Relaxação: limite {self.limite} em {self.tempo_relaxacao:.3f}s; plano arredondado "
+            f"com objetivo {self.objetivo} (gap {self.gap():.4%}), {self.arredondadas} tarefas do fluxo e "
+            f"{int((self.atribuicao >= 0).sum())} atribuídas no total, {self.tempo:.3f}s"
+        )
+
+
+def gap_limite(objetivo: float, limite: float) -> float:
+    """Distância relativa entre o valor de um plano e um limite superior do objetivo."""
+    return max(0.0, limite - objetivo) / max(1.0, abs(objetivo))
+
+
+def _escala(ganho_maximo: float, fluxo_total: int, num_nos: int) -> int:
+    escala = LIMITE_CUSTO / max(1.0, ganho_maximo * max(fluxo_total, num_nos + 1))
+    return int(min(ESCALA_MAXIMA, 2 ** np.floor(np.log2(max(escala, 1.0)))))
+
+
+def limite_relaxacao(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    objetivo=OBJETIVO_ESFORCO_MAXIMO,
+    pesos: Optional[Dict[str, int]] = None,
+    max_prioridade: Optional[int] = None,
+) -> LimiteRelaxacao:
+    """
+    Resolve a relaxação linear como fluxo de custo mínimo.
+
+    Tarefas idênticas (ver `agregacao.agrupar_tarefas`) formam um único nó, e
+    um recurso recebe de cada classe no máximo as tarefas que cabem inteiras
+    na sua disponibilidade: restrições que toda solução inteira cumpre e que
+    deixam o limite mais justo. Os ganhos por unidade de esforço são
+    arredondados para cima na escala inteira do fluxo, o que mantém o limite válido.
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        objetivo (str, optional): Objetivo de `modelagem.construir_modelo`. Defaults to OBJETIVO_ESFORCO_MAXIMO.
+        pesos (dict, optional): Pesos do objetivo de prioridade máxima.
+        max_prioridade (int, optional): Maior prioridade usada no score. Defaults to a das tarefas.
+
+    Returns:
+        LimiteRelaxacao: O limite e o fluxo de cada par (classe, recurso).
+    """
+    inicio = time.perf_counter()
+    if max_prioridade is None:
+        max_prioridade = maior_prioridade(tarefas)
+    classes = agrupar_tarefas(tarefas)
+    representantes = classes.representantes
+    indice = IndiceElegibilidade.construir(representantes.mascara, recursos.mascara)
+
+    valor = valor_tarefas(representantes, objetivo, pesos, max_prioridade)
+    esforco = representantes.esforco.astype(np.int64)
+    tamanho = classes.tamanho.astype(np.int64)
+    disponibilidade = np.maximum(recursos.disponibilidade.astype(np.int64), 0)
+
+    # Tarefas sem esforço não usam capacidade: basta um recurso elegível
+    elegiveis = indice.num_elegiveis_por_tarefa() > 0
+    sem_esforco = (esforco == 0) & elegiveis
+    limite_sem_esforco = int((valor[sem_esforco] * tamanho[sem_esforco]).sum())
+
+    classe_par, recurso_par = indice.par_tarefa, indice.par_recurso
+    esforco_par = esforco[classe_par]
+    cabem = np.floor_divide(disponibilidade[recurso_par], np.maximum(esforco_par, 1))
+    capacidade_par = np.minimum(tamanho[classe_par], cabem) * esforco_par
+    usados = (esforco_par > 0) & (capacidade_par > 0)
+
+    num_classes, num_recursos = len(classes), len(recursos)
+    fonte, sumidouro = 0, num_classes + num_recursos + 1
+    oferta = np.where(esforco > 0, tamanho * esforco, 0)
+    total = int(oferta.sum())
+    fluxo = np.zeros(len(indice), dtype=np.int64)
+    if total == 0 or not usados.any():
+        return LimiteRelaxacao(limite_sem_esforco, classes, indice, fluxo, time.perf_counter() - inicio)
+
+    ganho = valor / np.maximum(esforco, 1)
+    escala = _escala(float(ganho[esforco > 0].max()), total, sumidouro + 1)
+    ganho_inteiro = np.ceil(valor * escala / np.maximum(esforco, 1)).astype(np.int64)
+
+    grafo = min_cost_flow.SimpleMinCostFlow()
+    classes_com_oferta = np.flatnonzero(oferta > 0)
+    grafo.add_arcs_with_capacity_and_unit_cost(
+        np.zeros(len(classes_com_oferta), dtype=np.int32),
+        (classes_com_oferta + 1).astype(np.int32),
+        oferta[classes_com_oferta],
+        np.zeros(len(classes_com_oferta), dtype=np.int64),
+    )
+    pares = np.flatnonzero(usados)
+    arcos = grafo.add_arcs_with_capacity_and_unit_cost(
+        (classe_par[pares] + 1).astype(np.int32),
+        (recurso_par[pares] + num_classes + 1).astype(np.int32),
+        capacidade_par[pares],
+        -ganho_inteiro[classe_par[pares]],
+    )
+    grafo.add_arcs_with_capacity_and_unit_cost(
+        np.arange(num_classes + 1, num_classes + num_recursos + 1, dtype=np.int32),
+        np.full(num_recursos, sumidouro, dtype=np.int32),
+        disponibilidade,
+        np.zeros(num_recursos, dtype=np.int64),
+    )
+    # Desvio: o fluxo que não compensa alocar vai direto ao sumidouro
+    grafo.add_arc_with_capacity_and_unit_cost(fonte, sumidouro, total, 0)
+    grafo.set_nodes_supplies(np.array([fonte, sumidouro], dtype=np.int32), np.array([total, -total], dtype=np.int64))
+
+    status = grafo.solve()
+    if status != grafo.OPTIMAL:
+        raise RuntimeError(f"Fluxo de custo mínimo não resolvido (status {status})")
+    fluxo[pares] = grafo.flows(np.asarray(arcos))
+    limite = -grafo.optimal_cost() // escala + limite_sem_esforco
+    return LimiteRelaxacao(int(limite), classes, indice, fluxo, time.perf_counter() - inicio)
+
+
+def arredondar(relaxacao: LimiteRelaxacao, tarefas: TarefasColunares, recursos: RecursosColunares) -> np.ndarray:
+    """
+    Atribui as tarefas que a relaxação envia inteiras a um recurso.
+
+    Cada par (classe, recurso) recebe floor(fluxo / esforço) tarefas da classe;
+    como o fluxo respeita a disponibilidade, a atribuição é viável. As tarefas
+    com fluxo fracionário ficam sem recurso.
+
+    Returns:
+        np.ndarray: Para cada tarefa, o índice do recurso atribuído ou -1.
+    """
+    classes, indice = relaxacao.classes, relaxacao.indice
+    atribuicao = np.full(len(tarefas), -1, dtype=np.int64)
+    esforco = classes.representantes.esforco.astype(np.int64)
+    inteiras = np.floor_divide(relaxacao.fluxo, np.maximum(esforco[indice.par_tarefa], 1))
+    proxima = classes.inicio[:-1].copy()
+    for p in np.flatnonzero(inteiras > 0).tolist():
+        c = indice.par_tarefa[p]
+        membros = classes.membros[proxima[c] : proxima[c] + inteiras[p]]
+        atribuicao[membros] = indice.par_recurso[p]
+        proxima[c] += len(membros)
+    return atribuicao
+
+
+def resolver_relaxacao(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    objetivo=OBJETIVO_ESFORCO_MAXIMO,
+    pesos: Optional[Dict[str, int]] = None,
+    tempo_limite=1.0,
+    max_prioridade: Optional[int] = None,
+) -> ResultadoRelaxacao:
+    """
+    Plano a partir da relaxação linear: o fluxo arredondado, completado e
+    melhorado pela busca local da heurística (ver `heuristica.resolver_heuristica`).
+
+    Args:
+        tarefas (TarefasColunares): As tarefas.
+        recursos (RecursosColunares): Os recursos.
+        objetivo (str, optional): Objetivo de `modelagem.construir_modelo`. Defaults to OBJETIVO_ESFORCO_MAXIMO.
+        pesos (dict, optional): Pesos do objetivo de prioridade máxima.
+        tempo_limite (float, optional): Tempo máximo em segundos da busca local. Defaults to 1.0.
+        max_prioridade (int, optional): Maior prioridade usada no score. Defaults to a das tarefas.
+
+    Returns:
+        ResultadoRelaxacao: O limite, o plano e o valor do objetivo do CP-SAT nele.
+    """
+    inicio = time.perf_counter()
+    relaxacao = limite_relaxacao(tarefas, recursos, objetivo, pesos, max_prioridade)
+    inicial = arredondar(relaxacao, tarefas, recursos)
+    busca = resolver_heuristica(tarefas, recursos, objetivo, pesos, tempo_limite, max_prioridade, inicial=inicial)
+    return ResultadoRelaxacao(
+        relaxacao.limite,
+        busca.atribuicao,
+        busca.objetivo,
+        int((inicial >= 0).sum()),
+        relaxacao.tempo,
+        time.perf_counter() - inicio,
+    )
@@ -0,0 +1,295 @@
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from carregamento import RecursosColunares, TarefasColunares
+from configuracao_solver import criar_solver
+from elegibilidade import IndiceElegibilidade
+from instrumentacao import RegistroSolucoes
+from modelagem import (
+    OBJETIVO_ESFORCO_MAXIMO,
+    OBJETIVO_PRIORIDADE_MAXIMA,
+    ModeloAlocacao,
+    construir_modelo,
+    maior_prioridade,
+)
+from partida_quente import aplicar_dicas, atribuicao_viavel
+
+
+@dataclass
+class ResultadoReplanejamento:
+    """
+    Resultado de `Planejador.resolver`.
+
+    `mudancas` conta as tarefas que tinham recurso no plano anterior e agora
+    estão com outro recurso (ou sem recurso); tarefas novas não entram na conta.
+    `mudancas_forcadas` é a parte delas causada por cancelamentos de capacidade
+    ou ausências, que nenhum limite de mudanças consegue evitar.
+    """
+
+    status: int
+    mudancas: int
+    mudancas_forcadas: int
+    num_tarefas: int
+    num_recursos: int
+    objetivo: Optional[float]
+    tempo: float
+
+    def resumo(self) -> str:
+        return (
+            f"Replanejamento: {cp_model.CpSolverStatus(self.status).name} | "
+            f"vizinhança {self.num_tarefas} tarefas x {self.num_recursos} recursos | "
+            f"{self.mudancas} atribuições alteradas ({self.mudancas_forcadas} forçadas) | "
+            f"objetivo {self.objetivo} | {self.tempo:.2f}s"
+        )
+
+
+class Planejador:
+    """
+    Planejador de vida longa para replanejamentos incrementais ao longo do dia.
+
+    Guarda as tarefas, os recursos, o índice de elegibilidade e o plano atual.
+    As alterações (`adicionar_tarefas`, `remover_tarefas`, `definir_disponibilidade`)
+    apenas marcam o que mudou; `resolver` reotimiza somente a vizinhança afetada
+    e mantém o restante do plano fixo.
+
+    A vizinhança é formada pelos recursos alterados e pelos recursos elegíveis
+    às tarefas novas ou às tarefas de recursos que perderam disponibilidade.
+    Entram no modelo as tarefas novas, as tarefas atribuídas a esses recursos e
+    as tarefas ainda sem recurso que eles poderiam atender.
+    O plano atual dessas tarefas é informado ao solver como dica.
+    """
+
+    def __init__(
+        self,
+        tarefas: TarefasColunares,
+        recursos: RecursosColunares,
+        objetivo=OBJETIVO_PRIORIDADE_MAXIMA,
+        pesos=None,
+        atribuicao=None,
+    ):
+        """
+        Args:
+            tarefas (TarefasColunares): As tarefas iniciais.
+            recursos (RecursosColunares): Os recursos.
+            objetivo (str, optional): Objetivo de `modelagem.construir_modelo`.
+                Defaults to OBJETIVO_PRIORIDADE_MAXIMA.
+            pesos (dict, optional): Pesos do objetivo de prioridade máxima. Defaults to None.
+            atribuicao (np.ndarray, optional): Plano inicial (recurso por tarefa ou -1).
+                Sem plano, o primeiro `resolver` otimiza o problema inteiro. Defaults to None.
+        """
+        if objetivo not in (OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA):
+            raise ValueError(f"Objetivo desconhecido: {objetivo}")
+        self.tarefas = tarefas
+        # Cópia: `definir_disponibilidade` altera a disponibilidade no lugar
+        self.recursos = recursos.selecionar(np.arange(len(recursos)))
+        self.objetivo = objetivo
+        self.pesos = pesos
+        self.alocacao: Optional[ModeloAlocacao] = None
+        self._indice: Optional[IndiceElegibilidade] = None
+
+        if atribuicao is None:
+            self.atribuicao = np.full(len(tarefas), -1, dtype=np.int64)
+            self._tarefas_alteradas = set(tarefas.nota.tolist())
+        else:
+            self.atribuicao = atribuicao_viavel(atribuicao, tarefas, self.recursos)
+            self._tarefas_alteradas = set()
+        self._recursos_alterados = set()
+        self._recursos_reduzidos = set()
+        # Plano do último `resolver`, referência para contar as mudanças
+        self._referencia = self.atribuicao.copy()
+
+    @property
+    def indice(self) -> IndiceElegibilidade:
+        """Índice de elegibilidade das tarefas atuais, reconstruído após alterações."""
+        if self._indice is None:
+            self._indice = IndiceElegibilidade.de_dados(self.tarefas, self.recursos)
+        return self._indice
+
+    def _posicoes_tarefas(self, notas) -> np.ndarray:
+        posicao = pd.Series(np.arange(len(self.tarefas)), index=self.tarefas.nota)
+        return posicao.reindex(np.asarray(list(notas), dtype=np.int64)).dropna().to_numpy(dtype=np.int64)
+
+    def _posicao_recurso(self, matricula) -> int:
+        posicoes = np.flatnonzero(self.recursos.matricula == matricula)
+        if not len(posicoes):
+            raise KeyError(f"Matrícula desconhecida: {matricula}")
+        return int(posicoes[0])
+
+    def adicionar_tarefas(self, novas):
+        """
+        Inclui tarefas novas, ainda sem recurso.
+
+        Args:
+            novas (TarefasColunares | pd.DataFrame): As tarefas, no formato colunar
+                ou no mesmo esquema do CSV de tarefas.
+        """
+        if isinstance(novas, pd.DataFrame):
+            novas = TarefasColunares.de_dataframe(novas, self.tarefas.vocabulario)
+        repetidas = np.intersect1d(novas.nota, self.tarefas.nota)
+        if len(repetidas):
+            raise ValueError(f"Notas já existentes no plano: {repetidas.tolist()}")
+
+        self.tarefas = self.tarefas.concatenar(novas)
+        vazias = np.full(len(novas), -1, dtype=np.int64)
+        self.atribuicao = np.concatenate((self.atribuicao, vazias))
+        self._referencia = np.concatenate((self._referencia, vazias))
+        self._tarefas_alteradas.update(novas.nota.tolist())
+        self._indice = None
+
+    def remover_tarefas(self, notas: Iterable[int]):
+        """
+        Cancela tarefas. Os recursos que as atendiam ficam com capacidade livre
+        e entram na vizinhança do próximo `resolver`.
+
+        Args:
+            notas (Iterable[int]): Notas das tarefas canceladas (as desconhecidas são ignoradas).
+        """
+        removidas = self._posicoes_tarefas(notas)
+        recursos_liberados = self.atribuicao[removidas]
+        self._recursos_alterados.update(recursos_liberados[recursos_liberados >= 0].tolist())
+        self._tarefas_alteradas.difference_update(self.tarefas.nota[removidas].tolist())
+
+        mantidas = np.ones(len(self.tarefas), dtype=bool)
+        mantidas[removidas] = False
+        self.tarefas = self.tarefas.selecionar(np.flatnonzero(mantidas))
+        self.atribuicao = self.atribuicao[mantidas]
+        self._referencia = self._referencia[mantidas]
+        self._indice = None
+
+    def definir_disponibilidade(self, matricula, disponibilidade: int):
+        """
+        Altera a disponibilidade de um recurso (0 para uma ausência).
+
+        Args:
+            matricula (str): Matrícula do recurso.
+            disponibilidade (int): A nova disponibilidade.
+        """
+        r = self._posicao_recurso(matricula)
+        if disponibilidade < self.recursos.disponibilidade[r]:
+            self._recursos_reduzidos.add(r)
+        self.recursos.disponibilidade[r] = disponibilidade
+        self._recursos_alterados.add(r)
+
+    def vizinhanca(self):
+        """
+        Tarefas e recursos (índices atuais) que serão reotimizados no próximo `resolver`.
+
+        Returns:
+            tuple: (índices das tarefas, índices dos recursos).
+        """
+        indice = self.indice
+        alteradas = self._posicoes_tarefas(self._tarefas_alteradas)
+        # Tarefas de recursos que perderam capacidade podem precisar de outro recurso
+        reduzidos = np.zeros(len(self.recursos), dtype=bool)
+        reduzidos[list(self._recursos_reduzidos)] = True
+        atribuidas = self.atribuicao >= 0
+        deslocadas = np.flatnonzero(atribuidas)[reduzidos[self.atribuicao[atribuidas]]]
+
+        recursos = np.zeros(len(self.recursos), dtype=bool)
+        recursos[list(self._recursos_alterados)] = True
+        for t in np.concatenate((alteradas, deslocadas)).tolist():
+            recursos[indice.recursos_da_tarefa(t)] = True
+
+        tarefas = np.zeros(len(self.tarefas), dtype=bool)
+        tarefas[alteradas] = True
+        tarefas[atribuidas] |= recursos[self.atribuicao[atribuidas]]
+        # Tarefas sem recurso que algum recurso da vizinhança poderia atender
+        pares = recursos[indice.par_recurso] & ~atribuidas[indice.par_tarefa]
+        tarefas[indice.par_tarefa[pares]] = True
+        return np.flatnonzero(tarefas), np.flatnonzero(recursos)
+
+    def resolver(
+        self, tempo_limite=30.0, max_mudancas=None, apenas_vizinhanca=True, configuracao=None
+    ) -> ResultadoReplanejamento:
+        """
+        Reotimiza o plano após as alterações registradas.
+
+        Args:
+            tempo_limite (float, optional): Tempo máximo do solver. Defaults to 30.0.
+            max_mudancas (int, optional): Limite de atribuições alteradas em relação
+                ao plano anterior. Mudanças forçadas (ausências, perda de capacidade)
+                sempre acontecem e consomem o limite. Defaults to None (sem limite).
+            apenas_vizinhanca (bool, optional): Reotimiza só a vizinhança afetada,
+                com o resto do plano fixo. Com False, todo o problema entra no
+                modelo, com o plano atual como dica. Defaults to True.
+            configuracao (ConfiguracaoSolver, optional): Parâmetros do solver. Defaults to None.
+
+        Returns:
+            ResultadoReplanejamento: Status, mudanças e tamanho do modelo resolvido.
+        """
+        inicio = time.perf_counter()
+        if apenas_vizinhanca:
+            tarefas, recursos = self.vizinhanca()
+        else:
+            tarefas, recursos = np.arange(len(self.tarefas)), np.arange(len(self.recursos))
+
+        sub_tarefas = self.tarefas.selecionar(tarefas)
+        sub_recursos = self.recursos.selecionar(recursos)
+        local_recurso = np.full(len(self.recursos), -1, dtype=np.int64)
+        local_recurso[recursos] = np.arange(len(recursos))
+
+        # Plano atual em índices locais, restrito ao que continua viável
+        atual = self.atribuicao[tarefas]
+        atual = np.where(atual >= 0, local_recurso[np.maximum(atual, 0)], -1)
+        atual = atribuicao_viavel(atual, sub_tarefas, sub_recursos)
+
+        referencia = self._referencia[tarefas]
+        mantiveis = (referencia >= 0) & (referencia == self.atribuicao[tarefas]) & (atual >= 0)
+        mudancas_forcadas = int(((referencia >= 0) & ~mantiveis).sum())
+
+        status = cp_model.OPTIMAL
+        objetivo_alcancado = None
+        if len(sub_tarefas) and len(sub_recursos):
+            max_prioridade = None
+            if self.objetivo == OBJETIVO_PRIORIDADE_MAXIMA:
+                # A escala do score deve ser a mesma do problema completo
+                max_prioridade = maior_prioridade(self.tarefas)
+            self.alocacao = construir_modelo(
+                sub_tarefas, sub_recursos, self.objetivo, self.pesos, max_prioridade=max_prioridade
+            )
+            aplicar_dicas(self.alocacao, atual)
+            if max_mudancas is not None:
+                self._limitar_mudancas(atual, mantiveis, max(max_mudancas - mudancas_forcadas, 0))
+
+            solver = criar_solver(tempo_limite, configuracao)
+            status = solver.Solve(self.alocacao.modelo, RegistroSolucoes())
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                atual = self.alocacao.atribuicao(solver)
+                objetivo_alcancado = solver.ObjectiveValue()
+
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            novo = self.atribuicao.copy()
+            novo[tarefas] = np.where(atual >= 0, recursos[np.maximum(atual, 0)], -1)
+            mudancas = int(((self._referencia >= 0) & (novo != self._referencia)).sum())
+            self.atribuicao = novo
+            self._referencia = novo.copy()
+            self._tarefas_alteradas.clear()
+            self._recursos_alterados.clear()
+            self._recursos_reduzidos.clear()
+        else:
+            # Sem solução: o plano só perde o que deixou de ser viável
+            self.atribuicao = atribuicao_viavel(self.atribuicao, self.tarefas, self.recursos)
+            mudancas = int(((self._referencia >= 0) & (self.atribuicao != self._referencia)).sum())
+
+        return ResultadoReplanejamento(
+            status,
+            mudancas,
+            mudancas_forcadas,
+            len(sub_tarefas),
+            len(sub_recursos),
+            objetivo_alcancado,
+            time.perf_counter() - inicio,
+        )
+
+    def _limitar_mudancas(self, atual, mantiveis, limite):
+        """Permite no máximo `limite` tarefas mantíveis fora do seu recurso atual."""
+        candidatas = np.flatnonzero(mantiveis)
+        pares = self.alocacao.indice.localizar_pares(candidatas, atual[candidatas])
+        mantidas = [self.alocacao.variaveis[p] for p in pares[pares >= 0].tolist()]
+        if mantidas:
+            self.alocacao.modelo.Add(cp_model.LinearExpr.Sum(mantidas) >= len(mantidas) - limite)
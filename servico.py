@@ -0,0 +1,461 @@
+"""
+Serviço local de alocação, residente, para replanejamentos pequenos ao longo do dia.
+
+Os imports, a equipe de recursos já lida e os índices de elegibilidade ficam
+em memória; cada pedido apenas lê as tarefas, monta o modelo e o resolve em
+um pool limitado de processos (já aquecidos na partida). Pedidos simultâneos
+idênticos (mesma equipe, tarefas e opções) são atendidos por uma única solução.
+
+HTTP/1.1 simples sobre asyncio, sem dependências além das do projeto:
+
+    PUT  /recursos   corpo: CSV de recursos. Registra a equipe e a torna a padrão.
+    POST /alocar     corpo: CSV de tarefas. Responde com o CSV da distribuição;
+                     status, objetivo e tempos vão nos cabeçalhos X-*.
+                     Parâmetros: objetivo, tempo_limite, peso_prioridade,
+                     peso_esforco e recursos (chave, ou prefixo, de uma equipe registrada).
+    GET  /metricas   Latência por etapa (p50, p95, p99, máximo) dos últimos pedidos.
+    GET  /saude      Estado do serviço.
+
+Exemplo:
+    python servico.py
+    curl --data-binary @data/prd_rot_tarefas.csv "http://127.0.0.1:8765/alocar?tempo_limite=0.5"
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from dotenv import load_dotenv
+from ortools.sat.python import cp_model
+
+from carregamento import RecursosColunares, TarefasColunares, Vocabulario, ler_csv
+from configuracao_solver import ConfiguracaoSolver, configuracao_de_ambiente, criar_solver, dividir_trabalhadores
+from elegibilidade import IndiceElegibilidade
+from exportacao import distribuicao_dataframe
+from heuristica import resolver_heuristica
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA, construir_modelo
+from partida_quente import aplicar_dicas
+
+logger = logging.getLogger("servico")
+
+PORTA_PADRAO = 8765
+TEMPO_LIMITE_PADRAO = 0.5
+# Equipes registradas e índices (equipe, tarefas) mantidos em memória
+MAXIMO_EQUIPES = 8
+MAXIMO_INDICES = 32
+# Pedidos usados no cálculo dos percentis de latência
+JANELA_METRICAS = 1000
+ETAPAS = ("leitura", "elegibilidade", "fila", "construcao", "solucao", "total")
+OBJETIVOS = (OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA)
+MOTIVOS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class ErroPedido(Exception):
+    """Pedido inválido; vira uma resposta HTTP com o `codigo`."""
+
+    def __init__(self, mensagem: str, codigo: int = 400):
+        super().__init__(mensagem)
+        self.codigo = codigo
+
+
+def _resumo(dados: bytes) -> str:
+    return hashlib.sha256(dados).hexdigest()
+
+
+def _aquecer():
+    # Carrega as bibliotecas do CP-SAT no processo antes do primeiro pedido
+    modelo = cp_model.CpModel()
+    modelo.Add(modelo.NewBoolVar("x") == 1)
+    cp_model.CpSolver().Solve(modelo)
+    return os.getpid()
+
+
+def _resolver_no_processo(
+    tarefas: TarefasColunares,
+    recursos: RecursosColunares,
+    indice: IndiceElegibilidade,
+    objetivo: str,
+    pesos: Dict[str, int],
+    tempo_limite: float,
+    configuracao: ConfiguracaoSolver,
+    tempo_heuristica: float,
+) -> dict:
+    inicio = time.perf_counter()
+    alocacao = construir_modelo(tarefas, recursos, objetivo, pesos, indice=indice)
+    construcao = time.perf_counter() - inicio
+
+    reserva = None
+    if tempo_heuristica:
+        reserva = resolver_heuristica(tarefas, recursos, objetivo, pesos, tempo_heuristica, alocacao.max_prioridade)
+        aplicar_dicas(alocacao, reserva.atribuicao)
+    solver = criar_solver(tempo_limite, configuracao)
+    status = solver.Solve(alocacao.modelo)
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        atribuicao, valor, nome = alocacao.atribuicao(solver), solver.ObjectiveValue(), solver.StatusName(status)
+    else:
+        if reserva is None:
+            reserva = resolver_heuristica(tarefas, recursos, objetivo, pesos, max_prioridade=alocacao.max_prioridade)
+        atribuicao, valor, nome = reserva.atribuicao, float(reserva.objetivo), "HEURISTICA"
+    return {
+        "atribuicao": atribuicao,
+        "status": nome,
+        "objetivo": valor,
+        "construcao": construcao,
+        "solucao": time.perf_counter() - inicio - construcao,
+    }
+
+
+@dataclass
+class Equipe:
+    """
+    Recursos já lidos, com o vocabulário de habilidades usado para ler as tarefas.
+
+    O vocabulário é fechado depois dos recursos: as habilidades dos pedidos não o
+    alteram, e a tarefa que pede uma habilidade que ninguém da equipe tem fica
+    sem recurso elegível.
+    """
+
+    chave: str
+    recursos: RecursosColunares
+    vocabulario: Vocabulario
+
+    @classmethod
+    def de_csv(cls, conteudo: bytes) -> "Equipe":
+        vocabulario = Vocabulario()
+        recursos = RecursosColunares.de_dataframe(ler_csv(io.BytesIO(conteudo)), vocabulario)
+        return cls(_resumo(conteudo), recursos, vocabulario.fechar())
+
+
+@dataclass
+class MetricasLatencia:
+    """Duração, em segundos, de cada etapa dos últimos `janela` pedidos, e contadores."""
+
+    janela: int = JANELA_METRICAS
+    etapas: Dict[str, Deque[float]] = field(default_factory=dict)
+    pedidos: int = 0
+    coalescidos: int = 0
+    erros: int = 0
+
+    def registrar(self, tempos: Dict[str, float]):
+        for etapa, tempo in tempos.items():
+            self.etapas.setdefault(etapa, deque(maxlen=self.janela)).append(tempo)
+
+    def resumo(self) -> dict:
+        latencia = {}
+        for etapa in ETAPAS:
+            valores = self.etapas.get(etapa)
+            if not valores:
+                continue
+            ms = np.asarray(valores) * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            latencia[etapa] = {
+                "p50": round(p50, 1),
+                "p95": round(p95, 1),
+                "p99": round(p99, 1),
+                "maximo": round(ms.max(), 1),
+                "media": round(ms.mean(), 1),
+            }
+        return {
+            "pedidos": self.pedidos,
+            "coalescidos": self.coalescidos,
+            "erros": self.erros,
+            "amostras": len(self.etapas.get("total", ())),
+            "latencia_ms": latencia,
+        }
+
+
+class ServicoAlocacao:
+    """
+    Estado residente do serviço: equipes, índices de elegibilidade, pool de
+    processos e pedidos em andamento.
+
+    Args:
+        processos (int, optional): Tamanho do pool de solução. Defaults to os.cpu_count().
+        configuracao (ConfiguracaoSolver, optional): Parâmetros do solver; os núcleos são
+            divididos entre os processos do pool (ver `configuracao_solver.dividir_trabalhadores`).
+        tempo_limite (float, optional): Tempo padrão do solver por pedido. Defaults to TEMPO_LIMITE_PADRAO.
+        tempo_heuristica (float, optional): Tempo da heurística usada como dica (0 desativa). Defaults to 0.1.
+    """
+
+    def __init__(
+        self,
+        processos: Optional[int] = None,
+        configuracao: Optional[ConfiguracaoSolver] = None,
+        tempo_limite: float = TEMPO_LIMITE_PADRAO,
+        tempo_heuristica: float = 0.1,
+    ):
+        self.processos = processos or os.cpu_count() or 1
+        # Cada processo do pool resolve um pedido ao mesmo tempo que os demais
+        self.configuracao = dividir_trabalhadores(configuracao, self.processos)
+        self.tempo_limite = tempo_limite
+        self.tempo_heuristica = tempo_heuristica
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.equipes: "OrderedDict[str, Equipe]" = OrderedDict()
+        self.indices: "OrderedDict[Tuple[str, str], Tuple[TarefasColunares, IndiceElegibilidade]]" = OrderedDict()
+        self.em_andamento: Dict[str, asyncio.Future] = {}
+        self.metricas = MetricasLatencia()
+        self.inicio = time.time()
+
+    async def iniciar(self):
+        """Cria o pool e aquece cada processo antes do primeiro pedido."""
+        self.executor = ProcessPoolExecutor(self.processos)
+        laco = asyncio.get_running_loop()
+        await asyncio.gather(*(laco.run_in_executor(self.executor, _aquecer) for _ in range(self.processos)))
+
+    def encerrar(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def registrar_equipe(self, conteudo: bytes) -> Equipe:
+        """Lê (ou reaproveita) a equipe do CSV e a torna a padrão."""
+        chave = _resumo(conteudo)
+        equipe = self.equipes.get(chave)
+        if equipe is None:
+            try:
+                equipe = Equipe.de_csv(conteudo)
+            except (ValueError, KeyError) as erro:
+                raise ErroPedido(f"CSV de recursos inválido: {erro}") from erro
+            self.equipes[chave] = equipe
+            while len(self.equipes) > MAXIMO_EQUIPES:
+                antiga, _ = self.equipes.popitem(last=False)
+                for par in [par for par in self.indices if par[0] == antiga]:
+                    del self.indices[par]
+        self.equipes.move_to_end(chave)
+        return equipe
+
+    def equipe(self, chave: Optional[str] = None) -> Equipe:
+        """A equipe da chave (aceita um prefixo) ou, sem chave, a registrada por último."""
+        if not self.equipes:
+            raise ErroPedido("Nenhuma equipe registrada; envie o CSV de recursos em PUT /recursos")
+        if not chave:
+            return next(reversed(self.equipes.values()))
+        for candidata, equipe in self.equipes.items():
+            if candidata.startswith(chave):
+                return equipe
+        raise ErroPedido(f"Equipe desconhecida: {chave}", 404)
+
+    def tarefas_e_indice(self, equipe: Equipe, conteudo: bytes, tempos: Dict[str, float]):
+        """Tarefas (por prioridade) e índice de elegibilidade, reaproveitados enquanto o CSV não muda."""
+        par = (equipe.chave, _resumo(conteudo))
+        guardado = self.indices.get(par)
+        if guardado is not None:
+            self.indices.move_to_end(par)
+            return guardado
+        inicio = time.perf_counter()
+        try:
+            df = ler_csv(io.BytesIO(conteudo))
+            tarefas = TarefasColunares.de_dataframe(df, equipe.vocabulario).ordenar_por_prioridade()
+        except (ValueError, KeyError) as erro:
+            raise ErroPedido(f"CSV de tarefas inválido: {erro}") from erro
+        tempos["leitura"] = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        guardado = self.indices[par] = (tarefas, IndiceElegibilidade.de_dados(tarefas, equipe.recursos))
+        tempos["elegibilidade"] = time.perf_counter() - inicio
+        while len(self.indices) > MAXIMO_INDICES:
+            self.indices.popitem(last=False)
+        return guardado
+
+    async def alocar(self, conteudo: bytes, parametros: Dict[str, str]) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Atende um pedido de alocação.
+
+        Args:
+            conteudo (bytes): CSV de tarefas.
+            parametros (dict): objetivo, tempo_limite, peso_prioridade, peso_esforco, recursos.
+
+        Returns:
+            tuple: O CSV da distribuição e os cabeçalhos X-* da resposta.
+        """
+        inicio = time.perf_counter()
+        tempos: Dict[str, float] = {}
+        try:
+            objetivo = parametros.get("objetivo", OBJETIVO_PRIORIDADE_MAXIMA)
+            if objetivo not in OBJETIVOS:
+                raise ErroPedido(f"Objetivo desconhecido: {objetivo}")
+            pesos = {
+                "prioridade": int(parametros.get("peso_prioridade", 60)),
+                "esforco": int(parametros.get("peso_esforco", 40)),
+            }
+            tempo_limite = float(parametros.get("tempo_limite", self.tempo_limite))
+        except ValueError as erro:
+            raise ErroPedido(f"Parâmetro inválido: {erro}") from erro
+        equipe = self.equipe(parametros.get("recursos"))
+
+        # Pedidos idênticos em andamento compartilham a mesma solução
+        chave = _resumo(
+            json.dumps([equipe.chave, _resumo(conteudo), objetivo, pesos, tempo_limite], sort_keys=True).encode()
+        )
+        futuro = self.em_andamento.get(chave)
+        coalescido = futuro is not None
+        if coalescido:
+            self.metricas.coalescidos += 1
+        else:
+            futuro = asyncio.ensure_future(self._resolver(equipe, conteudo, objetivo, pesos, tempo_limite, tempos))
+            self.em_andamento[chave] = futuro
+            futuro.add_done_callback(lambda _: self.em_andamento.pop(chave, None))
+        resultado = await asyncio.shield(futuro)
+
+        tarefas, recursos = resultado["tarefas"], equipe.recursos
+        saida = distribuicao_dataframe(resultado["atribuicao"], tarefas, recursos).to_csv(
+            sep=";", index=False, encoding="utf-8"
+        )
+        tempos["total"] = time.perf_counter() - inicio
+        self.metricas.registrar(tempos)
+        logger.info(
+            "alocar %d tarefas: %s em %.0f ms%s",
+            len(tarefas),
+            resultado["status"],
+            tempos["total"] * 1000,
+            " (coalescido)" if coalescido else "",
+        )
+        cabecalhos = {
+            "X-Status": resultado["status"],
+            "X-Objetivo": str(resultado["objetivo"]),
+            "X-Recursos": equipe.chave[:16],
+            "X-Coalescido": "1" if coalescido else "0",
+            "X-Tempo-Ms": f"{tempos['total'] * 1000:.1f}",
+            "X-Tarefas-Atribuidas": str(int((resultado["atribuicao"] >= 0).sum())),
+        }
+        return saida.encode("utf-8"), cabecalhos
+
+    async def _resolver(self, equipe, conteudo, objetivo, pesos, tempo_limite, tempos) -> dict:
+        tarefas, indice = self.tarefas_e_indice(equipe, conteudo, tempos)
+        enviado = time.perf_counter()
+        resultado = await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            _resolver_no_processo,
+            tarefas,
+            equipe.recursos,
+            indice,
+            objetivo,
+            pesos,
+            tempo_limite,
+            self.configuracao,
+            self.tempo_heuristica,
+        )
+        # O que não foi construção nem solução foi espera no pool e transferência entre processos
+        tempos["construcao"], tempos["solucao"] = resultado["construcao"], resultado["solucao"]
+        tempos["fila"] = max(0.0, time.perf_counter() - enviado - resultado["construcao"] - resultado["solucao"])
+        resultado["tarefas"] = tarefas
+        return resultado
+
+    def saude(self) -> dict:
+        return {
+            "processos": self.processos,
+            "trabalhadores_por_processo": self.configuracao.trabalhadores,
+            "equipes": [{"chave": chave[:16], "recursos": len(e.recursos)} for chave, e in self.equipes.items()],
+            "indices": len(self.indices),
+            "em_andamento": len(self.em_andamento),
+            "ativo_ha_s": round(time.time() - self.inicio, 1),
+        }
+
+    async def atender(self, metodo: str, caminho: str, corpo: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        """Roteia um pedido HTTP; devolve (código, corpo, cabeçalhos)."""
+        endereco = urlsplit(caminho)
+        parametros = {nome: valores[-1] for nome, valores in parse_qs(endereco.query).items()}
+        rotas = {
+            "/alocar": ("POST",),
+            "/recursos": ("PUT", "POST"),
+            "/metricas": ("GET",),
+            "/saude": ("GET",),
+        }
+        if endereco.path not in rotas:
+            return _json(404, {"erro": f"Rota desconhecida: {endereco.path}"})
+        if metodo not in rotas[endereco.path]:
+            return _json(405, {"erro": f"Método {metodo} não aceito em {endereco.path}"})
+        try:
+            if endereco.path == "/alocar":
+                self.metricas.pedidos += 1
+                saida, cabecalhos = await self.alocar(corpo, parametros)
+                return 200, saida, {"Content-Type": "text/csv; charset=utf-8", **cabecalhos}
+            if endereco.path == "/recursos":
+                equipe = self.registrar_equipe(corpo)
+                return _json(200, {"chave": equipe.chave, "recursos": len(equipe.recursos)})
+            if endereco.path == "/metricas":
+                return _json(200, self.metricas.resumo())
+            return _json(200, self.saude())
+        except ErroPedido as erro:
+            self.metricas.erros += 1
+            return _json(erro.codigo, {"erro": str(erro)})
+        except Exception as erro:
+            self.metricas.erros += 1
+            logger.exception("Falha ao atender %s %s", metodo, caminho)
+            return _json(500, {"erro": f"{type(erro).__name__}: {erro}"})
+
+
+def _json(codigo: int, dados: dict) -> Tuple[int, bytes, Dict[str, str]]:
+    return codigo, json.dumps(dados, ensure_ascii=False).encode("utf-8"), {"Content-Type": "application/json"}
+
+
+async def _conexao(servico: ServicoAlocacao, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+    # Um pedido por conexão (Connection: close)
+    try:
+        linha = (await leitor.readline()).decode("latin-1").split()
+        if len(linha) != 3:
+            return
+        metodo, caminho, _ = linha
+        tamanho = 0
+        while True:
+            cabecalho = (await leitor.readline()).decode("latin-1").strip()
+            if not cabecalho:
+                break
+            nome, _, valor = cabecalho.partition(":")
+            if nome.strip().lower() == "content-length":
+                tamanho = int(valor)
+        corpo = await leitor.readexactly(tamanho) if tamanho else b""
+        codigo, saida, cabecalhos = await servico.atender(metodo.upper(), caminho, corpo)
+        cabecalhos = {**cabecalhos, "Content-Length": str(len(saida)), "Connection": "close"}
+        resposta = f"HTTP/1.1 {codigo} {MOTIVOS.get(codigo, '')}\r\n"
+        resposta += "".join(f"{nome}: {valor}\r\n" for nome, valor in cabecalhos.items())
+        escritor.write(resposta.encode("latin-1") + b"\r\n" + saida)
+        await escritor.drain()
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        escritor.close()
+
+
+async def servir(servico: ServicoAlocacao, host: str = "127.0.0.1", porta: int = PORTA_PADRAO):
+    """Aquece o pool e atende pedidos até ser interrompido."""
+    await servico.iniciar()
+    servidor = await asyncio.start_server(lambda l, e: _conexao(servico, l, e), host, porta)
+    logger.info("Serviço de alocação em http://%s:%d (%d processos)", host, porta, servico.processos)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servico.encerrar()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    servico = ServicoAlocacao(
+        processos=int(os.getenv("SERVICO_PROCESSOS", 0)) or None,
+        configuracao=configuracao_de_ambiente(),
+        tempo_limite=float(os.getenv("SERVICO_TEMPO_LIMITE", TEMPO_LIMITE_PADRAO)),
+        tempo_heuristica=float(os.getenv("SERVICO_TEMPO_HEURISTICA", 0.1)),
+    )
+    if os.getenv("CAMINHO_RECURSOS"):
+        # Equipe padrão já lida na partida
+        with open(os.getenv("CAMINHO_RECURSOS"), "rb") as arquivo:
+            servico.registrar_equipe(arquivo.read())
+    try:
+        asyncio.run(servir(servico, os.getenv("SERVICO_HOST", "127.0.0.1"), int(os.getenv("SERVICO_PORTA", PORTA_PADRAO))))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    main()
@@ -0,0 +1,61 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from carregamento import RecursosColunares
+from modelagem import ModeloAlocacao
+
+
+def classes_equivalencia(recursos: RecursosColunares, excluir=None) -> List[np.ndarray]:
+    """
+    Agrupa recursos intercambiáveis: mesmas habilidades e mesma disponibilidade.
+
+    Núcleo e nome não entram em nenhuma restrição ou objetivo, então trocar as
+    tarefas de dois recursos de uma mesma classe não altera a solução.
+
+    Args:
+        recursos (RecursosColunares): Os recursos.
+        excluir (array-like, optional): Índices de recursos que não devem entrar em
+            nenhuma classe (por exemplo, com atribuições fixadas). Defaults to None.
+
+    Returns:
+        List[np.ndarray]: Índices dos recursos de cada classe com dois ou mais membros.
+    """
+    chaves = pd.DataFrame({"mascara": recursos.mascara, "disponibilidade": recursos.disponibilidade})
+    classe = chaves.groupby(list(chaves.columns), sort=False).ngroup().to_numpy()
+    if excluir is not None:
+        classe = classe.copy()
+        classe[np.asarray(excluir, dtype=np.int64)] = -1
+
+    classes = []
+    for c in np.unique(classe[classe >= 0]):
+        membros = np.flatnonzero(classe == c)
+        if len(membros) > 1:
+            classes.append(membros)
+    return classes
+
+
+def aplicar_quebra_simetria(alocacao: ModeloAlocacao, excluir=None) -> int:
+    """
+    Impõe ordem lexicográfica de carga dentro de cada classe de recursos
+    intercambiáveis: carga(r1) >= carga(r2) >= ... >= carga(rk).
+
+    Qualquer solução pode ser permutada dentro da classe para satisfazer essa
+    ordem, então o ótimo não muda; o solver apenas deixa de explorar as k!
+    permutações equivalentes.
+
+    Args:
+        alocacao (ModeloAlocacao): O modelo com as restrições.
+        excluir (array-like, optional): Recursos fora da quebra de simetria. Defaults to None.
+
+    Returns:
+        int: Número de restrições adicionadas.
+    """
+    adicionadas = 0
+    for membros in classes_equivalencia(alocacao.recursos, excluir):
+        cargas = [alocacao.expressao_carga(r) for r in membros]
+        for anterior, seguinte in zip(cargas, cargas[1:]):
+            alocacao.modelo.Add(anterior >= seguinte)
+            adicionadas += 1
+    return adicionadas
@@ -0,0 +1,23 @@
+import pytest
+
+from instancias import gravar_csv
+
+
+@pytest.fixture
+def gravar_entradas(tmp_path):
+    """Grava tarefas (esforço, prioridade, habilidades) e recursos (disponibilidade, habilidades) em CSV."""
+
+    def gravar(tarefas, recursos):
+        caminho_tarefas = gravar_csv(
+            tmp_path / "tarefas.csv",
+            [(n, "G", "C", e, p, h) for n, (e, p, h) in enumerate(tarefas, start=1)],
+            ["nota", "grupo", "codigo", "esforco", "prioridade", "habilidades"],
+        )
+        caminho_recursos = gravar_csv(
+            tmp_path / "recursos.csv",
+            [(f"R{r}", f"Recurso {r}", "N", d, h) for r, (d, h) in enumerate(recursos, start=1)],
+            ["matricula", "nome", "nucleo", "disponibilidade", "habilidades"],
+        )
+        return caminho_tarefas, caminho_recursos
+
+    return gravar
@@ -0,0 +1,95 @@
+"""Instâncias pequenas e o ótimo do CP-SAT, usados como referência nos testes."""
+
+import numpy as np
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from carregamento import RecursosColunares, TarefasColunares
+from modelagem import construir_modelo
+
+HABILIDADES = ("A", "B", "C")
+
+
+def criar_tarefas(linhas, primeira_nota: int = 1) -> TarefasColunares:
+    """Tarefas a partir de tuplas (esforço, prioridade, habilidades), com nota 1, 2, ..."""
+    return TarefasColunares.de_dataframe(
+        pd.DataFrame(
+            {
+                "nota": np.arange(primeira_nota, primeira_nota + len(linhas)),
+                "grupo": "G",
+                "codigo": "C",
+                "esforco": [esforco for esforco, _, _ in linhas],
+                "prioridade": [prioridade for _, prioridade, _ in linhas],
+                "habilidades": [habilidades for _, _, habilidades in linhas],
+            }
+        )
+    )
+
+
+def criar_recursos(linhas) -> RecursosColunares:
+    """Recursos a partir de tuplas (disponibilidade, habilidades), com matrícula R1, R2, ..."""
+    return RecursosColunares.de_dataframe(
+        pd.DataFrame(
+            {
+                "matricula": [f"R{r}" for r in range(1, len(linhas) + 1)],
+                "nome": [f"Recurso {r}" for r in range(1, len(linhas) + 1)],
+                "nucleo": "N",
+                "disponibilidade": [disponibilidade for disponibilidade, _ in linhas],
+                "habilidades": [habilidades for _, habilidades in linhas],
+            }
+        )
+    )
+
+
+def instancia_aleatoria(semente: int, num_tarefas: int = 12, num_recursos: int = 3, distintas: int = 0):
+    """
+    Tarefas e recursos aleatórios, com esforços e prioridades repetidos e
+    recursos apertados. Com `distintas`, as tarefas são sorteadas entre esse
+    número de tarefas idênticas (mesmas habilidades, esforço e prioridade).
+    """
+    gerador = np.random.default_rng(semente)
+
+    def habilidades(maximo):
+        quantidade = int(gerador.integers(1, maximo + 1))
+        return ",".join(sorted(gerador.choice(HABILIDADES, quantidade, replace=False)))
+
+    tipos = [
+        (int(gerador.integers(1, 9)), int(gerador.integers(0, 4)), habilidades(2))
+        for _ in range(distintas or num_tarefas)
+    ]
+    if distintas:
+        tipos = [tipos[i] for i in gerador.integers(0, distintas, num_tarefas).tolist()]
+    tarefas = criar_tarefas(tipos)
+    recursos = criar_recursos([(int(gerador.integers(0, 16)), habilidades(3)) for _ in range(num_recursos)])
+    return tarefas, recursos
+
+
+def resolver_otimo(alocacao, tempo_limite: float = 30.0):
+    """Resolve o modelo até o ótimo, com um só worker para o resultado não depender da máquina."""
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = tempo_limite
+    solver.parameters.num_workers = 1
+    status = solver.Solve(alocacao.modelo)
+    assert status == cp_model.OPTIMAL, solver.StatusName(status)
+    return solver
+
+
+def valor_otimo(tarefas, recursos, objetivo, pesos=None, **opcoes) -> int:
+    """Valor ótimo do modelo completo, sem redução nem agregação."""
+    return round(resolver_otimo(construir_modelo(tarefas, recursos, objetivo, pesos, **opcoes)).ObjectiveValue())
+
+
+def gravar_csv(caminho, linhas, colunas):
+    """Grava um CSV de entrada no formato do projeto (UTF-8, separador ';')."""
+    pd.DataFrame(linhas, columns=colunas).to_csv(caminho, sep=";", index=False)
+    return str(caminho)
+
+
+def conferir_atribuicao(atribuicao, tarefas, recursos):
+    """Cada tarefa atribuída vai a um recurso com as suas habilidades, sem passar da disponibilidade."""
+    atribuicao = np.asarray(atribuicao)
+    atribuidas = np.flatnonzero(atribuicao >= 0)
+    assert len(atribuicao) == len(tarefas)
+    assert (tarefas.mascara[atribuidas] & ~recursos.mascara[atribuicao[atribuidas]] == 0).all()
+    carga = np.bincount(atribuicao[atribuidas], weights=tarefas.esforco[atribuidas], minlength=len(recursos))
+    assert (carga <= recursos.disponibilidade).all()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from agregacao import agrupar_tarefas, desagregar
+from elegibilidade import IndiceElegibilidade
+from heuristica import valor_objetivo
+from instancias import conferir_atribuicao, criar_recursos, criar_tarefas, instancia_aleatoria, resolver_otimo, valor_otimo
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA, construir_modelo
+
+
+@pytest.mark.parametrize("objetivo", [OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA])
+@pytest.mark.parametrize("semente", range(5))
+def test_modelo_agregado_tem_o_mesmo_otimo(semente, objetivo):
+    tarefas, recursos = instancia_aleatoria(semente, num_tarefas=24, distintas=6)
+    alocacao = construir_modelo(tarefas, recursos, objetivo, agregado=True)
+    assert len(alocacao.classes) < len(tarefas)
+    solver = resolver_otimo(alocacao)
+    assert round(solver.ObjectiveValue()) == valor_otimo(tarefas, recursos, objetivo)
+
+    # A desagregação é viável e tem o valor do modelo agregado
+    atribuicao = alocacao.atribuicao(solver)
+    conferir_atribuicao(atribuicao, tarefas, recursos)
+    assert valor_objetivo(atribuicao, tarefas, recursos, objetivo) == round(solver.ObjectiveValue())
+
+
+def test_desagregar_respeita_as_contagens_e_a_preferencia():
+    tarefas = criar_tarefas([(2, 0, "A"), (3, 1, "A"), (2, 0, "A"), (2, 0, "A")])
+    recursos = criar_recursos([(10, "A"), (10, "A")])
+    classes = agrupar_tarefas(tarefas)
+    assert classes.tamanho.tolist() == [3, 1]
+    indice = IndiceElegibilidade.de_dados(classes.representantes, recursos)
+    # Pares (classe, recurso): (0, 0), (0, 1), (1, 0), (1, 1)
+    contagens = np.array([1, 1, 0, 1])
+
+    atribuicao = desagregar(contagens, classes, indice)
+    # Os primeiros membros de cada classe, na ordem original, vão para o primeiro recurso com contagem
+    assert atribuicao.tolist() == [0, 1, 1, -1]
+
+    preferencia = np.array([-1, -1, 1, 0])
+    atribuicao = desagregar(contagens, classes, indice, preferencia)
+    assert atribuicao.tolist() == [-1, 1, 1, 0]
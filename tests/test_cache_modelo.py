@@ -0,0 +1,100 @@
+import pickle
+
+import ortools.sat.cp_model_pb2 as cp_model_pb2
+import pytest
+from ortools.sat.python import cp_model
+
+from cache_modelo import CacheModelos, chave_modelo
+from instancias import conferir_atribuicao, instancia_aleatoria, resolver_otimo
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA, construir_modelo
+
+
+def proto_sem_nomes(modelo, caminho) -> cp_model_pb2.CpModelProto:
+    # O cache não guarda os nomes das variáveis
+    modelo.ExportToFile(str(caminho))
+    proto = cp_model_pb2.CpModelProto()
+    proto.ParseFromString(caminho.read_bytes())
+    for variavel in proto.variables:
+        variavel.ClearField("name")
+    return proto
+
+
+@pytest.mark.parametrize(
+    "objetivo,opcoes",
+    [
+        (OBJETIVO_ESFORCO_MAXIMO, {}),
+        (OBJETIVO_PRIORIDADE_MAXIMA, {}),
+        (OBJETIVO_PRIORIDADE_MAXIMA, {"enxuto": True}),
+        (OBJETIVO_ESFORCO_MAXIMO, {"agregado": True}),
+        (OBJETIVO_PRIORIDADE_MAXIMA, {"simetria": True}),
+    ],
+)
+def test_modelo_do_cache_igual_ao_construido(tmp_path, objetivo, opcoes):
+    tarefas, recursos = instancia_aleatoria(0, num_tarefas=20, distintas=8)
+    cache = CacheModelos(str(tmp_path))
+    cache.salvar("modelo", construir_modelo(tarefas, recursos, objetivo, **opcoes))
+
+    construido = construir_modelo(tarefas, recursos, objetivo, **opcoes)
+    restaurado = cache.carregar("modelo")
+    assert type(restaurado) is type(construido)
+    caminho = tmp_path / "modelo.pb"
+    assert proto_sem_nomes(restaurado.modelo, caminho) == proto_sem_nomes(construido.modelo, caminho)
+    # Só as variáveis: as expressões (esforço no objetivo de esforço máximo) não completam dicas
+    variaveis = {nome for nome, v in construido.componentes.items() if isinstance(v, cp_model.IntVar)}
+    assert set(restaurado.componentes) == variaveis
+    assert len(restaurado.cargas) == len(construido.cargas)
+
+    solver = resolver_otimo(restaurado)
+    assert solver.ObjectiveValue() == resolver_otimo(construido).ObjectiveValue()
+    atribuicao = restaurado.atribuicao(solver)
+    conferir_atribuicao(atribuicao, restaurado.tarefas_da_atribuicao(), recursos)
+    assert (restaurado.tarefas_da_atribuicao().nota == tarefas.nota).all()
+
+
+def test_restricoes_fora_das_colunas_mantem_a_ordem(tmp_path):
+    tarefas, recursos = instancia_aleatoria(1, num_tarefas=10)
+    alocacao = construir_modelo(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA)
+    modelo, x = alocacao.modelo, alocacao.variaveis
+    # Condicionada, com nome e de outro tipo, entre restrições que vão para as colunas
+    modelo.add(x[0] + x[1] <= 1).only_enforce_if(x[2])
+    modelo.add_bool_or([x[0], x[3].Not()])
+    modelo.add_at_most_one([x[1], x[4]]).with_name("nomeada")
+    modelo.add_all_different([modelo.new_int_var(0, 3, ""), modelo.new_int_var(0, 3, "")])
+    modelo.add_exactly_one([x[2], x[5]])
+    caminho = tmp_path / "modelo.pb"
+    esperado = proto_sem_nomes(modelo, caminho)
+
+    cache = CacheModelos(str(tmp_path))
+    cache.salvar("modelo", alocacao)
+    assert proto_sem_nomes(cache.carregar("modelo").modelo, caminho) == esperado
+
+
+def test_chave_muda_com_entradas_e_opcoes(gravar_entradas):
+    caminhos = gravar_entradas([(2, 0, "A")], [(5, "A")])
+    chave = chave_modelo(caminhos, objetivo=OBJETIVO_ESFORCO_MAXIMO, agregado=False)
+    assert chave == chave_modelo(caminhos, agregado=False, objetivo=OBJETIVO_ESFORCO_MAXIMO)
+    assert chave != chave_modelo(caminhos, objetivo=OBJETIVO_ESFORCO_MAXIMO, agregado=True)
+    gravar_entradas([(3, 0, "A")], [(5, "A")])
+    assert chave != chave_modelo(caminhos, objetivo=OBJETIVO_ESFORCO_MAXIMO, agregado=False)
+
+
+def test_arquivo_de_outra_versao_e_descartado(tmp_path):
+    tarefas, recursos = instancia_aleatoria(0)
+    cache = CacheModelos(str(tmp_path))
+    caminho = cache.salvar("modelo", construir_modelo(tarefas, recursos))
+    with open(caminho, "rb") as arquivo:
+        dados = pickle.load(arquivo)
+    with open(caminho, "wb") as arquivo:
+        pickle.dump(dict(dados, versao=-1), arquivo)
+    assert cache.carregar("modelo") is None
+    assert cache.listar() == []
+
+
+def test_limite_remove_os_mais_antigos(tmp_path):
+    tarefas, recursos = instancia_aleatoria(0)
+    cache = CacheModelos(str(tmp_path), limite_mb=0.0)
+    cache.salvar("antigo", construir_modelo(tarefas, recursos))
+    cache.salvar("novo", construir_modelo(tarefas, recursos))
+    assert [entrada["chave"] for entrada in cache.listar()] == ["novo"]
+    assert cache.invalidar("no") == 1
+    assert cache.carregar("novo") is None
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from carregamento import MAXIMO_HABILIDADES, Vocabulario, carregar_dados
+from elegibilidade import IndiceElegibilidade
+
+
+def test_mascaras_compartilham_o_vocabulario(gravar_entradas):
+    caminhos = gravar_entradas([(3, 2, "VAR, EXP"), (1, 0, ""), (2, 1, "EXP,VAR")], [(8, "COM,VAR,EXP"), (4, "EXP")])
+    vocabulario = Vocabulario()
+    tarefas, recursos = carregar_dados(*caminhos, vocabulario)
+    assert len(vocabulario) == 3
+    # Mesmo conjunto em outra ordem (e com espaços) dá a mesma máscara
+    assert tarefas.mascara[0] == tarefas.mascara[2] == vocabulario.mascara(["VAR", "EXP"])
+    assert tarefas.mascara[1] == 0
+    assert (tarefas.mascara & ~recursos.mascara[0] == 0).all()
+    assert tarefas.tarefa(0).habilidades == ["VAR", "EXP"]
+
+
+def test_ordenar_por_prioridade_e_estavel(gravar_entradas):
+    caminhos = gravar_entradas([(3, 2, "A"), (1, 0, "A"), (2, 2, "B"), (4, 0, "B")], [(8, "A")])
+    tarefas, _ = carregar_dados(*caminhos, Vocabulario())
+    ordenadas = tarefas.ordenar_por_prioridade()
+    assert ordenadas.nota.tolist() == [2, 4, 1, 3]
+    assert (ordenadas.esforco == np.array([1, 4, 3, 2])).all()
+
+
+def test_limite_de_habilidades():
+    vocabulario = Vocabulario()
+    vocabulario.mascara([f"H{i}" for i in range(MAXIMO_HABILIDADES)])
+    assert vocabulario.mascara(["H62"]) == 1 << 62
+    with pytest.raises(ValueError):
+        vocabulario.bit("nova")
+
+
+def test_vocabulario_fechado_nao_registra_habilidades():
+    vocabulario = Vocabulario()
+    recursos = vocabulario.mascaras(["A,B", "A"])
+    vocabulario.fechar()
+    tarefas = vocabulario.mascaras(["A", "B,Z", "Y"])
+    assert len(vocabulario) == 2
+    indice = IndiceElegibilidade.construir(tarefas, recursos)
+    assert indice.num_elegiveis_por_tarefa().tolist() == [2, 0, 0]
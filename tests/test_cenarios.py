@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from cenarios import Cenario, executar_cenarios, grade_cenarios, marcar_pareto
+from configuracao_solver import ConfiguracaoSolver
+from instancias import instancia_aleatoria, valor_otimo
+from modelagem import OBJETIVO_PRIORIDADE_MAXIMA
+
+
+def test_grade_sem_proporcoes_repetidas():
+    grade = grade_cenarios([80, 60, 80, 100], [5, 5.0, 10])
+    assert grade == [Cenario(p, 100 - p, t) for p in (80, 60, 100) for t in (5.0, 10.0)]
+    with pytest.raises(ValueError):
+        grade_cenarios([120], [5])
+
+
+def test_marcar_pareto():
+    tabela = pd.DataFrame({"score_prioridade": [10, 8, 10, 5, None], "esforco_atribuido": [4, 6, 3, 6, 9]})
+    assert marcar_pareto(tabela).tolist() == [True, True, False, False, False]
+
+
+def test_cenarios_em_paralelo_chegam_ao_otimo():
+    tarefas, recursos = instancia_aleatoria(2)
+    cenarios = grade_cenarios([100, 70, 30], [10.0])
+    tabela = executar_cenarios(
+        tarefas, recursos, cenarios, processos=2, tempo_heuristica=0.0, configuracao=ConfiguracaoSolver(trabalhadores=1)
+    )
+    assert (tabela["status"] == "OPTIMAL").all()
+    for cenario, objetivo in zip(cenarios, tabela["objetivo"]):
+        pesos = {"prioridade": cenario.peso_prioridade, "esforco": cenario.peso_esforco}
+        assert round(objetivo) == valor_otimo(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, pesos)
+    assert tabela["pareto"].any()
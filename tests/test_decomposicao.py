@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from configuracao_solver import ConfiguracaoSolver
+from decomposicao import decompor, resolver_decomposto
+from elegibilidade import IndiceElegibilidade
+from heuristica import valor_objetivo
+from instancias import conferir_atribuicao, criar_recursos, criar_tarefas, valor_otimo
+from modelagem import OBJETIVO_PRIORIDADE_MAXIMA
+
+
+def instancia_separavel(semente):
+    """Tarefas e recursos de uma habilidade só: uma componente por habilidade, mais uma tarefa sem recurso."""
+    gerador = np.random.default_rng(semente)
+    linhas = [
+        (int(gerador.integers(1, 7)), int(gerador.integers(0, 4)), str(gerador.choice(["A", "B", "C"])))
+        for _ in range(15)
+    ]
+    tarefas = criar_tarefas(linhas + [(2, 0, "D")])
+    recursos = criar_recursos([(int(gerador.integers(3, 12)), h) for h in ("A", "A", "B", "C", "C")])
+    return tarefas, recursos
+
+
+def test_subproblemas_independentes():
+    tarefas, recursos = instancia_separavel(0)
+    subproblemas = decompor(tarefas, recursos)
+    assert len(subproblemas) == 3
+    indice = IndiceElegibilidade.de_dados(tarefas, recursos)
+    vistas = np.concatenate([s.tarefas for s in subproblemas])
+    assert len(vistas) == len(np.unique(vistas)) == len(tarefas) - 1
+    for s in subproblemas:
+        for t in s.tarefas.tolist():
+            assert np.isin(indice.recursos_da_tarefa(t), s.recursos).all()
+
+    with pytest.raises(ValueError):
+        decompor(tarefas, recursos, "desconhecido")
+
+
+@pytest.mark.parametrize("semente", range(3))
+def test_prioridade_maxima_decomposta_e_exata(semente):
+    tarefas, recursos = instancia_separavel(semente)
+    resultado = resolver_decomposto(
+        tarefas,
+        recursos,
+        OBJETIVO_PRIORIDADE_MAXIMA,
+        tempo_limite=10.0,
+        processos=2,
+        configuracao=ConfiguracaoSolver(trabalhadores=1),
+    )
+    assert resultado.status == cp_model.OPTIMAL
+    conferir_atribuicao(resultado.atribuicao, tarefas, recursos)
+    valor = valor_objetivo(resultado.atribuicao, tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA)
+    assert valor == valor_otimo(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA)
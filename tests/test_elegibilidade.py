@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from elegibilidade import IndiceElegibilidade
+
+
+def pares_esperados(mascaras_tarefas, mascaras_recursos):
+    return [
+        (t, r)
+        for t, mt in enumerate(mascaras_tarefas.tolist())
+        for r, mr in enumerate(mascaras_recursos.tolist())
+        if mt & ~mr == 0
+    ]
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_pares_iguais_aos_da_matriz_completa(semente):
+    gerador = np.random.default_rng(semente)
+    mascaras_tarefas = gerador.integers(0, 16, 50)
+    mascaras_recursos = gerador.integers(0, 16, 7)
+    indice = IndiceElegibilidade.construir(mascaras_tarefas, mascaras_recursos)
+
+    assert list(zip(indice.par_tarefa.tolist(), indice.par_recurso.tolist())) == pares_esperados(
+        mascaras_tarefas, mascaras_recursos
+    )
+    for t in range(len(mascaras_tarefas)):
+        assert (indice.par_tarefa[list(indice.pares_da_tarefa(t))] == t).all()
+    for r in range(len(mascaras_recursos)):
+        assert (indice.par_recurso[indice.pares_do_recurso(r)] == r).all()
+    assert indice.num_elegiveis_por_tarefa().sum() == len(indice)
+
+
+def test_filtrar_e_localizar_pares():
+    indice = IndiceElegibilidade.construir(np.array([1, 3, 4]), np.array([1, 3, 7]))
+    # Pares: (0, 0), (0, 1), (0, 2), (1, 1), (1, 2), (2, 2)
+    assert indice.localizar_pares([0, 1, 1, 2], [2, 0, 2, 2]).tolist() == [2, -1, 4, 5]
+
+    filtrado = indice.filtrar([True, False, True, False, True, False])
+    assert list(zip(filtrado.par_tarefa.tolist(), filtrado.par_recurso.tolist())) == [(0, 0), (0, 2), (1, 2)]
+    assert filtrado.num_elegiveis_por_tarefa().tolist() == [2, 1, 0]
+    assert filtrado.recursos_com_pares().tolist() == [0, 2]
+    assert filtrado.tarefas_do_recurso(2).tolist() == [0, 1]
+
+
+def test_sem_tarefas_ou_recursos():
+    assert len(IndiceElegibilidade.construir(np.array([], dtype=np.int64), np.array([1]))) == 0
+    indice = IndiceElegibilidade.construir(np.array([1, 2]), np.array([], dtype=np.int64))
+    assert len(indice) == 0
+    assert indice.num_elegiveis_por_tarefa().tolist() == [0, 0]
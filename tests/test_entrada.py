@@ -0,0 +1,31 @@
+from alocacao.entrada import COLUNAS_TAREFAS, estimar_modelo, validar_entradas
+from instancias import gravar_csv
+
+
+def test_chave_repetida_e_aviso(gravar_entradas):
+    caminho_tarefas, caminho_recursos = gravar_entradas([(2, 0, "A")], [(5, "A"), (5, "A")])
+    caminho_tarefas = gravar_csv(
+        caminho_tarefas, [(1, "G", "C", 2, 0, "A"), (1, "G", "C", 3, 1, "A")], list(COLUNAS_TAREFAS)
+    )
+    resumos = validar_entradas(caminho_tarefas, caminho_recursos)
+    assert resumos["tarefas"].valido
+    assert resumos["tarefas"].total_avisos == 1
+    assert "nota repetida" in resumos["tarefas"].avisos[0]
+
+
+def test_valor_invalido_e_erro(gravar_entradas):
+    caminho_tarefas, caminho_recursos = gravar_entradas([(2, 0, "A")], [(-1, "A")])
+    resumos = validar_entradas(caminho_tarefas, caminho_recursos)
+    assert resumos["tarefas"].valido
+    assert not resumos["recursos"].valido
+    assert "disponibilidade negativo" in resumos["recursos"].erros[0]
+
+
+def test_estimativa_conta_os_pares_elegiveis(gravar_entradas):
+    caminho_tarefas, caminho_recursos = gravar_entradas(
+        [(2, 0, "A"), (2, 0, "A,B"), (2, 0, "C")], [(5, "A"), (5, "A,B"), (5, "B")]
+    )
+    resumos = validar_entradas(caminho_tarefas, caminho_recursos)
+    estimativa = estimar_modelo(resumos["tarefas"], resumos["recursos"], "prioridade_maxima")
+    assert estimativa["pares"] == 3
+    assert estimativa["tarefas_sem_recurso"] == 1
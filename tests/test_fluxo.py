@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("prefect")
+
+from prefect.settings import PREFECT_LOCAL_STORAGE_PATH, temporary_settings
+from prefect.testing.utilities import prefect_test_harness
+
+from decomposicao import DECOMPOSICAO_COMPONENTES
+from fluxo import fluxo_alocacao
+from instancias import criar_recursos, criar_tarefas, valor_otimo
+from modelagem import OBJETIVO_PRIORIDADE_MAXIMA
+
+TAREFAS = [(3, 2, "A"), (4, 1, "A"), (2, 0, "A"), (5, 2, "B"), (2, 1, "B"), (3, 0, "B")]
+RECURSOS = [(6, "A"), (7, "B")]
+
+
+@pytest.fixture(scope="module")
+def prefect_local(tmp_path_factory):
+    with prefect_test_harness(), temporary_settings({PREFECT_LOCAL_STORAGE_PATH: tmp_path_factory.mktemp("prefect")}):
+        yield
+
+
+def test_fluxo_com_decomposicao_exporta_o_plano(prefect_local, gravar_entradas, tmp_path, monkeypatch):
+    monkeypatch.setenv("SOLVER_TRABALHADORES", "1")
+    caminho_tarefas, caminho_recursos = gravar_entradas(TAREFAS, RECURSOS)
+    pesos = {"prioridade": 60, "esforco": 40}
+    resultado = fluxo_alocacao(
+        caminho_tarefas,
+        caminho_recursos,
+        pesos=pesos,
+        tempo_limite=10.0,
+        decomposicao=DECOMPOSICAO_COMPONENTES,
+        caminho_saida=str(tmp_path / "distribuicao.csv"),
+    )
+    assert resultado["status"] == "OPTIMAL"
+    esperado = valor_otimo(criar_tarefas(TAREFAS), criar_recursos(RECURSOS), OBJETIVO_PRIORIDADE_MAXIMA, pesos)
+    assert round(resultado["objetivo"]) == esperado
+    assert (tmp_path / "distribuicao.csv").exists()
+    assert (tmp_path / "distribuicao.parametros.json").exists()
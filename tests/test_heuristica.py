@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from heuristica import resolver_heuristica, valor_objetivo
+from instancias import conferir_atribuicao, instancia_aleatoria, resolver_otimo, valor_otimo
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA, construir_modelo
+
+OBJETIVOS = [OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA]
+
+
+@pytest.mark.parametrize("objetivo", OBJETIVOS)
+@pytest.mark.parametrize("semente", range(6))
+def test_heuristica_viavel_e_abaixo_do_otimo(semente, objetivo):
+    tarefas, recursos = instancia_aleatoria(semente, num_tarefas=16, num_recursos=4)
+    resultado = resolver_heuristica(tarefas, recursos, objetivo, tempo_limite=1.0)
+    conferir_atribuicao(resultado.atribuicao, tarefas, recursos)
+    assert resultado.objetivo == valor_objetivo(resultado.atribuicao, tarefas, recursos, objetivo)
+    assert resultado.objetivo_guloso <= resultado.objetivo <= valor_otimo(tarefas, recursos, objetivo)
+
+
+@pytest.mark.parametrize("objetivo", OBJETIVOS)
+def test_valor_objetivo_igual_ao_do_cp_sat(objetivo):
+    tarefas, recursos = instancia_aleatoria(3)
+    alocacao = construir_modelo(tarefas, recursos, objetivo)
+    solver = resolver_otimo(alocacao)
+    atribuicao = alocacao.atribuicao(solver)
+    assert valor_objetivo(atribuicao, tarefas, recursos, objetivo) == round(solver.ObjectiveValue())
+
+
+def test_busca_local_parte_da_atribuicao_inicial():
+    tarefas, recursos = instancia_aleatoria(2, num_tarefas=16, num_recursos=4)
+    inicial = np.full(len(tarefas), -1, dtype=np.int64)
+    resultado = resolver_heuristica(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, tempo_limite=1.0, inicial=inicial)
+    conferir_atribuicao(resultado.atribuicao, tarefas, recursos)
+    assert resultado.objetivo_guloso == 0
+    assert resultado.objetivo > 0
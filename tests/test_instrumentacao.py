@@ -0,0 +1,28 @@
+import json
+import math
+
+from instrumentacao import tempo_ate_gap, tempos_ate_gap
+
+
+def test_tempos_ate_gap_usa_o_primeiro_instante_de_cada_limiar():
+    registros = [
+        {"evento": "limite", "tempo": 0.5, "limite": 200},
+        {"evento": "solucao", "tempo": 1.0, "objetivo": 100, "limite": 150},
+        {"evento": "limite", "tempo": 2.0, "limite": 104},
+        {"evento": "solucao", "tempo": 3.0, "objetivo": 104, "limite": 104},
+        {"evento": "inicio", "tempo": 0.0},
+    ]
+    assert tempos_ate_gap(registros, (0.5, 0.05, 0.0, -1)) == {0.5: 1.0, 0.05: 2.0, 0.0: 3.0, -1: None}
+
+
+def test_tempo_ate_gap_separa_as_execucoes(tmp_path):
+    registros = [
+        {"evento": "solucao", "execucao": "a", "tempo": 1.0, "objetivo": 10, "limite": 10},
+        {"evento": "solucao", "execucao": "b", "tempo": 2.0, "objetivo": 10, "limite": 20},
+        {"evento": "inicio", "execucao": "c", "tempo": 0.0},
+    ]
+    caminho = tmp_path / "telemetria.jsonl"
+    caminho.write_text("".join(json.dumps(r) + "\n" for r in registros), encoding="utf-8")
+    tabela = tempo_ate_gap(caminho, (0.0,))
+    assert tabela["execucao"].tolist() == ["a", "b"]
+    assert tabela["gap_0"].iloc[0] == 1.0 and math.isnan(tabela["gap_0"].iloc[1])
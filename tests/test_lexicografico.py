@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from configuracao_solver import ConfiguracaoSolver
+from heuristica import valor_tarefas
+from instancias import conferir_atribuicao, instancia_aleatoria, valor_otimo
+from lexicografico import ETAPA_ESFORCO, ETAPA_PRIORIDADE, ETAPAS_PADRAO, resolver_lexicografico
+from modelagem import OBJETIVO_PRIORIDADE_MAXIMA, aplicar_restricoes
+
+SOMENTE_PRIORIDADE = {"prioridade": 1, "esforco": 0}
+SOMENTE_ESFORCO = {"prioridade": 0, "esforco": 1}
+CONFIGURACAO = ConfiguracaoSolver(trabalhadores=1)
+
+
+def valores(atribuicao, tarefas, recursos):
+    """Score de prioridade, esforço atribuído e diferença entre a maior e a menor carga."""
+    atribuidas = atribuicao >= 0
+    prioridade = int(valor_tarefas(tarefas, OBJETIVO_PRIORIDADE_MAXIMA, SOMENTE_PRIORIDADE)[atribuidas].sum())
+    carga = np.bincount(atribuicao[atribuidas], weights=tarefas.esforco[atribuidas], minlength=len(recursos))
+    return prioridade, int(carga.sum()), int(carga.max() - carga.min())
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_etapas_em_ordem_de_importancia(semente):
+    tarefas, recursos = instancia_aleatoria(semente)
+    alocacao = aplicar_restricoes(cp_model.CpModel(), tarefas, recursos)
+    resultado = resolver_lexicografico(alocacao, 30.0, ETAPAS_PADRAO, configuracao=CONFIGURACAO)
+    assert resultado.status == cp_model.OPTIMAL
+    conferir_atribuicao(resultado.atribuicao, tarefas, recursos)
+
+    prioridade, esforco, balanceamento = valores(resultado.atribuicao, tarefas, recursos)
+    assert [etapa.valor for etapa in resultado.etapas] == [prioridade, esforco, balanceamento]
+    # A primeira etapa é o ótimo só da prioridade
+    assert prioridade == valor_otimo(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, SOMENTE_PRIORIDADE)
+    # A segunda, o maior esforço entre os planos de prioridade ótima: peso da prioridade acima de todo o esforço
+    peso = int(tarefas.esforco.sum()) + 1
+    pesos = {"prioridade": peso, "esforco": 1}
+    assert esforco == valor_otimo(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, pesos) - peso * prioridade
+
+
+def test_ordem_das_etapas_muda_o_resultado():
+    tarefas, recursos = instancia_aleatoria(1)
+    resultados = {}
+    for etapas in [(ETAPA_PRIORIDADE, ETAPA_ESFORCO), (ETAPA_ESFORCO, ETAPA_PRIORIDADE)]:
+        alocacao = aplicar_restricoes(cp_model.CpModel(), tarefas, recursos)
+        resultado = resolver_lexicografico(alocacao, 30.0, etapas, configuracao=CONFIGURACAO)
+        resultados[etapas[0]] = valores(resultado.atribuicao, tarefas, recursos)
+    assert resultados[ETAPA_ESFORCO][1] == valor_otimo(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, SOMENTE_ESFORCO)
+    assert resultados[ETAPA_PRIORIDADE][0] >= resultados[ETAPA_ESFORCO][0]
+    assert resultados[ETAPA_ESFORCO][1] >= resultados[ETAPA_PRIORIDADE][1]
+
+
+def test_tolerancia_limita_a_perda_das_etapas_anteriores():
+    tarefas, recursos = instancia_aleatoria(4)
+    alocacao = aplicar_restricoes(cp_model.CpModel(), tarefas, recursos)
+    resultado = resolver_lexicografico(alocacao, 30.0, ETAPAS_PADRAO, tolerancia=0.2, configuracao=CONFIGURACAO)
+    prioridade, esforco, _ = valores(resultado.atribuicao, tarefas, recursos)
+    assert prioridade >= resultado.etapas[0].valor - int(resultado.etapas[0].valor * 0.2)
+    assert esforco >= resultado.etapas[1].valor - int(resultado.etapas[1].valor * 0.2)
+
+
+def test_etapa_desconhecida():
+    tarefas, recursos = instancia_aleatoria(0)
+    with pytest.raises(ValueError):
+        resolver_lexicografico(aplicar_restricoes(cp_model.CpModel(), tarefas, recursos), 1.0, ("custo",))
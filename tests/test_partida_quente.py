@@ -0,0 +1,65 @@
+import pytest
+from ortools.sat.python import cp_model
+
+from heuristica import resolver_heuristica, valor_objetivo
+from instancias import (
+    conferir_atribuicao,
+    criar_recursos,
+    criar_tarefas,
+    gravar_csv,
+    instancia_aleatoria,
+    resolver_otimo,
+    valor_otimo,
+)
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA, construir_modelo
+from partida_quente import aplicar_dicas, aplicar_partida_quente, atribuicao_viavel
+
+TAREFAS = [(4, 1, "A"), (3, 0, "A"), (2, 2, "B"), (5, 0, "B"), (1, 3, "A,B")]
+RECURSOS = [(6, "A"), (5, "A,B"), (4, "B")]
+
+
+def test_atribuicao_viavel_descarta_o_que_nao_cabe():
+    tarefas, recursos = criar_tarefas(TAREFAS), criar_recursos(RECURSOS)
+    # A tarefa 2 (B) não é elegível ao recurso 0 (A); no recurso 0, a 0 (prioridade 1) não cabe
+    # depois da 1 (prioridade 0); a 3 (esforço 5) não cabe no recurso 2 (disponibilidade 4)
+    anterior = atribuicao_viavel([0, 0, 0, 2, 1], tarefas, recursos)
+    assert anterior.tolist() == [-1, 0, -1, -1, 1]
+    conferir_atribuicao(anterior, tarefas, recursos)
+
+
+@pytest.mark.parametrize("objetivo", [OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA])
+@pytest.mark.parametrize("opcoes", [{}, {"agregado": True}, {"enxuto": True}])
+def test_dicas_formam_uma_solucao_completa(objetivo, opcoes):
+    tarefas, recursos = instancia_aleatoria(1, num_tarefas=16, distintas=8)
+    plano = resolver_heuristica(tarefas, recursos, objetivo, tempo_limite=0.5).atribuicao
+    alocacao = construir_modelo(tarefas, recursos, objetivo, **opcoes)
+    aplicar_dicas(alocacao, plano)
+
+    # Com as variáveis presas às dicas, o modelo só é viável se a dica (auxiliares incluídas) for completa
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    solver.parameters.fix_variables_to_their_hinted_value = True
+    assert solver.Solve(alocacao.modelo) == cp_model.OPTIMAL
+    assert round(solver.ObjectiveValue()) == valor_objetivo(plano, tarefas, recursos, objetivo)
+
+
+@pytest.mark.parametrize("opcoes", [{}, {"agregado": True}])
+def test_tarefas_em_andamento_ficam_fixadas(tmp_path, opcoes):
+    tarefas, recursos = criar_tarefas(TAREFAS), criar_recursos(RECURSOS)
+    linhas = [
+        (5, "R2", 1),  # em andamento: fixada
+        (2, "R1", 0),  # só dica
+        (1, "R3", 0),  # R3 não tem a habilidade A: descartada
+        (4, "R3", 1),  # esforço 5 acima da disponibilidade 4: descartada, mesmo em andamento
+    ]
+    anterior = gravar_csv(tmp_path / "anterior.csv", linhas, ["nota", "matricula", "em_andamento"])
+    alocacao = construir_modelo(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, **opcoes)
+    partida = aplicar_partida_quente(alocacao, anterior, fixar=True)
+    assert partida.anterior.tolist() == [-1, 0, -1, -1, 1]
+    assert partida.fixada.tolist() == [-1, -1, -1, -1, 1]
+
+    solver = resolver_otimo(alocacao)
+    atribuicao = alocacao.atribuicao(solver)
+    conferir_atribuicao(atribuicao, tarefas, recursos)
+    assert atribuicao[4] == 1
+    assert round(solver.ObjectiveValue()) <= valor_otimo(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA)
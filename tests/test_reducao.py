@@ -0,0 +1,124 @@
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+from alocacao.execucao import Opcoes, executar
+from configuracao_solver import ConfiguracaoSolver, caminho_parametros
+from heuristica import valor_objetivo, valor_tarefas
+from instancias import criar_recursos, criar_tarefas, gravar_csv, instancia_aleatoria, resolver_otimo, valor_otimo
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA, construir_modelo
+from partida_quente import fixar_atribuicao, ler_distribuicao
+from reducao import esforco_dominante, reduzir
+
+OBJETIVOS = [
+    (OBJETIVO_ESFORCO_MAXIMO, None),
+    (OBJETIVO_PRIORIDADE_MAXIMA, {"prioridade": 60, "esforco": 40}),
+    (OBJETIVO_PRIORIDADE_MAXIMA, {"prioridade": 100, "esforco": 0}),
+]
+
+
+def valor_reduzido(tarefas, recursos, objetivo, pesos) -> int:
+    reducao = reduzir(tarefas, recursos, objetivo, pesos)
+    if reducao.solucao is not None:
+        carga = np.bincount(
+            reducao.solucao[reducao.solucao >= 0],
+            weights=tarefas.esforco[reducao.solucao >= 0],
+            minlength=len(recursos),
+        )
+        assert (carga <= recursos.disponibilidade).all()
+        return valor_objetivo(reducao.solucao, tarefas, recursos, objetivo, pesos)
+    alocacao = construir_modelo(tarefas, recursos, objetivo, pesos, indice=reducao.indice)
+    fixar_atribuicao(alocacao, reducao.fixadas)
+    return round(resolver_otimo(alocacao).ObjectiveValue())
+
+
+@pytest.mark.parametrize("objetivo,pesos", OBJETIVOS)
+@pytest.mark.parametrize("semente", range(8))
+def test_reducao_preserva_o_otimo(semente, objetivo, pesos):
+    tarefas, recursos = instancia_aleatoria(semente)
+    assert valor_reduzido(tarefas, recursos, objetivo, pesos) == valor_otimo(tarefas, recursos, objetivo, pesos)
+
+
+@pytest.mark.parametrize("objetivo,pesos", OBJETIVOS)
+def test_reducao_preserva_o_otimo_com_tarefas_dominadas(objetivo, pesos):
+    # Mesma prioridade e esforços diferentes: com peso 0 no esforço, a menor domina a maior
+    tarefas = criar_tarefas([(1, 1, "A"), (5, 1, "A"), (5, 1, "A"), (3, 0, "A,B")])
+    recursos = criar_recursos([(5, "A"), (4, "A,B")])
+    assert valor_reduzido(tarefas, recursos, objetivo, pesos) == valor_otimo(tarefas, recursos, objetivo, pesos)
+
+
+def test_esforco_dominante_igual_a_forca_bruta():
+    gerador = np.random.default_rng(0)
+    esforco = gerador.integers(1, 5, 40)
+    valor = gerador.integers(0, 4, 40)
+    mascara = gerador.integers(0, 8, 40)
+    candidatas = gerador.random(40) < 0.8
+
+    esperado = np.zeros(40, dtype=np.int64)
+    for t, u in itertools.permutations(range(40), 2):
+        contida = mascara[u] & ~mascara[t] == 0
+        # Empate em esforço e valor: domina a de menor índice
+        equivalente = esforco[u] == esforco[t] and valor[u] == valor[t]
+        if candidatas[u] and contida and esforco[u] <= esforco[t] and valor[u] >= valor[t]:
+            if not equivalente or u < t:
+                esperado[t] += esforco[u]
+    assert (esforco_dominante(esforco, valor, mascara, candidatas) == esperado).all()
+
+
+def test_valor_ponderado_domina_tarefa_de_mais_esforco():
+    # Por isso a redução não vale nas etapas lexicográficas, que otimizam o esforço à parte
+    tarefas = criar_tarefas([(1, 1, "A"), (5, 1, "A")])
+    recursos = criar_recursos([(5, "A")])
+    pesos = {"prioridade": 100, "esforco": 0}
+    assert valor_tarefas(tarefas, OBJETIVO_PRIORIDADE_MAXIMA, pesos).tolist() == [100, 100]
+    assert reduzir(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, pesos).tarefas_dominadas == 1
+
+
+def notas_atribuidas(caminho):
+    return sorted(ler_distribuicao(caminho)["nota"].tolist())
+
+
+def test_executar_ignora_reducao_no_modo_lexicografico(gravar_entradas, tmp_path):
+    caminho_tarefas, caminho_recursos = gravar_entradas([(1, 1, "A"), (5, 1, "A")], [(5, "A")])
+    opcoes = Opcoes(
+        pesos={"prioridade": 100, "esforco": 0},
+        tempo_limite=10.0,
+        lexicografico=True,
+        reducao=True,
+        configuracao=ConfiguracaoSolver(trabalhadores=1),
+    )
+    caminho_saida = str(tmp_path / "distribuicao.csv")
+    executar(opcoes, caminho_tarefas, caminho_recursos, caminho_saida)
+    # A etapa de esforço prefere a tarefa de esforço 5
+    assert notas_atribuidas(caminho_saida) == [2]
+
+
+def test_executar_ignora_reducao_com_distribuicao_anterior(gravar_entradas, tmp_path):
+    caminho_tarefas, caminho_recursos = gravar_entradas([(1, 1, "A"), (5, 1, "A")], [(5, "A")])
+    anterior = gravar_csv(tmp_path / "anterior.csv", [(2, "R1", 1)], ["nota", "matricula", "em_andamento"])
+    opcoes = Opcoes(
+        pesos={"prioridade": 100, "esforco": 0},
+        tempo_limite=10.0,
+        distribuicao_anterior=anterior,
+        fixar_anterior=True,
+        reducao=True,
+        configuracao=ConfiguracaoSolver(trabalhadores=1),
+    )
+    caminho_saida = str(tmp_path / "distribuicao.csv")
+    executar(opcoes, caminho_tarefas, caminho_recursos, caminho_saida)
+    # A tarefa em andamento continua no recurso, mesmo dominada pela de esforço 1
+    assert notas_atribuidas(caminho_saida) == [2]
+
+
+def test_executar_registra_a_reducao_nos_parametros(gravar_entradas, tmp_path):
+    # Capacidade menor que a demanda: a otimização não é dispensada
+    caminho_tarefas, caminho_recursos = gravar_entradas([(3, 1, "A"), (4, 0, "A"), (9, 0, "B")], [(5, "A")])
+    opcoes = Opcoes(tempo_limite=10.0, reducao=True, configuracao=ConfiguracaoSolver(trabalhadores=1))
+    caminho_saida = str(tmp_path / "distribuicao.csv")
+    executar(opcoes, caminho_tarefas, caminho_recursos, caminho_saida)
+    with open(caminho_parametros(caminho_saida), encoding="utf-8") as arquivo:
+        parametros = json.load(arquivo)
+    assert parametros["status"] == "OPTIMAL"
+    assert parametros["reducao"]["tarefas_removidas"]["sem_recurso_elegivel"] == 1
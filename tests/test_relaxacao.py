@@ -0,0 +1,42 @@
+import pytest
+
+from heuristica import valor_objetivo, valor_tarefas
+from instancias import conferir_atribuicao, criar_recursos, criar_tarefas, instancia_aleatoria, valor_otimo
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA
+from relaxacao import arredondar, limite_relaxacao, resolver_relaxacao
+
+OBJETIVOS = [
+    (OBJETIVO_ESFORCO_MAXIMO, None),
+    (OBJETIVO_PRIORIDADE_MAXIMA, {"prioridade": 60, "esforco": 40}),
+    (OBJETIVO_PRIORIDADE_MAXIMA, {"prioridade": 100, "esforco": 0}),
+]
+
+
+@pytest.mark.parametrize("objetivo,pesos", OBJETIVOS)
+@pytest.mark.parametrize("semente", range(6))
+def test_limite_acima_do_otimo_e_plano_abaixo(semente, objetivo, pesos):
+    tarefas, recursos = instancia_aleatoria(semente, num_tarefas=16, num_recursos=4, distintas=10)
+    otimo = valor_otimo(tarefas, recursos, objetivo, pesos)
+    assert limite_relaxacao(tarefas, recursos, objetivo, pesos).limite >= otimo
+
+    resultado = resolver_relaxacao(tarefas, recursos, objetivo, pesos, tempo_limite=1.0)
+    conferir_atribuicao(resultado.atribuicao, tarefas, recursos)
+    assert resultado.objetivo == valor_objetivo(resultado.atribuicao, tarefas, recursos, objetivo, pesos)
+    assert resultado.objetivo <= otimo <= resultado.limite
+    assert resultado.gap() >= 0
+
+
+def test_arredondamento_viavel():
+    tarefas, recursos = instancia_aleatoria(5, num_tarefas=30, num_recursos=4, distintas=6)
+    relaxacao = limite_relaxacao(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA)
+    conferir_atribuicao(arredondar(relaxacao, tarefas, recursos), tarefas, recursos)
+
+
+def test_limite_exato_quando_tudo_cabe():
+    # Inclui tarefa sem esforço, que não passa pelo fluxo
+    tarefas = criar_tarefas([(3, 0, "A"), (0, 1, "B"), (2, 2, "A,B"), (3, 0, "A")])
+    recursos = criar_recursos([(10, "A,B")])
+    pesos = {"prioridade": 70, "esforco": 30}
+    limite = limite_relaxacao(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, pesos).limite
+    assert limite == int(valor_tarefas(tarefas, OBJETIVO_PRIORIDADE_MAXIMA, pesos).sum())
+    assert limite == valor_otimo(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, pesos)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from instancias import conferir_atribuicao, criar_tarefas, instancia_aleatoria, valor_otimo
+from modelagem import OBJETIVO_PRIORIDADE_MAXIMA
+from replanejamento import Planejador
+
+TEMPO_LIMITE = 10.0
+
+
+def planejador_resolvido(semente):
+    tarefas, recursos = instancia_aleatoria(semente)
+    planejador = Planejador(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA)
+    resultado = planejador.resolver(TEMPO_LIMITE)
+    assert resultado.status == cp_model.OPTIMAL
+    return planejador, resultado
+
+
+@pytest.mark.parametrize("semente", range(4))
+def test_primeiro_plano_e_otimo(semente):
+    planejador, resultado = planejador_resolvido(semente)
+    conferir_atribuicao(planejador.atribuicao, planejador.tarefas, planejador.recursos)
+    assert round(resultado.objetivo) == valor_otimo(planejador.tarefas, planejador.recursos, OBJETIVO_PRIORIDADE_MAXIMA)
+
+
+@pytest.mark.parametrize("semente", range(4))
+def test_tarefas_novas_so_mexem_na_vizinhanca(semente):
+    planejador, _ = planejador_resolvido(semente)
+    anterior = planejador.atribuicao.copy()
+    planejador.adicionar_tarefas(criar_tarefas([(2, 0, "A"), (3, 0, "B")], primeira_nota=101))
+    tarefas, _ = planejador.vizinhanca()
+
+    resultado = planejador.resolver(TEMPO_LIMITE)
+    assert resultado.status == cp_model.OPTIMAL
+    conferir_atribuicao(planejador.atribuicao, planejador.tarefas, planejador.recursos)
+    fora = np.setdiff1d(np.arange(len(anterior)), tarefas)
+    assert (planejador.atribuicao[fora] == anterior[fora]).all()
+    # Só contam as tarefas que já tinham recurso
+    assert resultado.mudancas == int(((anterior >= 0) & (planejador.atribuicao[: len(anterior)] != anterior)).sum())
+
+
+@pytest.mark.parametrize("semente", range(4))
+def test_ausencia_so_forca_as_tarefas_do_recurso(semente):
+    planejador, _ = planejador_resolvido(semente)
+    anterior = planejador.atribuicao.copy()
+    ausente = int(np.bincount(anterior[anterior >= 0], minlength=len(planejador.recursos)).argmax())
+    planejador.definir_disponibilidade(planejador.recursos.matricula[ausente], 0)
+
+    resultado = planejador.resolver(TEMPO_LIMITE, max_mudancas=0)
+    assert resultado.status == cp_model.OPTIMAL
+    conferir_atribuicao(planejador.atribuicao, planejador.tarefas, planejador.recursos)
+    assert not (planejador.atribuicao == ausente).any()
+    assert resultado.mudancas_forcadas == int((anterior == ausente).sum())
+    # Com limite zero, só mudam as tarefas do recurso ausente
+    assert resultado.mudancas == resultado.mudancas_forcadas
+
+
+def test_remover_e_readicionar_tarefas():
+    planejador, _ = planejador_resolvido(0)
+    total = len(planejador.tarefas)
+    planejador.remover_tarefas([1, 2, 999])
+    assert len(planejador.tarefas) == len(planejador.atribuicao) == total - 2
+    assert planejador.resolver(TEMPO_LIMITE).status == cp_model.OPTIMAL
+    conferir_atribuicao(planejador.atribuicao, planejador.tarefas, planejador.recursos)
+
+    with pytest.raises(ValueError):
+        planejador.adicionar_tarefas(criar_tarefas([(1, 0, "A")], primeira_nota=3))
+
+
+def test_replanejamento_completo_e_otimo():
+    planejador, _ = planejador_resolvido(1)
+    planejador.adicionar_tarefas(criar_tarefas([(2, 0, "A"), (4, 1, "A,B")], primeira_nota=101))
+    planejador.definir_disponibilidade(planejador.recursos.matricula[0], 3)
+    resultado = planejador.resolver(TEMPO_LIMITE, apenas_vizinhanca=False)
+    assert resultado.status == cp_model.OPTIMAL
+    assert round(resultado.objetivo) == valor_otimo(planejador.tarefas, planejador.recursos, OBJETIVO_PRIORIDADE_MAXIMA)
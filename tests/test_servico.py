@@ -0,0 +1,100 @@
+import asyncio
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from configuracao_solver import ConfiguracaoSolver
+from instancias import conferir_atribuicao, criar_recursos, criar_tarefas, valor_otimo
+from modelagem import OBJETIVO_PRIORIDADE_MAXIMA
+from partida_quente import atribuicao_da_distribuicao
+from servico import ServicoAlocacao
+
+TAREFAS = [(3, 0, "A"), (4, 1, "A"), (2, 2, "B"), (5, 0, "A,B"), (1, 3, "C"), (2, 1, "A")]
+RECURSOS = [(6, "A"), (5, "A,B"), (4, "B")]
+PESOS = {"prioridade": 70, "esforco": 30}
+
+
+@pytest.fixture
+def servico():
+    servico = ServicoAlocacao(processos=1, configuracao=ConfiguracaoSolver(trabalhadores=1), tempo_limite=10.0)
+    asyncio.run(servico.iniciar())
+    yield servico
+    servico.encerrar()
+
+
+@pytest.fixture
+def entradas(gravar_entradas):
+    caminhos = gravar_entradas(TAREFAS, RECURSOS)
+    return tuple(open(caminho, "rb").read() for caminho in caminhos)
+
+
+def test_pool_divide_os_nucleos():
+    nucleos = os.cpu_count() or 1
+    assert ServicoAlocacao(processos=2).configuracao.trabalhadores == max(1, nucleos // 2)
+    assert ServicoAlocacao(processos=1, configuracao=ConfiguracaoSolver(trabalhadores=1)).configuracao.trabalhadores == 1
+
+
+def test_alocar_devolve_o_plano_otimo(servico, entradas):
+    tarefas_csv, recursos_csv = entradas
+
+    async def pedidos():
+        codigo, _, _ = await servico.atender("PUT", "/recursos", recursos_csv)
+        assert codigo == 200
+        return await servico.atender("POST", "/alocar?peso_prioridade=70&peso_esforco=30", tarefas_csv)
+
+    codigo, corpo, cabecalhos = asyncio.run(pedidos())
+    assert codigo == 200
+    assert cabecalhos["X-Status"] == "OPTIMAL"
+
+    tarefas, recursos = criar_tarefas(TAREFAS), criar_recursos(RECURSOS)
+    atribuicao, _ = atribuicao_da_distribuicao(pd.read_csv(io.BytesIO(corpo), sep=";"), tarefas, recursos)
+    conferir_atribuicao(atribuicao, tarefas, recursos)
+    assert int(cabecalhos["X-Tarefas-Atribuidas"]) == int((atribuicao >= 0).sum())
+    assert round(float(cabecalhos["X-Objetivo"])) == valor_otimo(tarefas, recursos, OBJETIVO_PRIORIDADE_MAXIMA, PESOS)
+
+
+def test_pedidos_identicos_simultaneos_compartilham_a_solucao(servico, entradas):
+    tarefas_csv, recursos_csv = entradas
+    servico.registrar_equipe(recursos_csv)
+
+    async def pedidos():
+        return await asyncio.gather(*(servico.alocar(tarefas_csv, {}) for _ in range(3)))
+
+    respostas = asyncio.run(pedidos())
+    assert sorted(cabecalhos["X-Coalescido"] for _, cabecalhos in respostas) == ["0", "1", "1"]
+    assert len({corpo for corpo, _ in respostas}) == 1
+    assert servico.metricas.coalescidos == 2
+
+
+def test_pedidos_invalidos(servico, entradas):
+    tarefas_csv, _ = entradas
+
+    async def pedidos():
+        return [
+            await servico.atender("POST", "/alocar", tarefas_csv),
+            await servico.atender("GET", "/desconhecida", b""),
+            await servico.atender("GET", "/alocar", b""),
+        ]
+
+    assert [codigo for codigo, _, _ in asyncio.run(pedidos())] == [400, 404, 405]
+    assert servico.metricas.erros == 1
+
+
+def test_habilidades_desconhecidas_nao_esgotam_o_vocabulario(servico, entradas, gravar_entradas):
+    tarefas_csv, recursos_csv = entradas
+    servico.registrar_equipe(recursos_csv)
+    desconhecidas = [(1, 3, f"X{i}") for i in range(70)]
+    caminho_lixo, _ = gravar_entradas(desconhecidas + [(2, 0, "A")], RECURSOS)
+    lixo_csv = open(caminho_lixo, "rb").read()
+
+    async def pedidos():
+        return [await servico.atender("POST", "/alocar", csv) for csv in (lixo_csv, tarefas_csv)]
+
+    (codigo_lixo, _, cabecalhos_lixo), (codigo, _, cabecalhos) = asyncio.run(pedidos())
+    # Só a tarefa de habilidade conhecida é atribuída
+    assert codigo_lixo == 200
+    assert cabecalhos_lixo["X-Tarefas-Atribuidas"] == "1"
+    assert codigo == 200
+    assert cabecalhos["X-Status"] == "OPTIMAL"
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from instancias import criar_recursos, instancia_aleatoria, resolver_otimo, valor_otimo
+from modelagem import OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA, construir_modelo
+from simetria import classes_equivalencia
+
+# Três recursos intercambiáveis e um par, além de um recurso único
+RECURSOS = [(8, "A,B"), (8, "A,B"), (8, "A,B"), (5, "A"), (5, "A"), (6, "B,C")]
+
+
+def test_classes_de_recursos_intercambiaveis():
+    recursos = criar_recursos(RECURSOS)
+    assert [membros.tolist() for membros in classes_equivalencia(recursos)] == [[0, 1, 2], [3, 4]]
+    assert [membros.tolist() for membros in classes_equivalencia(recursos, excluir=[1, 3])] == [[0, 2]]
+
+
+@pytest.mark.parametrize("objetivo", [OBJETIVO_ESFORCO_MAXIMO, OBJETIVO_PRIORIDADE_MAXIMA])
+@pytest.mark.parametrize("semente", range(4))
+def test_quebra_de_simetria_mantem_o_otimo(semente, objetivo):
+    tarefas, _ = instancia_aleatoria(semente, num_tarefas=14)
+    recursos = criar_recursos(RECURSOS)
+    alocacao = construir_modelo(tarefas, recursos, objetivo, simetria=True)
+    solver = resolver_otimo(alocacao)
+    assert round(solver.ObjectiveValue()) == valor_otimo(tarefas, recursos, objetivo)
+
+    # As cargas de cada classe saem em ordem decrescente
+    atribuicao = alocacao.atribuicao(solver)
+    atribuidas = atribuicao >= 0
+    carga = np.bincount(atribuicao[atribuidas], weights=tarefas.esforco[atribuidas], minlength=len(recursos))
+    for membros in classes_equivalencia(recursos):
+        assert (np.diff(carga[membros]) <= 0).all()